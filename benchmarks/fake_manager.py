@@ -0,0 +1,386 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""A stand-in for the manager's REST service, for benchmarking the CLI.
+
+It serves canned responses, in the format `cloudify_rest_client` expects,
+for the endpoints used by the benchmarked commands. List sizes and the
+latency of every response are configurable, and every request is counted,
+so that the number of REST calls a command makes can be reported.
+
+Executions started through it go through `started` for a configurable
+number of status polls before they are `terminated`, and every execution
+has the same configurable number of events, the last of which is a
+`workflow_succeeded` event. Events can be listed from a timestamp on,
+the way the CLI fetches them with a cursor.
+"""
+
+import json
+import time
+import threading
+import SocketServer
+import BaseHTTPServer
+from datetime import datetime, timedelta
+from urlparse import urlparse, parse_qs
+
+
+# The number of items returned for each resource when listing it
+DEFAULT_SIZES = {
+    'blueprints': 100,
+    'deployments': 100,
+    'executions': 100,
+    'events': 500,
+}
+DEFAULT_SIZE = 10
+
+# The manager doesn't return more than that many items in a single page
+DEFAULT_PAGE_SIZE = 1000
+
+TENANT_NAME = 'default_tenant'
+CREATED_BY = 'admin'
+_BASE_TIME = datetime(2017, 5, 1, 10, 0, 0)
+
+
+class FakeManager(object):
+    """An HTTP server serving canned REST responses in a background thread.
+
+    :param sizes: The number of items to list for each resource, overriding
+                  DEFAULT_SIZES
+    :param latency: Seconds to wait before sending every response
+    :param execution_polls: How many times an execution started through the
+                            server is reported as `started` before it is
+                            `terminated`
+    """
+
+    def __init__(self,
+                 sizes=None,
+                 latency=0,
+                 execution_polls=0,
+                 host='127.0.0.1',
+                 port=0):
+        self.sizes = dict(DEFAULT_SIZES)
+        self.sizes.update(sizes or {})
+        self.latency = latency
+        self.execution_polls = execution_polls
+        self._lock = threading.Lock()
+        self._request_counts = {}
+        # Executions started through the server, as {id: [execution, polls]}
+        self._executions = {}
+        self._server = _ThreadingHTTPServer((host, port), _RequestHandler)
+        self._server.manager = self
+        self._thread = None
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def get_request_counts(self):
+        """Return the number of requests made since the last reset, as
+        {'<method> <resource>': count}.
+        """
+        with self._lock:
+            return dict(self._request_counts)
+
+    def reset_request_counts(self):
+        with self._lock:
+            self._request_counts.clear()
+
+    def _count_request(self, method, resource):
+        key = '{0} {1}'.format(method, resource)
+        with self._lock:
+            self._request_counts[key] = self._request_counts.get(key, 0) + 1
+
+    def handle(self, method, path, params, body):
+        """Return the status code and the JSON serializable body of the
+        response to a request.
+        """
+        parts = [part for part in path.split('/') if part]
+        # Paths look like /api/<version>/<resource>[/<id>]
+        if parts[:1] == ['api']:
+            parts = parts[2:]
+        if not parts:
+            return 404, _not_found(path)
+        resource = parts[0]
+        resource_id = parts[1] if len(parts) > 1 else None
+        self._count_request(method, resource)
+        if self.latency:
+            time.sleep(self.latency)
+
+        if resource == 'version':
+            return 200, _make_version()
+        if method == 'GET' and resource_id is None:
+            return 200, self._list(resource, params)
+        if method == 'GET':
+            return 200, self._get(resource, resource_id)
+        if method == 'PUT' and resource == 'blueprints':
+            return 201, _make_blueprint(resource_id)
+        if method == 'PUT' and resource == 'deployments':
+            return 201, _make_deployment(
+                resource_id, json.loads(body)['blueprint_id'])
+        if method == 'POST' and resource == 'executions':
+            request = json.loads(body)
+            return 201, self._start_execution(
+                request['deployment_id'], request['workflow_id'])
+        if method == 'DELETE':
+            return 200, self._get(resource, resource_id)
+        return 404, _not_found(path)
+
+    def _list(self, resource, params):
+        if resource == 'events':
+            items = self._list_events(params)
+        elif resource == 'executions' and 'id' in params:
+            items = [self._get(resource, execution_id)
+                     for execution_id in params['id']]
+        else:
+            make_item = _ITEM_MAKERS.get(resource, _make_item)
+            items = [make_item('{0}-{1}'.format(resource.rstrip('s'), i))
+                     for i in xrange(self.sizes.get(resource, DEFAULT_SIZE))]
+        offset = int(params.get('_offset', [0])[0])
+        size = int(params.get('_size', [DEFAULT_PAGE_SIZE])[0])
+        return {
+            'items': items[offset:offset + size],
+            'metadata': {
+                'pagination': {
+                    'total': len(items),
+                    'offset': offset,
+                    'size': size
+                }
+            }
+        }
+
+    def _list_events(self, params):
+        execution_id = params.get('execution_id', ['execution-0'])[0]
+        event_types = params.get('type', ['cloudify_event'])
+        total = self.sizes['events']
+        events = (_make_event(execution_id, i, total) for i in xrange(total))
+        # Ranges look like `<field>,<from>,<to>`, either end being optional
+        for field_range in params.get('_range', []):
+            field, since, until = field_range.split(',')
+            events = _in_range(events, field.lstrip('@'), since, until)
+        return [event for event in events if event['type'] in event_types]
+
+    def _get(self, resource, resource_id):
+        if resource == 'executions':
+            with self._lock:
+                started = self._executions.get(resource_id)
+                if started:
+                    execution, polls = started
+                    started[1] += 1
+                    execution['status'] = 'terminated' \
+                        if polls >= self.execution_polls else 'started'
+                    return dict(execution)
+        return _ITEM_MAKERS.get(resource, _make_item)(resource_id)
+
+    def _start_execution(self, deployment_id, workflow_id):
+        with self._lock:
+            execution_id = 'started-execution-{0}'.format(
+                len(self._executions))
+            execution = _make_execution(
+                execution_id, deployment_id, workflow_id, status='pending')
+            self._executions[execution_id] = [execution, 0]
+            return dict(execution)
+
+
+class _ThreadingHTTPServer(SocketServer.ThreadingMixIn,
+                           BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _RequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    # Keep connections alive, the way the manager's nginx does
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        body = self._read_body()
+        status, response = self.server.manager.handle(
+            method, url.path, parse_qs(url.query), body)
+        data = json.dumps(response)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() != 'chunked':
+            return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        # Blueprint archives are uploaded with chunked encoding
+        chunks = []
+        while True:
+            chunk_size = int(self.rfile.readline().split(';')[0], 16)
+            if not chunk_size:
+                break
+            chunks.append(self.rfile.read(chunk_size))
+            self.rfile.readline()
+        # Skip the trailer
+        while self.rfile.readline().strip():
+            pass
+        return ''.join(chunks)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _timestamp(offset_ms=0):
+    timestamp = _BASE_TIME + timedelta(milliseconds=offset_ms)
+    return timestamp.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+def _parse_timestamp(timestamp):
+    timestamp = timestamp.rstrip('Z')
+    time_format = '%Y-%m-%dT%H:%M:%S.%f' if '.' in timestamp \
+        else '%Y-%m-%dT%H:%M:%S'
+    return datetime.strptime(timestamp, time_format)
+
+
+def _in_range(events, field, since, until):
+    since = _parse_timestamp(since) if since else None
+    until = _parse_timestamp(until) if until else None
+    for event in events:
+        timestamp = _parse_timestamp(event[field])
+        if (since is None or timestamp >= since) and \
+                (until is None or timestamp <= until):
+            yield event
+
+
+def _not_found(path):
+    return {
+        'message': 'Requested resource not found: {0}'.format(path),
+        'error_code': 'not_found_error'
+    }
+
+
+def _make_version():
+    return {
+        'edition': 'premium',
+        'version': '4.1',
+        'build': '1',
+        'date': '',
+        'commit': ''
+    }
+
+
+def _make_resource(resource_id):
+    return {
+        'id': resource_id,
+        'created_at': _timestamp(),
+        'updated_at': _timestamp(),
+        'permission': 'creator',
+        'tenant_name': TENANT_NAME,
+        'created_by': CREATED_BY
+    }
+
+
+def _make_item(item_id):
+    return _make_resource(item_id)
+
+
+def _make_blueprint(blueprint_id):
+    blueprint = _make_resource(blueprint_id)
+    blueprint.update({
+        'description': 'A blueprint served by the fake manager',
+        'main_file_name': 'blueprint.yaml',
+        'plan': {'inputs': {}, 'workflows': {}}
+    })
+    return blueprint
+
+
+def _make_deployment(deployment_id, blueprint_id=None):
+    deployment = _make_resource(deployment_id)
+    deployment.update({
+        'blueprint_id': blueprint_id or 'blueprint-0',
+        'inputs': {},
+        'outputs': {},
+        'workflows': [{'name': 'install', 'parameters': {}},
+                      {'name': 'uninstall', 'parameters': {}}]
+    })
+    return deployment
+
+
+def _make_execution(execution_id,
+                    deployment_id='deployment-0',
+                    workflow_id='install',
+                    status='terminated'):
+    execution = _make_resource(execution_id)
+    execution.update({
+        'deployment_id': deployment_id,
+        'blueprint_id': 'blueprint-0',
+        'workflow_id': workflow_id,
+        'status': status,
+        'error': '',
+        'parameters': {},
+        'is_system_workflow': False
+    })
+    return execution
+
+
+def _make_event(execution_id, index, total):
+    is_last = index == total - 1
+    is_log = not is_last and index % 2 == 1
+    return {
+        'timestamp': _timestamp(index),
+        'reported_timestamp': _timestamp(index),
+        'deployment_id': 'deployment-0',
+        'execution_id': execution_id,
+        'workflow_id': 'install',
+        'node_name': 'node_{0}'.format(index % 10),
+        'node_instance_id': 'node_{0}_instance'.format(index % 10),
+        'operation': 'cloudify.interfaces.lifecycle.create',
+        'type': 'cloudify_log' if is_log else 'cloudify_event',
+        'event_type': 'workflow_succeeded' if is_last else (
+            None if is_log else 'task_succeeded'),
+        'level': 'info' if is_log else None,
+        'logger': 'ctx' if is_log else None,
+        'message': 'Event {0} of execution {1}'.format(index, execution_id),
+        'error_causes': None
+    }
+
+
+_ITEM_MAKERS = {
+    'blueprints': _make_blueprint,
+    'deployments': _make_deployment,
+    'executions': _make_execution,
+}
@@ -0,0 +1,306 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""Benchmark cfy commands against a fake manager.
+
+Every scenario is measured in two ways:
+
+* cold: `cfy` is run as a new process, the way a user runs it. The wall
+  time, the REST calls it made and its peak RSS are recorded.
+* warm: a worker process runs the command in-process once (which includes
+  importing the CLI), then runs it again `--repeat` times. This measures
+  the dispatch overhead of a command once everything is loaded, which is
+  what the cfy daemon pays per command.
+
+All commands run against a `FakeManager`, with a temporary `CFY_WORKDIR`
+holding a profile which points at it, so nothing on the machine is used
+or changed.
+
+Run it from the repository root, with the CLI installed:
+
+    python -m benchmarks.run
+    python -m benchmarks.run -s 'deployments list' --size deployments=5000
+    python -m benchmarks.run --latency 0.05 --json results.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import resource
+import subprocess
+from StringIO import StringIO
+
+from .fake_manager import FakeManager
+
+PROFILE_NAME = '127.0.0.1'
+EXECUTION_ID = 'execution-0'
+DEPLOYMENT_ID = 'deployment-0'
+
+BLUEPRINT = """tosca_definitions_version: cloudify_dsl_1_3
+
+node_templates:
+  node:
+    type: cloudify.nodes.Root
+"""
+
+_REPOSITORY_DIR = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))
+
+# The `cfy` console script
+CFY_COMMAND = [sys.executable, '-c',
+               'from cloudify_cli.daemon import cfy; cfy()']
+
+
+def get_scenarios(workdir):
+    """Return the benchmarked commands, as an ordered list of
+    (scenario name, cfy arguments).
+    """
+    blueprint_path = os.path.join(workdir, 'blueprint', 'blueprint.yaml')
+    return [
+        ('version', ['--version']),
+        ('profiles list', ['profiles', 'list']),
+        ('deployments list', ['deployments', 'list']),
+        ('events list', ['events', 'list', '-e', EXECUTION_ID,
+                         '--include-logs']),
+        ('executions start', ['executions', 'start', 'install',
+                              '-d', DEPLOYMENT_ID, '--include-logs']),
+        ('install', ['install', blueprint_path, '-b', 'benchmark',
+                     '--include-logs']),
+    ]
+
+
+def main(args=None):
+    args = _parse_args(args)
+    if args.worker:
+        return _run_worker(args.worker, args.repeat)
+
+    workdir = tempfile.mkdtemp(prefix='cfy-benchmark-')
+    manager = FakeManager(sizes=dict(args.size),
+                          latency=args.latency,
+                          execution_polls=args.execution_polls)
+    manager.start()
+    try:
+        _prepare_workdir(workdir, manager)
+        scenarios = get_scenarios(workdir)
+        if args.scenario:
+            unknown = set(args.scenario) - set(dict(scenarios))
+            if unknown:
+                sys.exit('Unknown scenarios: {0}'.format(
+                    ', '.join(sorted(unknown))))
+            scenarios = [(name, argv) for name, argv in scenarios
+                         if name in args.scenario]
+
+        results = []
+        for name, argv in scenarios:
+            sys.stderr.write('Running {0}...\n'.format(name))
+            result = {'scenario': name, 'command': ' '.join(['cfy'] + argv)}
+            result.update(_run_cold(argv, args.repeat, manager))
+            result.update(_run_warm(name, args.repeat, manager))
+            results.append(result)
+    finally:
+        manager.stop()
+        shutil.rmtree(workdir)
+
+    _print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'latency': args.latency,
+                'sizes': manager.sizes,
+                'repeat': args.repeat,
+                'results': results
+            }, f, indent=2)
+
+
+def _parse_args(args):
+    parser = argparse.ArgumentParser(
+        description='Benchmark cfy commands against a fake manager')
+    parser.add_argument(
+        '-s', '--scenario', action='append',
+        help='A scenario to run (can be passed multiple times). '
+             'All scenarios are run by default')
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=5,
+        help='How many times to run every command [default: 5]')
+    parser.add_argument(
+        '--size', action='append', type=_parse_size, default=[],
+        metavar='RESOURCE=COUNT',
+        help='How many items to list for a resource, e.g. events=10000 '
+             '(can be passed multiple times)')
+    parser.add_argument(
+        '--latency', type=float, default=0,
+        help='Seconds the fake manager waits before every response '
+             '[default: 0]')
+    parser.add_argument(
+        '--execution-polls', type=int, default=0,
+        help='How many status polls a started execution stays `started` '
+             'for [default: 0]')
+    parser.add_argument(
+        '--json', metavar='PATH',
+        help='Also write the full results to PATH as JSON')
+    # Used internally, to run the warm measurements in a fresh process
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    return parser.parse_args(args)
+
+
+def _parse_size(value):
+    resource_name, _, count = value.partition('=')
+    try:
+        return resource_name, int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            '{0} is not in the form RESOURCE=COUNT'.format(value))
+
+
+def _prepare_workdir(workdir, manager):
+    """Create a CFY_WORKDIR with an active profile for `manager`.
+    """
+    os.environ['CFY_WORKDIR'] = workdir
+    # The daemon would run the commands instead of the processes measured
+    os.environ.pop('CFY_USE_DAEMON', None)
+
+    # Imported here, as the CLI reads CFY_WORKDIR on import
+    from cloudify_cli import env
+    from cloudify_cli.commands import init
+
+    profile = env.ProfileContext()
+    profile.manager_ip = PROFILE_NAME
+    profile.rest_port = manager.port
+    profile.rest_protocol = 'http'
+    profile.manager_username = 'admin'
+    profile.manager_password = 'admin'
+    profile.manager_tenant = 'default_tenant'
+    profile.bootstrap_state = 'Complete'
+    profile.save()
+    init.set_config()
+    env.set_active_profile(PROFILE_NAME)
+
+    blueprint_dir = os.path.join(workdir, 'blueprint')
+    os.makedirs(blueprint_dir)
+    with open(os.path.join(blueprint_dir, 'blueprint.yaml'), 'w') as f:
+        f.write(BLUEPRINT)
+
+
+def _run_cold(argv, repeat, manager):
+    durations = []
+    peak_rss = []
+    for _ in xrange(repeat):
+        manager.reset_request_counts()
+        errors = tempfile.TemporaryFile()
+        with open(os.devnull, 'w') as devnull:
+            start = time.time()
+            process = subprocess.Popen(
+                CFY_COMMAND + argv, stdout=devnull, stderr=errors)
+            _, status, usage = os.wait4(process.pid, 0)
+            durations.append((time.time() - start) * 1000)
+        process.returncode = os.WEXITSTATUS(status)
+        if process.returncode:
+            errors.seek(0)
+            raise RuntimeError('`cfy {0}` failed:\n{1}'.format(
+                ' '.join(argv), errors.read()))
+        peak_rss.append(usage.ru_maxrss)
+    request_counts = manager.get_request_counts()
+    return {
+        'cold_ms': durations,
+        'cold_peak_rss_kb': max(peak_rss),
+        'rest_calls': sum(request_counts.values()),
+        'rest_calls_by_endpoint': request_counts
+    }
+
+
+def _run_warm(name, repeat, manager):
+    manager.reset_request_counts()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.run',
+         '--worker', name, '--repeat', str(repeat)],
+        stdout=subprocess.PIPE,
+        cwd=_REPOSITORY_DIR)
+    output, _ = process.communicate()
+    if process.returncode:
+        raise RuntimeError('Running {0} in-process failed'.format(name))
+    result = json.loads(output)
+    # The first run is included
+    result['warm_rest_calls'] = \
+        sum(manager.get_request_counts().values()) / (repeat + 1)
+    return result
+
+
+def _run_worker(name, repeat):
+    """Run a scenario in this process `repeat + 1` times, and print the
+    results as JSON.
+    """
+    start = time.time()
+    import cloudify_cli.main  # NOQA
+    from cloudify_cli import daemon
+    argv = dict(get_scenarios(os.environ['CFY_WORKDIR']))[name]
+
+    def run_command():
+        errors = StringIO()
+        with open(os.devnull, 'w') as devnull:
+            exit_code = daemon._run_command(
+                argv, dict(os.environ), os.getcwd(),
+                stdout=devnull, stderr=errors)
+        if exit_code:
+            sys.stderr.write(errors.getvalue())
+            sys.exit(exit_code)
+
+    run_command()
+    first_run = (time.time() - start) * 1000
+
+    durations = []
+    for _ in xrange(repeat):
+        start = time.time()
+        run_command()
+        durations.append((time.time() - start) * 1000)
+
+    json.dump({
+        'in_process_first_ms': first_run,
+        'warm_ms': durations,
+        'warm_peak_rss_kb': resource.getrusage(
+            resource.RUSAGE_SELF).ru_maxrss
+    }, sys.stdout)
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def _print_report(results):
+    row = '{0:<18}{1:>10}{2:>12}{3:>10}{4:>7}{5:>10}{6:>10}'
+    lines = [row.format('scenario', 'cold(ms)', 'first(ms)', 'warm(ms)',
+                        'calls', 'cold(MB)', 'warm(MB)')]
+    for result in results:
+        lines.append(row.format(
+            result['scenario'],
+            '{0:.1f}'.format(_median(result['cold_ms'])),
+            '{0:.1f}'.format(result['in_process_first_ms']),
+            '{0:.1f}'.format(_median(result['warm_ms'])),
+            result['rest_calls'],
+            '{0:.1f}'.format(result['cold_peak_rss_kb'] / 1024.0),
+            '{0:.1f}'.format(result['warm_peak_rss_kb'] / 1024.0)))
+    print '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    main()
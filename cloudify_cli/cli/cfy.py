@@ -15,6 +15,7 @@
 ############
 
 
+import os
 import sys
 import urllib
 import difflib
@@ -30,6 +31,7 @@ from cloudify_rest_client.exceptions import MaintenanceModeActivatingError
 
 from .. import env
 from .. import constants
+from .. import startup_trace
 from ..cli import helptexts
 from ..inputs import inputs_to_dict
 from ..utils import generate_random_string
@@ -43,6 +45,10 @@ CLICK_CONTEXT_SETTINGS = dict(
     help_option_names=['-h', '--help'],
     token_normalize_func=lambda param: param.lower())
 
+# The parameters of list requests which `--filter` can't set, besides
+# those starting with an underscore (e.g. `_offset`)
+RESERVED_FILTER_KEYS = frozenset(['sort', 'is_descending'])
+
 
 class MutuallyExclusiveOption(click.Option):
     """Makes options mutually exclusive. The option must pass a `cls` argument
@@ -183,6 +189,46 @@ def set_verbosity_level(ctx, param, value):
     set_global_verbosity_level(value)
 
 
+def list_filters_callback(ctx, param, value):
+    """Turn `--filter key=value` arguments into the query parameters of
+    a list request, as a dict. The values of a key which is used more than
+    once are passed as a list.
+    """
+    if not value or ctx.resilient_parsing:
+        return {}
+
+    filters = {}
+    for list_filter in value:
+        key, separator, filter_value = list_filter.partition('=')
+        key = key.strip()
+        if not separator or not key:
+            raise CloudifyValidationError(
+                'ERROR: Invalid filter `{0}`. Filters are of the form '
+                'key=value'.format(list_filter))
+        if key.startswith('_') or key in RESERVED_FILTER_KEYS:
+            raise CloudifyValidationError(
+                'ERROR: Items can\'t be filtered by `{0}`'.format(key))
+        filters.setdefault(key, []).append(filter_value)
+    return dict((key, values[0] if len(values) == 1 else values)
+                for key, values in filters.iteritems())
+
+
+def parse_time_callback(ctx, param, value):
+    if not value or ctx.resilient_parsing:
+        return None
+
+    from ..event_filters import parse_time
+    return parse_time(value)
+
+
+def set_output_format(ctx, param, value):
+    if ctx.resilient_parsing:
+        return
+
+    from ..table import set_global_output_format
+    set_global_output_format(value)
+
+
 def set_cli_except_hook(global_verbosity_level):
 
     def recommend(possible_solutions):
@@ -193,6 +239,10 @@ def set_cli_except_hook(global_verbosity_level):
             logger.info('  - {0}'.format(solution))
 
     def new_excepthook(tpe, value, tb):
+        # The log file is created lazily, so it might not exist yet
+        logfile_dir = os.path.dirname(DEFAULT_LOG_FILE)
+        if not os.path.isdir(logfile_dir):
+            os.makedirs(logfile_dir)
         with open(DEFAULT_LOG_FILE, 'a') as log_file:
             traceback.print_exception(
                 etype=tpe,
@@ -334,7 +384,7 @@ class AliasedGroup(click.Group):
         if not matches:
             return None
         elif len(matches) == 1:
-            return click.Group.get_command(self, ctx, matches[0])
+            return self.get_command(ctx, matches[0])
         ctx.fail('Too many matches: {0}'.format(', '.join(sorted(matches))))
 
     def resolve_command(self, ctx, args):
@@ -358,6 +408,49 @@ class AliasedGroup(click.Group):
             raise click.exceptions.UsageError(error_msg, error.ctx)
 
 
+class LazyAliasedGroup(AliasedGroup):
+    """An AliasedGroup whose commands are only imported when dispatched.
+
+    `lazy_commands` maps the name of every lazily loaded command to its
+    short help, so that listing the commands (e.g. `cfy -h` or shell
+    completion) does not require importing them. The short help of a
+    command which depends on the context may be a function returning it.
+    `command_loader` receives a command name and returns the click command
+    for it. It is called on each lookup, so it may return a different
+    command depending on the current context (manager or local).
+    """
+    def __init__(self, *args, **kwargs):
+        self.lazy_commands = kwargs.pop('lazy_commands', {})
+        self.command_loader = kwargs.pop('command_loader')
+        super(LazyAliasedGroup, self).__init__(*args, **kwargs)
+
+    def main(self, *args, **kwargs):
+        with startup_trace.phase('click dispatch'):
+            return super(LazyAliasedGroup, self).main(*args, **kwargs)
+
+    def list_commands(self, ctx):
+        return sorted(set(self.commands) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            return self.command_loader(cmd_name)
+        return super(LazyAliasedGroup, self).get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        rows = []
+        for cmd_name in self.list_commands(ctx):
+            if cmd_name in self.commands:
+                short_help = self.commands[cmd_name].short_help or ''
+            else:
+                short_help = self.lazy_commands[cmd_name]
+                if callable(short_help):
+                    short_help = short_help()
+            rows.append((cmd_name, short_help))
+        if rows:
+            with formatter.section('Commands'):
+                formatter.write_dl(rows)
+
+
 def group(name):
     """Allow to create a group with a default click context
     and a cls for click's `didyoueamn` without having to repeat
@@ -369,6 +462,18 @@ def group(name):
         cls=AliasedGroup)
 
 
+def lazy_group(name, lazy_commands, command_loader):
+    """Same as `group`, only the group's commands are loaded on demand
+    by `command_loader`. See `LazyAliasedGroup`.
+    """
+    return click.group(
+        name=name,
+        context_settings=CLICK_CONTEXT_SETTINGS,
+        cls=LazyAliasedGroup,
+        lazy_commands=lazy_commands,
+        command_loader=command_loader)
+
+
 def command(*args, **kwargs):
     """Make Click commands Cloudify specific
 
@@ -459,11 +564,60 @@ class Options(object):
             is_flag=True,
             help=helptexts.JSON_OUTPUT)
 
+        self.output_format = click.option(
+            '--format',
+            'output_format',
+            type=click.Choice(constants.OUTPUT_FORMATS),
+            default=constants.TABLE_FORMAT,
+            callback=set_output_format,
+            expose_value=False,
+            is_eager=True,
+            help=helptexts.OUTPUT_FORMAT)
+
+        self.list_filters = click.option(
+            '--filter',
+            'filters',
+            multiple=True,
+            callback=list_filters_callback,
+            help=helptexts.LIST_FILTER)
+
         self.tail = click.option(
             '--tail',
             is_flag=True,
             help=helptexts.TAIL_OUTPUT)
 
+        self.events_batch_size = click.option(
+            '--batch-size',
+            type=click.IntRange(1, constants.MAX_EVENTS_BATCH_SIZE),
+            help=helptexts.EVENTS_BATCH_SIZE)
+
+        self.profile_top = click.option(
+            '--top',
+            type=click.IntRange(1),
+            default=10,
+            help=helptexts.EXECUTIONS_PROFILE_TOP)
+
+        self.profile_trace_output = click.option(
+            '--trace-output',
+            help=helptexts.EXECUTIONS_PROFILE_TRACE_OUTPUT)
+
+        self.events_export_output_path = click.option(
+            '-o',
+            '--output-path',
+            required=True,
+            help=helptexts.EVENTS_EXPORT_OUTPUT_PATH)
+
+        self.events_export_compression = click.option(
+            '--compression',
+            type=click.Choice(['gzip', 'zstd']),
+            default='gzip',
+            help=helptexts.EVENTS_EXPORT_COMPRESSION)
+
+        self.events_export_restart = click.option(
+            '--restart',
+            is_flag=True,
+            help=helptexts.EVENTS_EXPORT_RESTART)
+
         self.validate_only = click.option(
             '--validate-only',
             is_flag=True,
@@ -995,6 +1149,132 @@ class Options(object):
                 required=required,
                 help=helptexts.BLUEPRINT_ID)
 
+    @staticmethod
+    def event_filters(time_range=True):
+        """Add the options filtering events, and pass them to the command
+        as an `event_filters` argument (an `EventFilters`, or None if
+        none of them were used).
+
+        :param time_range: Whether to add `--since` and `--until`
+        """
+        names = ['node', 'operation', 'level', 'event_type', 'message_regex']
+        options = [
+            click.option('--node', multiple=True, help=helptexts.EVENTS_NODE),
+            click.option('--operation',
+                         multiple=True,
+                         help=helptexts.EVENTS_OPERATION),
+            click.option('--level',
+                         multiple=True,
+                         type=click.Choice(
+                             ['debug', 'info', 'warning', 'error']),
+                         help=helptexts.EVENTS_LEVEL),
+            click.option('--event-type',
+                         multiple=True,
+                         help=helptexts.EVENTS_EVENT_TYPE),
+            click.option('--message-regex',
+                         help=helptexts.EVENTS_MESSAGE_REGEX),
+        ]
+        if time_range:
+            names += ['since', 'until']
+            options += [
+                click.option('--since', help=helptexts.EVENTS_SINCE),
+                click.option('--until', help=helptexts.EVENTS_UNTIL),
+            ]
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                from ..event_filters import EventFilters, parse_time
+                values = dict((name, kwargs.pop(name, None))
+                              for name in names)
+                event_filters = EventFilters(
+                    nodes=values['node'],
+                    operations=values['operation'],
+                    levels=values['level'],
+                    event_types=values['event_type'],
+                    since=parse_time(values.get('since')),
+                    until=parse_time(values.get('until')),
+                    message_regex=values['message_regex'])
+                kwargs['event_filters'] = event_filters or None
+                return func(*args, **kwargs)
+
+            for option in reversed(options):
+                wrapper = option(wrapper)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def pagination():
+        """Add the options setting how many items a list command lists,
+        and pass them to the command as a `pagination` argument (a
+        `Pagination`).
+
+        Unless `--all` or `--limit` are used, only the first page is
+        listed.
+        """
+        options = [
+            click.option('--limit',
+                         type=click.IntRange(1),
+                         help=helptexts.LIMIT),
+            click.option('--page-size',
+                         type=click.IntRange(1),
+                         default=constants.DEFAULT_PAGE_SIZE,
+                         help=helptexts.PAGE_SIZE.format(
+                             constants.DEFAULT_PAGE_SIZE)),
+            click.option('--all',
+                         'all_pages',
+                         is_flag=True,
+                         default=False,
+                         help=helptexts.ALL_PAGES),
+        ]
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                from ..pagination import Pagination
+                limit = kwargs.pop('limit', None)
+                page_size = kwargs.pop('page_size')
+                if not kwargs.pop('all_pages', False):
+                    limit = limit or page_size
+                kwargs['pagination'] = Pagination(page_size=page_size,
+                                                  limit=limit)
+                return func(*args, **kwargs)
+
+            for option in reversed(options):
+                wrapper = option(wrapper)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def created_by(resource_name_for_help):
+        return click.option(
+            '--created-by',
+            help=helptexts.CREATED_BY.format(resource_name_for_help))
+
+    @staticmethod
+    def created_time_range(resource_name_for_help):
+        """Add `--since` and `--until` options, passed to the command as
+        `created_since` and `created_until` UTC datetimes.
+        """
+        options = [
+            click.option(
+                '--since',
+                'created_since',
+                callback=parse_time_callback,
+                help=helptexts.CREATED_SINCE.format(resource_name_for_help)),
+            click.option(
+                '--until',
+                'created_until',
+                callback=parse_time_callback,
+                help=helptexts.CREATED_UNTIL.format(resource_name_for_help)),
+        ]
+
+        def decorator(func):
+            for option in reversed(options):
+                func = option(func)
+            return func
+        return decorator
+
     @staticmethod
     def blueprint_path(required=False):
         return click.option(
@@ -17,6 +17,7 @@
 from argcomplete.completers import FilesCompleter
 
 from .. import env
+from .. import id_index
 from ..commands import dev
 
 yaml_files_completer = FilesCompleter(['*.yml', '*.yaml'])
@@ -31,16 +32,11 @@ def objects_args_completer_maker(objects_type, **kw):
         if not context:
             return []
 
-        rest_client = env.get_rest_client()
-        objs_ids_list = getattr(rest_client, objects_type).list(
-            _include=['id'])
-        return (obj.id for obj in objs_ids_list if obj.id.startswith(prefix))
+        return id_index.get_objects_index(objects_type).lookup(prefix)
     return _objects_args_completer
 
 
 def workflow_id_completer(prefix, parsed_args, **kwargs):
-    # TODO: refactor this into '_objects_args_completer_maker' method once
-    #       workflows get their own module in rest-client
     if not parsed_args.deployment_id:
         return []
 
@@ -49,12 +45,8 @@ def workflow_id_completer(prefix, parsed_args, **kwargs):
     if not context:
         return []
 
-    rest_client = env.get_rest_client()
-
-    deployment_id = parsed_args.deployment_id
-    workflows = rest_client.deployments.get(
-        deployment_id, _include=['workflows']).workflows
-    return (wf.id for wf in workflows if wf.id.startswith(prefix))
+    return id_index.get_workflows_index(
+        parsed_args.deployment_id).lookup(prefix)
 
 
 def dev_task_name_completer(prefix, parsed_args, **kwargs):
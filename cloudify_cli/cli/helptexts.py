@@ -66,6 +66,9 @@ OPERATION_TIMEOUT = (
 )
 INCLUDE_LOGS = "Include logs in returned events [default: True]"
 JSON_OUTPUT = "Output events in a consumable JSON format"
+OUTPUT_FORMAT = "The format to print the results in. All formats but " \
+                "table are printed without any other messages, one item " \
+                "at a time [default: table]"
 
 SKIP_INSTALL = "Skip install lifecycle operations"
 SKIP_UNINSTALL = "Skip uninstall lifecycle operations"
@@ -140,6 +143,52 @@ IGNORE_DEPLOYMENTS = \
     "Teardown even if there are existing deployments on the manager"
 
 TAIL_OUTPUT = "Tail the events of the specified execution until it ends"
+EVENTS_NODE = (
+    "Only show the events of this node, by its name or by the ID of one of "
+    "its instances. Can be passed multiple times"
+)
+EVENTS_OPERATION = (
+    "Only show the events of this operation, by its full name or by its "
+    "last part (e.g. `create`). Can be passed multiple times"
+)
+EVENTS_LEVEL = (
+    "Only show logs of this level. Can be passed multiple times"
+)
+EVENTS_EVENT_TYPE = (
+    "Only show events of this type (e.g. `task_failed`). Can be passed "
+    "multiple times"
+)
+EVENTS_MESSAGE_REGEX = (
+    "Only show the events whose message matches this regular expression"
+)
+EVENTS_SINCE = (
+    "Only show the events from this time on, either a UTC timestamp "
+    "(e.g. 2017-05-01T10:00:00) or a duration before now (e.g. 10m, 2h, 1d)"
+)
+EVENTS_UNTIL = (
+    "Only show the events until this time, either a UTC timestamp "
+    "(e.g. 2017-05-01T10:00:00) or a duration before now (e.g. 10m, 2h, 1d)"
+)
+EVENTS_BATCH_SIZE = (
+    "The number of events to fetch per request [default: adapted to the "
+    "manager's responses]"
+)
+EXECUTIONS_PROFILE_TOP = (
+    "The number of slowest operations to show [default: 10]"
+)
+EXECUTIONS_PROFILE_TRACE_OUTPUT = (
+    "Also write the profile to this path, in the Chrome trace format "
+    "(viewable in chrome://tracing, Perfetto or speedscope)"
+)
+EVENTS_EXPORT_OUTPUT_PATH = "The path of the file to export the events to"
+EVENTS_EXPORT_COMPRESSION = (
+    "The compression of the exported file. zstd requires the zstandard "
+    "package [default: gzip]"
+)
+EVENTS_EXPORT_RESTART = (
+    "Export all of the events again, rather than resuming an interrupted "
+    "export to the same file"
+)
 
 
 SET_MANAGEMENT_CREDS = (
@@ -165,6 +214,24 @@ IMPORT_SSH_KEYS = 'WARNING: Import exported keys to their original locations'
 
 SORT_BY = "Key for sorting the list"
 DESCENDING = "Sort list in descending order [default: False]"
+LIMIT = "The most items to list. Pages are fetched until there are as " \
+        "many"
+PAGE_SIZE = "The most items to fetch per request [default: {0}]"
+ALL_PAGES = "List all of the items, fetching as many pages as there are, " \
+            "rather than only the first page (unless --limit is passed)"
+LIST_FILTER = "Only list the items whose `key` field is `value`, given as " \
+              "key=value. This argument can be used multiple times. An " \
+              "item matches a key used more than once if it has any of " \
+              "its values"
+CREATED_BY = "Only list the {0}s created by this user"
+CREATED_SINCE = (
+    "Only list the {0}s created from this time on, either a UTC timestamp "
+    "(e.g. 2017-05-01T10:00:00) or a duration before now (e.g. 10m, 2h, 1d)"
+)
+CREATED_UNTIL = (
+    "Only list the {0}s created until this time, either a UTC timestamp "
+    "(e.g. 2017-05-01T10:00:00) or a duration before now (e.g. 10m, 2h, 1d)"
+)
 
 INSTALL_SCRIPT_LOCATION = \
     'Alternative location of the `install_agents.py` script'
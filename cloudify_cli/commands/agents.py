@@ -14,16 +14,12 @@
 # limitations under the License.
 ############
 
-import time
-import threading
-
-from cloudify import logs
+from cloudify_rest_client.exceptions import CloudifyClientError
 
 from ..cli import cfy
-from ..exceptions import ExecutionTimeoutError
+from ..logger import get_events_logger
 from ..exceptions import SuppressedCloudifyCliError
-from ..execution_events_fetcher import wait_for_execution, \
-    WAIT_FOR_EXECUTION_SLEEP_INTERVAL
+from ..execution_multiplexer import ExecutionMultiplexer
 
 _NODE_INSTANCE_STATE_STARTED = 'started'
 
@@ -100,86 +96,60 @@ def install(deployment_id,
             raise SuppressedCloudifyCliError()
         logger.info('Installing agents for all installed deployments')
 
+    timeout = 900
     error_summary = []
-    error_summary_lock = threading.Lock()
-
-    event_lock = threading.Lock()
-
-    def log_to_summary(message):
-        with error_summary_lock:
-            error_summary.append(message)
-
-    def threadsafe_log(message):
-        with event_lock:
-            logger.info(message)
-
-    def threadsafe_events_logger(events):
-        with event_lock:
-            for event in events:
-                output = logs.create_event_message_prefix(event)
-                if output:
-                    logger.info(output)
-
-    def worker(dep_id):
-        timeout = 900
 
+    events_logger = get_events_logger(json_output=False)
+
+    def end_handler(execution):
+        if execution.error:
+            error_summary.append("Execution of workflow '{0}' for "
+                                 "deployment '{1}' failed. [error={2}]"
+                                 .format(workflow_id,
+                                         execution.deployment_id,
+                                         execution.error))
+        else:
+            logger.info("Finished executing workflow "
+                        "'{0}' on deployment"
+                        " '{1}'".format(workflow_id,
+                                        execution.deployment_id))
+
+    kwargs = {}
+    if install_script is not None:
+        kwargs = {
+            'parameters': {
+                'install_script': install_script
+            },
+            'allow_custom_parameters': True
+        }
+    # All of the executions are waited for together, rather than each in
+    # a thread of its own
+    multiplexer = ExecutionMultiplexer(client,
+                                       include_logs=include_logs,
+                                       timeout=timeout)
+    for dep_id in deps:
         try:
-            kwargs = {}
-            if install_script is not None:
-                kwargs = {
-                    'parameters': {
-                        'install_script': install_script
-                    },
-                    'allow_custom_parameters': True
-                }
-            execution = client.executions.start(
-                dep_id,
-                workflow_id,
-                **kwargs
-            )
-
-            execution = wait_for_execution(
-                client,
-                execution,
-                events_handler=threadsafe_events_logger,
-                include_logs=include_logs,
-                timeout=timeout
-            )
-
-            if execution.error:
-                log_to_summary("Execution of workflow '{0}' for "
-                               "deployment '{1}' failed. [error={2}]"
-                               .format(workflow_id,
-                                       dep_id,
-                                       execution.error))
-            else:
-                threadsafe_log("Finished executing workflow "
-                               "'{0}' on deployment"
-                               " '{1}'".format(workflow_id, dep_id))
-
-        except ExecutionTimeoutError as e:
-            log_to_summary(
-                "Timed out waiting for workflow '{0}' of deployment '{1}' to "
-                "end. The execution may still be running properly; however, "
-                "the command-line utility was instructed to wait up to {3} "
-                "seconds for its completion.\n\n"
-                "* Run 'cfy executions list' to determine the execution's "
-                "status.\n"
-                "* Run 'cfy executions cancel --execution-id {2}' to cancel"
-                " the running workflow.".format(
-                    workflow_id, deployment_id, e.execution_id, timeout))
-
-    threads = [threading.Thread(target=worker, args=(dep_id,))
-               for dep_id in deps]
-
-    for t in threads:
-        t.daemon = True
-        t.start()
-
-    while True:
-        if all(not thread.is_alive() for thread in threads):
-            break
-        time.sleep(WAIT_FOR_EXECUTION_SLEEP_INTERVAL)
+            execution = client.executions.start(dep_id, workflow_id, **kwargs)
+        except CloudifyClientError as e:
+            error_summary.append("Failed starting workflow '{0}' for "
+                                 "deployment '{1}'. [error={2}]"
+                                 .format(workflow_id, dep_id, e))
+            continue
+        multiplexer.add(execution,
+                        events_handler=events_logger,
+                        end_handler=end_handler)
+
+    for execution in multiplexer.run():
+        error_summary.append(
+            "Timed out waiting for workflow '{0}' of deployment '{1}' to "
+            "end. The execution may still be running properly; however, "
+            "the command-line utility was instructed to wait up to {3} "
+            "seconds for its completion.\n\n"
+            "* Run 'cfy executions list' to determine the execution's "
+            "status.\n"
+            "* Run 'cfy executions cancel --execution-id {2}' to cancel"
+            " the running workflow.".format(
+                workflow_id, execution.deployment_id, execution.id, timeout))
 
     if error_summary:
         logger.error('Summary:\n{0}\n'.format(
@@ -27,17 +27,23 @@ from dsl_parser.exceptions import DSLParsingException
 
 from .. import local
 from .. import utils
+from .. import id_index
 from ..cli import cfy
 from .. import blueprint
 from .. import exceptions
 from ..config import config
-from ..table import print_data
+from ..table import print_data, TIMESTAMP, truncated
 from ..exceptions import CloudifyCliError
 
 
 DESCRIPTION_LIMIT = 20
 BLUEPRINT_COLUMNS = ['id', 'description', 'main_file_name', 'created_at',
                      'updated_at', 'permission', 'tenant_name', 'created_by']
+BLUEPRINT_COLUMN_TYPES = {'created_at': TIMESTAMP, 'updated_at': TIMESTAMP}
+# Descriptions are shown in full by `blueprints get`, and cut short when
+# listing blueprints
+BLUEPRINT_LIST_COLUMN_TYPES = dict(BLUEPRINT_COLUMN_TYPES,
+                                   description=truncated(DESCRIPTION_LIMIT))
 INPUTS_COLUMNS = ['name', 'type', 'default', 'description']
 
 
@@ -155,6 +161,7 @@ def upload(ctx,
                 )
                 shutil.rmtree(temp_directory)
 
+    id_index.invalidate('blueprints')
     logger.info("Blueprint uploaded. The blueprint's id is {0}".format(
         blueprint_obj.id))
 
@@ -201,6 +208,7 @@ def delete(blueprint_id, logger, client, tenant_name):
         logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
     logger.info('Deleting blueprint {0}...'.format(blueprint_id))
     client.blueprints.delete(blueprint_id)
+    id_index.invalidate('blueprints')
     logger.info('Blueprint deleted')
 
 
@@ -208,37 +216,43 @@ def delete(blueprint_id, logger, client, tenant_name):
                     short_help='List blueprints [manager only]')
 @cfy.options.sort_by()
 @cfy.options.descending
+@cfy.options.pagination()
+@cfy.options.list_filters
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.tenant_name_for_list(
     required=False, resource_name_for_help='blueprint')
 @cfy.options.all_tenants
 @cfy.assert_manager_active()
 @cfy.pass_client()
 @cfy.pass_logger
-def list(sort_by, descending, tenant_name, all_tenants, logger, client):
+def list(sort_by,
+         descending,
+         pagination,
+         filters,
+         tenant_name,
+         all_tenants,
+         logger,
+         client):
     """List all blueprints
     """
-    def trim_description(blueprint):
-        if blueprint['description'] is not None:
-            if len(blueprint['description']) >= DESCRIPTION_LIMIT:
-                blueprint['description'] = '{0}..'.format(
-                    blueprint['description'][:DESCRIPTION_LIMIT - 2])
-        else:
-            blueprint['description'] = ''
-        return blueprint
-
     if tenant_name:
         logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
     logger.info('Listing all blueprints...')
-    blueprints = [trim_description(b) for b in client.blueprints.list(
-        sort=sort_by, is_descending=descending, _all_tenants=all_tenants)]
-    print_data(BLUEPRINT_COLUMNS, blueprints, 'Blueprints:')
+    blueprints = pagination.list(client.blueprints.list,
+                                 filters=filters,
+                                 sort=sort_by,
+                                 is_descending=descending,
+                                 _all_tenants=all_tenants)
+    print_data(BLUEPRINT_COLUMNS, blueprints, 'Blueprints:',
+               column_types=BLUEPRINT_LIST_COLUMN_TYPES)
 
 
 @blueprints.command(name='get',
                     short_help='Retrieve blueprint information [manager only]')
 @cfy.argument('blueprint-id')
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.tenant_name(required=False, resource_name_for_help='blueprint')
 @cfy.assert_manager_active()
 @cfy.pass_client()
@@ -256,7 +270,8 @@ def get(blueprint_id, logger, client, tenant_name):
                                           blueprint_id=blueprint_id)
     blueprint_dict['#deployments'] = len(deployments)
     columns = BLUEPRINT_COLUMNS + ['#deployments']
-    print_data(columns, blueprint_dict, 'Blueprint:', max_width=50)
+    print_data(columns, blueprint_dict, 'Blueprint:', max_width=50,
+               column_types=BLUEPRINT_COLUMN_TYPES)
 
     logger.info('Description:')
     logger.info('{0}\n'.format(blueprint_dict['description'] or ''))
@@ -269,6 +284,7 @@ def get(blueprint_id, logger, client, tenant_name):
                     short_help='Retrieve blueprint inputs [manager only]')
 @cfy.argument('blueprint-id')
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.tenant_name(required=False, resource_name_for_help='blueprint')
 @cfy.assert_manager_active()
 @cfy.pass_client()
@@ -15,7 +15,6 @@
 ############
 
 import os
-import time
 import shutil
 from functools import wraps
 from datetime import datetime
@@ -25,12 +24,13 @@ from cloudify_rest_client.exceptions import (CloudifyClientError,
 
 from .. import constants, env
 from ..cli import cfy
-from ..table import print_data
+from ..polling import Poller
+from ..table import print_data, BOOL
 from ..exceptions import CloudifyCliError
-from ..execution_events_fetcher import WAIT_FOR_EXECUTION_SLEEP_INTERVAL
 
 
 CLUSTER_COLUMNS = ['name', 'host_ip', 'master', 'online']
+CLUSTER_COLUMN_TYPES = {'master': BOOL, 'online': BOOL}
 
 
 def _verify_not_in_cluster(client):
@@ -157,7 +157,7 @@ def join(client,
                                'has no cluster started'
                                .format(join_profile))
 
-    deadline = time.time() + timeout
+    poller = Poller(timeout=timeout)
     cluster_client = env.get_rest_client(client_profile=joined_profile)
     cluster_nodes = cluster_client.cluster.nodes.list()
     if any(n.name == cluster_node_name for n in cluster_nodes):
@@ -176,10 +176,9 @@ def join(client,
         credentials=new_cluster_node.credentials,
         join_addrs=join
     )
-    timeout_left = deadline - time.time()
     try:
         status = _wait_for_cluster_initialized(client, logger,
-                                               timeout=timeout_left)
+                                               timeout=poller.remaining)
     except NotClusterMaster:
         # current node has joined the cluster and has blocked REST requests;
         # for further status updates, we can query the cluster nodes endpoint
@@ -192,7 +191,7 @@ def join(client,
             raise CloudifyCliError(status.error)
 
     while True:
-        if time.time() > deadline:
+        if poller.timed_out:
             raise CloudifyCliError('Timed out waiting for database '
                                    'replication to be established')
 
@@ -202,7 +201,7 @@ def join(client,
         if any(n.host_ip == cluster_host_ip for n in nodes if n.online):
             break
         else:
-            time.sleep(WAIT_FOR_EXECUTION_SLEEP_INTERVAL)
+            poller.wait()
 
     _join_node_to_profile(env.profile, joined_profile=joined_profile)
     _copy_cluster_profile_settings(from_profile=joined_profile,
@@ -278,6 +277,7 @@ def nodes():
 
 @nodes.command(name='list',
                short_help='List the nodes in the cluster [cluster only]')
+@cfy.options.output_format
 @pass_cluster_client()
 @cfy.pass_logger
 def list_nodes(client, logger):
@@ -285,7 +285,8 @@ def list_nodes(client, logger):
     """
     response = client.cluster.nodes.list()
     default = {'master': False, 'online': False}
-    print_data(CLUSTER_COLUMNS, response, 'HA Cluster nodes', defaults=default)
+    print_data(CLUSTER_COLUMNS, response, 'HA Cluster nodes', defaults=default,
+               column_types=CLUSTER_COLUMN_TYPES)
 
 
 @nodes.command(name='remove',
@@ -397,12 +398,13 @@ def _wait_for_cluster_initialized(client, logger=None, timeout=900):
     # yield logs more recent than that.
     last_log = None
 
-    deadline = time.time() + timeout
+    poller = Poller(timeout=timeout)
     while True:
-        if time.time() >= deadline:
+        if poller.timed_out:
             raise CloudifyCliError('Timed out waiting for the Cloudify '
                                    'Manager cluster to be initialized.')
 
+        activity = False
         try:
             status = client.cluster.status(
                 _include=include,
@@ -419,8 +421,9 @@ def _wait_for_cluster_initialized(client, logger=None, timeout=900):
             if logger and status.logs:
                 last_log = status.logs[-1]['cursor']
                 _display_logs(logger, status.logs)
+                activity = True
 
             if status.initialized or status.error:
                 return status
 
-        time.sleep(WAIT_FOR_EXECUTION_SLEEP_INTERVAL)
+        poller.wait(activity=activity)
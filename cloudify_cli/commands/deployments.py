@@ -23,16 +23,19 @@ from cloudify_rest_client.exceptions import UnknownDeploymentInputError
 from cloudify_rest_client.exceptions import DeploymentPluginNotFound
 
 from .. import utils
+from .. import id_index
 from ..local import load_env
-from ..table import print_data
+from ..table import print_data, TIMESTAMP
 from ..cli import cfy, helptexts
 from ..logger import get_events_logger
+from ..event_filters import in_time_range
 from .. import execution_events_fetcher
 from ..constants import DEFAULT_BLUEPRINT_PATH
 from ..exceptions import CloudifyCliError, SuppressedCloudifyCliError
 
 DEPLOYMENT_COLUMNS = ['id', 'blueprint_id', 'created_at', 'updated_at',
                       'permission', 'tenant_name', 'created_by']
+DEPLOYMENT_COLUMN_TYPES = {'created_at': TIMESTAMP, 'updated_at': TIMESTAMP}
 TENANT_HELP_MESSAGE = 'The name of the tenant of the deployment'
 
 
@@ -60,18 +63,28 @@ def _print_deployment_inputs(client, blueprint_id, logger):
 
 @cfy.command(name='list', short_help='List deployments [manager only]')
 @cfy.options.blueprint_id()
+@cfy.options.created_by('deployment')
+@cfy.options.created_time_range('deployment')
 @cfy.options.sort_by()
 @cfy.options.descending
+@cfy.options.pagination()
+@cfy.options.list_filters
 @cfy.options.tenant_name_for_list(
     required=False, resource_name_for_help='deployment')
 @cfy.options.all_tenants
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.assert_manager_active()
 @cfy.pass_client()
 @cfy.pass_logger
 def manager_list(blueprint_id,
+                 created_by,
+                 created_since,
+                 created_until,
                  sort_by,
                  descending,
+                 pagination,
+                 filters,
                  all_tenants,
                  logger,
                  client,
@@ -79,7 +92,8 @@ def manager_list(blueprint_id,
     """List deployments
 
     If `--blueprint-id` is provided, list deployments for that blueprint.
-    Otherwise, list deployments for all blueprints.
+    Otherwise, list deployments for all blueprints. The deployments are
+    filtered by the manager.
     """
     if tenant_name:
         logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
@@ -89,13 +103,32 @@ def manager_list(blueprint_id,
     else:
         logger.info('Listing all deployments...')
 
-    deployments = client.deployments.list(
-        sort=sort_by, is_descending=descending, _all_tenants=all_tenants)
+    query = {}
     if blueprint_id:
-        deployments = filter(lambda deployment:
-                             deployment['blueprint_id'] == blueprint_id,
-                             deployments)
-    print_data(DEPLOYMENT_COLUMNS, deployments, 'Deployments:')
+        query['blueprint_id'] = blueprint_id
+    if created_by:
+        query['created_by'] = created_by
+    if created_since or created_until:
+        query['_range'] = 'created_at,{0},{1}'.format(
+            _format_range_time(created_since),
+            _format_range_time(created_until))
+    deployments = pagination.list(client.deployments.list,
+                                  filters=filters,
+                                  sort=sort_by,
+                                  is_descending=descending,
+                                  _all_tenants=all_tenants,
+                                  **query)
+    if created_since or created_until:
+        # In case the manager doesn't support ranges
+        in_range = in_time_range(created_since, created_until)
+        deployments = (deployment for deployment in deployments
+                       if in_range(deployment.get('created_at')))
+    print_data(DEPLOYMENT_COLUMNS, deployments, 'Deployments:',
+               column_types=DEPLOYMENT_COLUMN_TYPES)
+
+
+def _format_range_time(time):
+    return time.strftime('%Y-%m-%dT%H:%M:%S.%f') if time else ''
 
 
 @cfy.command(name='update', short_help='Update a deployment [manager only]')
@@ -153,6 +186,7 @@ def manager_update(deployment_id,
         skip_install=skip_install,
         skip_uninstall=skip_uninstall,
         force=force)
+    id_index.invalidate('executions', deployment_id=deployment_id)
     events_logger = get_events_logger(json_output)
 
     execution = execution_events_fetcher.wait_for_execution(
@@ -243,6 +277,7 @@ def manager_create(blueprint_id,
         _print_deployment_inputs(client, blueprint_id)
         raise CloudifyCliError(str(e))
 
+    id_index.invalidate('deployments', deployment_id=deployment.id)
     logger.info("Deployment created. The deployment's id is {0}".format(
         deployment.id))
 
@@ -265,6 +300,7 @@ def manager_delete(deployment_id, force, logger, client, tenant_name):
         logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
     logger.info('Deleting deployment {0}...'.format(deployment_id))
     client.deployments.delete(deployment_id, force)
+    id_index.invalidate('deployments', deployment_id=deployment_id)
     logger.info("Deployment deleted")
 
 
@@ -17,8 +17,11 @@
 from cloudify_rest_client.exceptions import CloudifyClientError
 
 from ..cli import cfy
-from ..logger import get_events_logger
+from ..logger import get_events_logger, get_event_fields
 from ..exceptions import CloudifyCliError, SuppressedCloudifyCliError
+from ..event_store import get_event_store
+from ..pagination import Pagination
+from ..events_export import EventsExport
 from ..execution_events_fetcher import ExecutionEventsFetcher, \
     wait_for_execution
 
@@ -38,6 +41,8 @@ def events():
 @cfy.options.include_logs
 @cfy.options.json_output
 @cfy.options.tail
+@cfy.options.event_filters()
+@cfy.options.events_batch_size
 @cfy.options.verbose()
 @cfy.options.tenant_name(required=False, resource_name_for_help='execution')
 @cfy.pass_client()
@@ -46,20 +51,32 @@ def list(execution_id,
          include_logs,
          json_output,
          tail,
+         event_filters,
+         batch_size,
          logger,
          client,
          tenant_name):
     """Display events for an execution
     """
+    if tail and event_filters and event_filters.until:
+        raise CloudifyCliError('--until cannot be used along with --tail')
     if tenant_name:
         logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
     logger.info('Listing events for execution id {0} '
                 '[include_logs={1}]'.format(execution_id, include_logs))
+    event_store = get_event_store()
+    # JSON output serializes every event, so it takes events as dicts
+    # rather than as compact views of them
     try:
         execution_events = ExecutionEventsFetcher(
             client,
             execution_id,
-            include_logs=include_logs)
+            batch_size=batch_size,
+            include_logs=include_logs,
+            event_store=event_store,
+            filters=event_filters,
+            fields=get_event_fields(json_output),
+            compact_events=not json_output)
 
         events_logger = get_events_logger(json_output)
 
@@ -68,7 +85,14 @@ def list(execution_id,
                                            client.executions.get(execution_id),
                                            events_handler=events_logger,
                                            include_logs=include_logs,
-                                           timeout=None)   # don't timeout ever
+                                           timeout=None,   # don't timeout ever
+                                           pipelined=True,
+                                           event_store=event_store,
+                                           filters=event_filters,
+                                           fields=get_event_fields(
+                                               json_output),
+                                           batch_size=batch_size,
+                                           compact_events=not json_output)
             if execution.error:
                 logger.info('Execution of workflow {0} for deployment '
                             '{1} failed. [error={2}]'.format(
@@ -84,12 +108,15 @@ def list(execution_id,
         else:
             # don't tail, get only the events created until now and return
             events = execution_events.fetch_and_process_events(
-                events_handler=events_logger)
+                events_handler=events_logger, pipelined=True)
             logger.info('\nTotal events: {0}'.format(events))
     except CloudifyClientError as e:
         if e.status_code != 404:
             raise
         raise CloudifyCliError('Execution {0} not found'.format(execution_id))
+    finally:
+        if event_store is not None:
+            event_store.close()
 
 
 @events.command(name='delete',
@@ -117,7 +144,84 @@ def delete(deployment_id, include_logs, logger, client, tenant_name):
         deployment_id, include_logs=include_logs
     )
     deleted_events_count = deleted_events_count.items[0]
+    event_store = get_event_store()
+    if event_store is not None:
+        # The stored events aren't kept per deployment
+        event_store.clear()
+        event_store.close()
     if deleted_events_count:
         logger.info('\nDeleted {0} events'.format(deleted_events_count))
     else:
         logger.info('\nNo events to delete')
+
+
+@events.command(name='export',
+                short_help='Export events to a file [manager only]')
+@cfy.options.execution_id(required=False)
+@cfy.options.deployment_id(required=False)
+@cfy.options.events_export_output_path
+@cfy.options.include_logs
+@cfy.options.events_export_compression
+@cfy.options.events_export_restart
+@cfy.options.verbose()
+@cfy.options.tenant_name(required=False,
+                         resource_name_for_help='execution or deployment')
+@cfy.pass_client()
+@cfy.pass_logger
+def export(execution_id,
+           deployment_id,
+           output_path,
+           include_logs,
+           compression,
+           restart,
+           logger,
+           client,
+           tenant_name):
+    """Export the events of an execution, or of all of the executions of
+    a deployment, to a compressed file of JSON formatted events, one per
+    line
+
+    An interrupted export is resumed when running the same command again.
+    """
+    if bool(execution_id) == bool(deployment_id):
+        raise CloudifyCliError(
+            'Either an execution ID or a deployment ID must be provided')
+    if tenant_name:
+        logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
+
+    try:
+        if execution_id:
+            execution_ids = [client.executions.get(execution_id).id]
+        else:
+            client.deployments.get(deployment_id)
+            execution_ids = _list_execution_ids(client, deployment_id)
+    except CloudifyClientError as e:
+        if e.status_code != 404:
+            raise
+        raise CloudifyCliError('{0} not found'.format(
+            'Execution {0}'.format(execution_id) if execution_id
+            else 'Deployment {0}'.format(deployment_id)))
+
+    events_export = EventsExport(output_path,
+                                 execution_ids,
+                                 include_logs=include_logs,
+                                 compression=compression)
+    if not restart and events_export.resume():
+        logger.info('Resuming the export to {0} after {1} events'.format(
+            output_path, events_export.exported_events))
+    else:
+        logger.info('Exporting the events of {0} execution(s) to {1} '
+                    '[include_logs={2}]'.format(
+                        len(execution_ids), output_path, include_logs))
+    events_count = events_export.run(client)
+    logger.info('Exported {0} events to {1}'.format(
+        events_count, output_path))
+
+
+def _list_execution_ids(client, deployment_id):
+    executions = Pagination().list(client.executions.list,
+                                   deployment_id=deployment_id,
+                                   include_system_workflows=True,
+                                   sort='created_at',
+                                   _include=['id'])
+    return [execution.id for execution in executions]
@@ -21,11 +21,17 @@ from cloudify_rest_client import exceptions
 
 from .. import local
 from .. import utils
-from ..table import print_data
+from .. import id_index
+from ..table import print_data, TIMESTAMP
 from ..cli import cfy, helptexts
-from ..logger import get_events_logger
+from ..logger import get_events_logger, get_event_fields
+from ..event_filters import EventFilters
 from ..constants import DEFAULT_UNINSTALL_WORKFLOW
 from ..execution_events_fetcher import wait_for_execution
+from ..execution_events_fetcher import ExecutionEventsFetcher
+from ..execution_profile import (ExecutionProfile,
+                                 PROFILED_EVENT_TYPES,
+                                 PROFILED_EVENT_FIELDS)
 from ..exceptions import CloudifyCliError, ExecutionTimeoutError, \
     SuppressedCloudifyCliError
 
@@ -36,6 +42,15 @@ _STATUS_CANCELING_MESSAGE = (
 EXECUTION_COLUMNS = ['id', 'workflow_id', 'status', 'deployment_id',
                      'created_at', 'error', 'permission', 'tenant_name',
                      'created_by']
+EXECUTION_COLUMN_TYPES = {'created_at': TIMESTAMP}
+PROFILE_TASK_COLUMNS = ['node_instance', 'operation', 'duration',
+                        'run_time', 'queue_wait', 'retries', 'outcome']
+PROFILE_OPERATION_COLUMNS = ['operation', 'tasks', 'total', 'average',
+                             'max', 'queue_wait', 'retries']
+PROFILE_NODE_COLUMNS = ['node', 'tasks', 'total', 'span', 'queue_wait',
+                        'retries']
+PROFILE_CRITICAL_PATH_COLUMNS = ['node_instance', 'operation', 'queued_at',
+                                 'duration', 'gap']
 
 
 @cfy.group(name='executions')
@@ -50,6 +65,7 @@ def executions():
              short_help='Retrieve execution information [manager only]')
 @cfy.argument('execution-id')
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.tenant_name(required=False, resource_name_for_help='execution')
 @cfy.assert_manager_active()
 @cfy.pass_client()
@@ -69,7 +85,8 @@ def manager_get(execution_id, logger, client, tenant_name):
             raise
         raise CloudifyCliError('Execution {0} not found'.format(execution_id))
 
-    print_data(EXECUTION_COLUMNS, execution, 'Execution:', max_width=50)
+    print_data(EXECUTION_COLUMNS, execution, 'Execution:', max_width=50,
+               column_types=EXECUTION_COLUMN_TYPES)
 
     # print execution parameters
     logger.info('Execution Parameters:')
@@ -87,8 +104,11 @@ def manager_get(execution_id, logger, client, tenant_name):
 @cfy.options.include_system_workflows
 @cfy.options.sort_by()
 @cfy.options.descending
+@cfy.options.pagination()
+@cfy.options.list_filters
 @cfy.options.tenant_name(required=False, resource_name_for_help='executions')
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.assert_manager_active()
 @cfy.pass_client()
 @cfy.pass_logger
@@ -97,6 +117,8 @@ def manager_list(
         include_system_workflows,
         sort_by,
         descending,
+        pagination,
+        filters,
         logger,
         client,
         tenant_name):
@@ -113,7 +135,9 @@ def manager_list(
                 deployment_id))
         else:
             logger.info('Listing all executions...')
-        executions = client.executions.list(
+        executions = pagination.list(
+            client.executions.list,
+            filters=filters,
             deployment_id=deployment_id,
             include_system_workflows=include_system_workflows,
             sort=sort_by,
@@ -125,14 +149,27 @@ def manager_list(
         raise CloudifyCliError('Deployment {0} does not exist'.format(
             deployment_id))
 
-    print_data(EXECUTION_COLUMNS, executions, 'Executions:')
+    cancelling = []
+    print_data(EXECUTION_COLUMNS,
+               _find_cancelling(executions, cancelling),
+               'Executions:',
+               column_types=EXECUTION_COLUMN_TYPES)
 
-    if any(execution.status in (
-            execution.CANCELLING, execution.FORCE_CANCELLING)
-            for execution in executions):
+    if cancelling:
         logger.info(_STATUS_CANCELING_MESSAGE)
 
 
+def _find_cancelling(executions, cancelling):
+    """Yield the executions, adding those which are being cancelled to
+    `cancelling` as they're read (the executions are only listed once).
+    """
+    for execution in executions:
+        if execution.status in (execution.CANCELLING,
+                                execution.FORCE_CANCELLING):
+            cancelling.append(execution)
+        yield execution
+
+
 @cfy.command(name='start',
              short_help='Execute a workflow [manager only]')
 @cfy.argument('workflow-id')
@@ -143,6 +180,7 @@ def manager_list(
 @cfy.options.timeout()
 @cfy.options.include_logs
 @cfy.options.json_output
+@cfy.options.event_filters(time_range=False)
 @cfy.options.verbose()
 @cfy.options.tenant_name(required=False, resource_name_for_help='execution')
 @cfy.assert_manager_active()
@@ -156,6 +194,7 @@ def manager_start(workflow_id,
                   timeout,
                   include_logs,
                   json_output,
+                  event_filters,
                   logger,
                   client,
                   tenant_name):
@@ -212,12 +251,17 @@ def manager_start(workflow_id,
                 parameters=parameters,
                 allow_custom_parameters=allow_custom_parameters,
                 force=force)
+        id_index.invalidate('executions')
 
         execution = wait_for_execution(client,
                                        execution,
                                        events_handler=events_logger,
                                        include_logs=include_logs,
-                                       timeout=timeout)
+                                       timeout=timeout,
+                                       pipelined=True,
+                                       filters=event_filters,
+                                       fields=get_event_fields(json_output),
+                                       compact_events=not json_output)
         if execution.error:
             logger.info('Execution of workflow {0} for deployment '
                         '{1} failed. [error={2}]'.format(
@@ -285,6 +329,122 @@ def manager_cancel(execution_id, force, logger, client, tenant_name):
         "cfy executions get {0}".format(execution_id))
 
 
+@cfy.command(name='profile',
+             short_help='Show where the time of an execution went '
+                        '[manager only]')
+@cfy.argument('execution-id')
+@cfy.options.profile_top
+@cfy.options.profile_trace_output
+@cfy.options.verbose()
+@cfy.options.tenant_name(required=False, resource_name_for_help='execution')
+@cfy.assert_manager_active()
+@cfy.pass_client()
+@cfy.pass_logger
+def manager_profile(execution_id,
+                    top,
+                    trace_output,
+                    logger,
+                    client,
+                    tenant_name):
+    """Show how long the operations of an execution took
+
+    `EXECUTION_ID` is the execution to profile.
+
+    The execution's task events are read once, to show the time spent per
+    operation and per node, the slowest operations, the time operations
+    waited in queue before they started, retries, the number of
+    operations running at once, and the critical path (estimated from
+    timing, as the events don't tell which operations waited for which).
+    """
+    if tenant_name:
+        logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
+    logger.info('Profiling execution {0}...'.format(execution_id))
+    profile = ExecutionProfile()
+    try:
+        events_fetcher = ExecutionEventsFetcher(
+            client,
+            execution_id,
+            filters=EventFilters(event_types=PROFILED_EVENT_TYPES),
+            fields=PROFILED_EVENT_FIELDS)
+        events_fetcher.fetch_and_process_events(events_handler=profile,
+                                                timeout=None,
+                                                pipelined=True)
+    except exceptions.CloudifyClientError as e:
+        if e.status_code != 404:
+            raise
+        raise CloudifyCliError('Execution {0} not found'.format(execution_id))
+
+    _print_profile(profile, top, logger)
+    if trace_output:
+        profile.write_chrome_trace(trace_output)
+        logger.info('Trace written to {0}'.format(trace_output))
+
+
+def _print_profile(profile, top, logger):
+    summary = profile.summary
+    logger.info('')
+    logger.info('Duration: {0}s{1}'.format(
+        _format_seconds(summary['duration']),
+        ' ({0})'.format(summary['outcome']) if summary['outcome'] else ''))
+    logger.info('Operations: {0} ({1} retries, {2} failed)'.format(
+        summary['tasks'], summary['retries'], summary['failed_tasks']))
+    logger.info('Time running operations: {0}s'.format(
+        _format_seconds(summary['task_time'])))
+    logger.info('Time operations waited in queue: {0}s'.format(
+        _format_seconds(summary['queue_wait'])))
+    logger.info('Operations running at once: {0} at most, {1:.2f} on '
+                'average'.format(summary['peak_concurrency'],
+                                 summary['average_concurrency']))
+    if not summary['tasks']:
+        return
+
+    start = profile.start
+    print_data(PROFILE_TASK_COLUMNS,
+               [_get_task_row(task) for task in profile.slowest_tasks(top)],
+               'Slowest operations:')
+    print_data(PROFILE_OPERATION_COLUMNS,
+               [_format_row(row) for row in profile.operations],
+               'Time per operation:')
+    print_data(PROFILE_NODE_COLUMNS,
+               [_format_row(row) for row in profile.nodes],
+               'Time per node:')
+    critical_path = []
+    previous_end = None
+    for task in profile.critical_path:
+        row = _get_task_row(task)
+        row['queued_at'] = '+{0}'.format(
+            _format_seconds(task.queued_at - start))
+        row['gap'] = _format_seconds(task.queued_at - previous_end) \
+            if previous_end is not None else ''
+        previous_end = task.ended_at
+        critical_path.append(row)
+    print_data(PROFILE_CRITICAL_PATH_COLUMNS, critical_path,
+               'Critical path (estimated):')
+
+
+def _get_task_row(task):
+    return _format_row({
+        'node_instance': task.node_id,
+        'operation': task.operation,
+        'duration': task.duration,
+        'run_time': task.run_time,
+        'queue_wait': task.queue_wait,
+        'retries': task.retries,
+        'outcome': (task.outcome or '').replace('task_', '', 1),
+    })
+
+
+def _format_row(row):
+    return dict(
+        (key, _format_seconds(value) if isinstance(value, float) else
+         str(value) if isinstance(value, int) else value)
+        for key, value in row.iteritems())
+
+
+def _format_seconds(seconds):
+    return '{0:.3f}'.format(seconds)
+
+
 def _get_deployment_environment_creation_execution(client, deployment_id):
     executions = client.executions.list(deployment_id=deployment_id)
     for execution in executions:
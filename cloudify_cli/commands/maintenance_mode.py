@@ -14,17 +14,15 @@
 # limitations under the License.
 ############
 
-import time
-
 from .. import utils
 from ..cli import cfy
 from .. import exceptions
+from ..polling import Poller
 from ..table import print_data
 from ..logger import NO_VERBOSE
 from ..logger import get_global_verbosity
 
 
-DEFAULT_TIMEOUT_INTERVAL = 5
 MAINTENANCE_MODE_ACTIVE = 'activated'
 EXECUTION_COLUMNS = ['id', 'deployment_id', 'workflow_id', 'status']
 
@@ -116,10 +114,11 @@ def activate(wait, timeout, logger, client):
     if wait:
         logger.info("Cloudify manager will enter Maintenance mode once "
                     "there are no running or pending executions...\n")
-        deadline = time.time() + timeout
+        # A timeout of 0 means waiting forever
+        poller = Poller(timeout=timeout or None)
 
         while True:
-            if _is_timeout(timeout, deadline):
+            if _is_timeout(poller):
                 raise exceptions.CloudifyCliError(
                     "Timed out while entering maintenance mode. "
                     "Note that the manager is still entering maintenance mode"
@@ -132,7 +131,7 @@ def activate(wait, timeout, logger, client):
                 logger.info('While in maintenance mode most requests will '
                             'be blocked.')
                 return
-            time.sleep(DEFAULT_TIMEOUT_INTERVAL)
+            poller.wait()
     logger.info("Run 'cfy maintenance-mode status' to check the "
                 "maintenance mode's status.\n")
 
@@ -151,5 +150,5 @@ def deactivate(logger, client):
     logger.info('Maintenance mode is off.')
 
 
-def _is_timeout(timeout, deadline):
-    return timeout > 0 and time.time() > deadline
+def _is_timeout(poller):
+    return poller.timed_out
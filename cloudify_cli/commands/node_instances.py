@@ -27,6 +27,8 @@ from ..exceptions import CloudifyCliError
 
 NODE_INSTANCE_COLUMNS = ['id', 'deployment_id', 'host_id', 'node_id', 'state',
                          'permission', 'tenant_name', 'created_by']
+# All of the columns are text
+NODE_INSTANCE_COLUMN_TYPES = {}
 
 
 @cfy.group(name='node-instances')
@@ -43,6 +45,7 @@ def manager():
                  '[manager only]')
 @cfy.argument('node_instance_id')
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.tenant_name(
     required=False, resource_name_for_help='node-instance')
 @cfy.pass_logger
@@ -63,7 +66,8 @@ def get(node_instance_id, logger, client, tenant_name):
         raise CloudifyCliError('Node instance {0} not found'.format(
             node_instance_id))
 
-    print_data(NODE_INSTANCE_COLUMNS, node_instance, 'Node-instance:', 50)
+    print_data(NODE_INSTANCE_COLUMNS, node_instance, 'Node-instance:', 50,
+               column_types=NODE_INSTANCE_COLUMN_TYPES)
 
     # print node instance runtime properties
     logger.info('Instance runtime properties:')
@@ -80,16 +84,21 @@ def get(node_instance_id, logger, client, tenant_name):
 @cfy.options.node_name
 @cfy.options.sort_by('node_id')
 @cfy.options.descending
+@cfy.options.pagination()
+@cfy.options.list_filters
 @cfy.options.tenant_name_for_list(
     required=False, resource_name_for_help='node-instance')
 @cfy.options.all_tenants
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.pass_logger
 @cfy.pass_client()
 def list(deployment_id,
          node_name,
          sort_by,
          descending,
+         pagination,
+         filters,
          all_tenants,
          logger,
          client,
@@ -107,7 +116,9 @@ def list(deployment_id,
                 deployment_id))
         else:
             logger.info('Listing all instances...')
-        node_instances = client.node_instances.list(
+        node_instances = pagination.list(
+            client.node_instances.list,
+            filters=filters,
             deployment_id=deployment_id,
             node_name=node_name,
             sort=sort_by,
@@ -119,7 +130,8 @@ def list(deployment_id,
         raise CloudifyCliError('Deployment {0} does not exist'.format(
             deployment_id))
 
-    print_data(NODE_INSTANCE_COLUMNS, node_instances, 'Node-instances:')
+    print_data(NODE_INSTANCE_COLUMNS, node_instances, 'Node-instances:',
+               column_types=NODE_INSTANCE_COLUMN_TYPES)
 
 
 @cfy.command(name='node-instances',
@@ -25,6 +25,8 @@ from ..exceptions import CloudifyCliError
 NODE_COLUMNS = ['id', 'deployment_id', 'blueprint_id', 'host_id', 'type',
                 'number_of_instances', 'planned_number_of_instances',
                 'permission', 'tenant_name', 'created_by']
+# All of the columns are text
+NODE_COLUMN_TYPES = {}
 
 
 @cfy.group(name='nodes')
@@ -41,6 +43,7 @@ def nodes():
 @cfy.argument('node-id')
 @cfy.options.deployment_id(required=True)
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.tenant_name(required=False, resource_name_for_help='node')
 @cfy.pass_logger
 @cfy.pass_client()
@@ -70,7 +73,8 @@ def get(node_id, deployment_id, logger, client, tenant_name):
         raise CloudifyCliError('No node instances were found for '
                                'node {0}'.format(node_id))
 
-    print_data(NODE_COLUMNS, node, 'Node:', max_width=50)
+    print_data(NODE_COLUMNS, node, 'Node:', max_width=50,
+               column_types=NODE_COLUMN_TYPES)
 
     # print node properties
     logger.info('Node properties:')
@@ -94,14 +98,17 @@ def get(node_id, deployment_id, logger, client, tenant_name):
 @cfy.options.deployment_id()
 @cfy.options.sort_by('deployment_id')
 @cfy.options.descending
+@cfy.options.pagination()
+@cfy.options.list_filters
 @cfy.options.tenant_name_for_list(
     required=False, resource_name_for_help='node')
 @cfy.options.all_tenants
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.pass_logger
 @cfy.pass_client()
-def list(deployment_id, sort_by, descending, tenant_name, all_tenants,
-         logger, client):
+def list(deployment_id, sort_by, descending, pagination, filters,
+         tenant_name, all_tenants, logger, client):
     """List nodes
 
     If `DEPLOYMENT_ID` is provided, list nodes for that deployment.
@@ -115,7 +122,9 @@ def list(deployment_id, sort_by, descending, tenant_name, all_tenants,
                 deployment_id))
         else:
             logger.info('Listing all nodes...')
-        nodes = client.nodes.list(
+        nodes = pagination.list(
+            client.nodes.list,
+            filters=filters,
             deployment_id=deployment_id,
             sort=sort_by,
             is_descending=descending,
@@ -126,4 +135,5 @@ def list(deployment_id, sort_by, descending, tenant_name, all_tenants,
         raise CloudifyCliError('Deployment {0} does not exist'.format(
             deployment_id))
 
-    print_data(NODE_COLUMNS, nodes, 'Nodes:')
+    print_data(NODE_COLUMNS, nodes, 'Nodes:',
+               column_types=NODE_COLUMN_TYPES)
@@ -17,8 +17,9 @@
 import tarfile
 from urlparse import urlparse
 
-from ..table import print_data
+from ..table import print_data, TIMESTAMP
 from .. import utils
+from .. import id_index
 from ..cli import helptexts, cfy
 from ..exceptions import CloudifyCliError
 
@@ -26,6 +27,7 @@ from ..exceptions import CloudifyCliError
 PLUGIN_COLUMNS = ['id', 'package_name', 'package_version', 'distribution',
                   'supported_platform', 'distribution_release', 'uploaded_at',
                   'permission', 'tenant_name', 'created_by']
+PLUGIN_COLUMN_TYPES = {'uploaded_at': TIMESTAMP}
 EXCLUDED_COLUMNS = ['archive_name', 'distribution_version', 'excluded_wheels',
                     'package_source', 'supported_py_versions', 'wheels']
 
@@ -92,6 +94,7 @@ def delete(plugin_id, force, logger, client, tenant_name):
         logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
     logger.info('Deleting plugin {0}...'.format(plugin_id))
     client.plugins.delete(plugin_id=plugin_id, force=force)
+    id_index.invalidate('plugins')
     logger.info('Plugin deleted')
 
 
@@ -123,6 +126,7 @@ def upload(ctx, plugin_path, private_resource, logger, client, tenant_name):
     plugin = client.plugins.upload(plugin_path,
                                    private_resource,
                                    progress_handler)
+    id_index.invalidate('plugins')
     logger.info("Plugin uploaded. The plugin's id is {0}".format(plugin.id))
 
 
@@ -154,6 +158,7 @@ def download(plugin_id, output_path, logger, client, tenant_name):
                  short_help='Retrieve plugin information [manager only]')
 @cfy.argument('plugin-id')
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.tenant_name(required=False, resource_name_for_help='plugin')
 @cfy.assert_manager_active()
 @cfy.pass_client()
@@ -168,32 +173,46 @@ def get(plugin_id, logger, client, tenant_name):
     logger.info('Retrieving plugin {0}...'.format(plugin_id))
     plugin = client.plugins.get(plugin_id)
     _transform_plugin_response(plugin)
-    print_data(PLUGIN_COLUMNS, plugin, 'Plugin:')
+    print_data(PLUGIN_COLUMNS, plugin, 'Plugin:',
+               column_types=PLUGIN_COLUMN_TYPES)
 
 
 @plugins.command(name='list',
                  short_help='List plugins [manager only]')
 @cfy.options.sort_by('uploaded_at')
 @cfy.options.descending
+@cfy.options.pagination()
+@cfy.options.list_filters
 @cfy.options.tenant_name_for_list(
     required=False, resource_name_for_help='plugin')
 @cfy.options.all_tenants
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.assert_manager_active()
 @cfy.pass_client()
 @cfy.pass_logger
-def list(sort_by, descending, tenant_name, all_tenants, logger, client):
+def list(sort_by,
+         descending,
+         pagination,
+         filters,
+         tenant_name,
+         all_tenants,
+         logger,
+         client):
     """List all plugins on the manager
     """
     if tenant_name:
         logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
     logger.info('Listing all plugins...')
-    plugins_list = client.plugins.list(sort=sort_by,
-                                       is_descending=descending,
-                                       _all_tenants=all_tenants)
-    for plugin in plugins_list:
-        _transform_plugin_response(plugin)
-    print_data(PLUGIN_COLUMNS, plugins_list, 'Plugins:')
+    plugins_list = pagination.list(client.plugins.list,
+                                   filters=filters,
+                                   sort=sort_by,
+                                   is_descending=descending,
+                                   _all_tenants=all_tenants)
+    plugins_list = (_transform_plugin_response(plugin)
+                    for plugin in plugins_list)
+    print_data(PLUGIN_COLUMNS, plugins_list, 'Plugins:',
+               column_types=PLUGIN_COLUMN_TYPES)
 
 
 def _transform_plugin_response(plugin):
@@ -201,3 +220,4 @@ def _transform_plugin_response(plugin):
     """
     for column in EXCLUDED_COLUMNS:
         plugin.pop(column, None)
+    return plugin
@@ -58,6 +58,7 @@ def profiles():
 @profiles.command(name='show-current',
                   short_help='Retrieve current profile information')
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.pass_logger
 def show(logger):
     """Shows your current active profile and it's properties
@@ -76,6 +77,7 @@ def show(logger):
 @profiles.command(name='list',
                   short_help='List profiles')
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.pass_logger
 def list(logger):
     """List all profiles
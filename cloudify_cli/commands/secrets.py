@@ -17,12 +17,13 @@ import os
 
 from .. import env
 from ..cli import cfy
-from ..table import print_data, print_details
+from ..table import print_data, print_details, TIMESTAMP
 from ..utils import handle_client_error
 from ..exceptions import CloudifyCliError
 
 SECRETS_COLUMNS = ['key', 'created_at', 'updated_at', 'permission',
                    'tenant_name', 'created_by']
+SECRETS_COLUMN_TYPES = {'created_at': TIMESTAMP, 'updated_at': TIMESTAMP}
 
 
 @cfy.group(name='secrets')
@@ -75,6 +76,7 @@ def create(key, secret_string, secret_file, logger, client):
 @secrets.command(name='get', short_help='Get details for a single secret')
 @cfy.argument('key', callback=cfy.validate_name)
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.assert_manager_active()
 @cfy.pass_client(use_tenant_in_header=True)
 @cfy.pass_logger
@@ -116,14 +118,24 @@ def update(key, secret_string, logger, client):
 @secrets.command(name='list', short_help="List all secrets")
 @cfy.options.sort_by('key')
 @cfy.options.descending
+@cfy.options.pagination()
+@cfy.options.list_filters
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.tenant_name_for_list(required=False,
                                   resource_name_for_help='secret')
 @cfy.options.all_tenants
 @cfy.assert_manager_active()
 @cfy.pass_client()
 @cfy.pass_logger
-def list(sort_by, descending, tenant_name, all_tenants, logger, client):
+def list(sort_by,
+         descending,
+         pagination,
+         filters,
+         tenant_name,
+         all_tenants,
+         logger,
+         client):
     """List all secrets
     """
 
@@ -131,13 +143,16 @@ def list(sort_by, descending, tenant_name, all_tenants, logger, client):
         logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
 
     logger.info('Listing all secrets...')
-    secrets_list = client.secrets.list(
+    secrets_list = pagination.list(
+        client.secrets.list,
+        filters=filters,
         sort=sort_by,
         is_descending=descending,
         _all_tenants=all_tenants
     )
 
-    print_data(SECRETS_COLUMNS, secrets_list, 'Secrets:')
+    print_data(SECRETS_COLUMNS, secrets_list, 'Secrets:',
+               column_types=SECRETS_COLUMN_TYPES)
 
 
 @secrets.command(name='delete', short_help='Delete a secret')
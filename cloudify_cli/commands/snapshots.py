@@ -14,12 +14,14 @@
 # limitations under the License.
 ############
 
-from ..table import print_data
+from ..table import print_data, TIMESTAMP
 from .. import utils
+from .. import id_index
 from ..cli import helptexts, cfy
 
 SNAPSHOT_COLUMNS = ['id', 'created_at', 'status', 'error', 'permission',
                     'tenant_name', 'created_by']
+SNAPSHOT_COLUMN_TYPES = {'created_at': TIMESTAMP}
 
 
 @cfy.group(name='snapshots')
@@ -116,6 +118,7 @@ def create(snapshot_id,
                                         include_metrics,
                                         not exclude_credentials,
                                         private_resource)
+    id_index.invalidate('snapshots')
     logger.info("Started workflow execution. The execution's id is {0}".format(
         execution.id))
 
@@ -136,6 +139,7 @@ def delete(snapshot_id, logger, client, tenant_name):
         logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
     logger.info('Deleting snapshot {0}...'.format(snapshot_id))
     client.snapshots.delete(snapshot_id)
+    id_index.invalidate('snapshots')
     logger.info('Snapshot deleted successfully')
 
 
@@ -168,6 +172,7 @@ def upload(snapshot_path,
                                        snapshot_id,
                                        private_resource,
                                        progress_handler)
+    id_index.invalidate('snapshots')
     logger.info("Snapshot uploaded. The snapshot's id is {0}".format(
         snapshot.id))
 
@@ -200,20 +205,33 @@ def download(snapshot_id, output_path, logger, client, tenant_name):
                    short_help='List snapshots [manager only]')
 @cfy.options.sort_by()
 @cfy.options.descending
+@cfy.options.pagination()
+@cfy.options.list_filters
 @cfy.options.tenant_name_for_list(
     required=False, resource_name_for_help='snapshot')
 @cfy.options.all_tenants
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.pass_client()
 @cfy.pass_logger
-def list(sort_by, descending, tenant_name, all_tenants, logger, client):
+def list(sort_by,
+         descending,
+         pagination,
+         filters,
+         tenant_name,
+         all_tenants,
+         logger,
+         client):
     """List all snapshots on the manager
     """
     if tenant_name:
         logger.info('Explicitly using tenant `{0}`'.format(tenant_name))
     logger.info('Listing snapshots...')
-    snapshots = client.snapshots.list(sort=sort_by,
-                                      is_descending=descending,
-                                      _all_tenants=all_tenants)
-
-    print_data(SNAPSHOT_COLUMNS, snapshots, 'Snapshots:')
+    snapshots = pagination.list(client.snapshots.list,
+                                filters=filters,
+                                sort=sort_by,
+                                is_descending=descending,
+                                _all_tenants=all_tenants)
+
+    print_data(SNAPSHOT_COLUMNS, snapshots, 'Snapshots:',
+               column_types=SNAPSHOT_COLUMN_TYPES)
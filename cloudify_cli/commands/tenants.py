@@ -16,10 +16,11 @@
 
 from .. import env
 from ..cli import cfy
-from ..table import print_data
+from ..table import print_data, LIST
 from ..utils import handle_client_error
 
 TENANT_COLUMNS = ['name', 'groups', 'users']
+TENANT_COLUMN_TYPES = {'groups': LIST, 'users': LIST}
 
 
 @cfy.group(name='tenants')
@@ -35,21 +36,27 @@ def tenants():
                  short_help='List tenants [manager only]')
 @cfy.options.sort_by('name')
 @cfy.options.descending
+@cfy.options.pagination()
+@cfy.options.list_filters
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.get_data
 @cfy.assert_manager_active()
 @cfy.pass_client()
 @cfy.pass_logger
-def list(sort_by, descending, get_data, logger, client):
+def list(sort_by, descending, pagination, filters, get_data, logger, client):
     """List all tenants
     """
     logger.info('Listing all tenants...')
-    tenants_list = client.tenants.list(
+    tenants_list = pagination.list(
+        client.tenants.list,
+        filters=filters,
         sort=sort_by,
         is_descending=descending,
         _get_data=get_data
     )
-    print_data(TENANT_COLUMNS, tenants_list, 'Tenants:')
+    print_data(TENANT_COLUMNS, tenants_list, 'Tenants:',
+               column_types=TENANT_COLUMN_TYPES)
 
 
 @tenants.command(name='create',
@@ -156,6 +163,7 @@ def remove_group(user_group_name, tenant_name, logger, client):
                  short_help='Get details for a single tenant [manager only]')
 @cfy.argument('tenant-name', callback=cfy.validate_name)
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.assert_manager_active()
 @cfy.options.get_data
 @cfy.pass_client(use_tenant_in_header=False)
@@ -167,7 +175,8 @@ def get(tenant_name, get_data, logger, client):
     """
     logger.info('Getting info for tenant `{0}`...'.format(tenant_name))
     tenant_details = client.tenants.get(tenant_name, _get_data=get_data)
-    print_data(TENANT_COLUMNS, tenant_details, 'Requested tenant info:')
+    print_data(TENANT_COLUMNS, tenant_details, 'Requested tenant info:',
+               column_types=TENANT_COLUMN_TYPES)
 
 
 @tenants.command(name='delete',
@@ -15,7 +15,6 @@
 ############
 
 import os
-import time
 import json
 import shutil
 import tempfile
@@ -25,6 +24,7 @@ from .. import local
 from .. import utils
 from ..cli import cfy
 from .. import exceptions
+from ..polling import Poller
 from ..env import profile
 from . import maintenance_mode
 from ..bootstrap import bootstrap as bs
@@ -224,8 +224,9 @@ def put_workflow_state_file(is_upgrade, key_filename, user, port):
 
 
 def _wait_for_maintenance(client, logger):
+    poller = Poller()
     curr_status = client.maintenance_mode.status().status
     while curr_status != maintenance_mode.MAINTENANCE_MODE_ACTIVE:
         logger.info('Waiting for maintenance mode to be activated...')
-        time.sleep(maintenance_mode.DEFAULT_TIMEOUT_INTERVAL)
+        poller.wait()
         curr_status = client.maintenance_mode.status().status
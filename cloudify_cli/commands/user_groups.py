@@ -16,10 +16,11 @@
 
 from .. import env
 from ..cli import cfy
-from ..table import print_data
+from ..table import print_data, LIST
 from ..utils import handle_client_error
 
 GROUP_COLUMNS = ['name', 'tenants', 'users']
+GROUP_COLUMN_TYPES = {'tenants': LIST, 'users': LIST}
 
 
 @cfy.group(name='user-groups')
@@ -36,6 +37,7 @@ def user_groups():
 @cfy.options.sort_by('name')
 @cfy.options.descending
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.get_data
 @cfy.assert_manager_active()
 @cfy.pass_client()
@@ -49,7 +51,8 @@ def list(sort_by, descending, get_data, logger, client):
         is_descending=descending,
         _get_data=get_data
     )
-    print_data(GROUP_COLUMNS, user_groups_list, 'User groups:')
+    print_data(GROUP_COLUMNS, user_groups_list, 'User groups:',
+               column_types=GROUP_COLUMN_TYPES)
 
 
 @user_groups.command(name='create',
@@ -75,6 +78,7 @@ def create(user_group_name, ldap_distinguished_name, logger, client):
                                 'user group [manager only]')
 @cfy.argument('user-group-name', callback=cfy.validate_name)
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.get_data
 @cfy.assert_manager_active()
 @cfy.pass_client()
@@ -89,7 +93,8 @@ def get(user_group_name, get_data, logger, client):
         user_group_name,
         _get_data=get_data
     )
-    print_data(GROUP_COLUMNS, user_group_details, 'Requested user group info:')
+    print_data(GROUP_COLUMNS, user_group_details, 'Requested user group info:',
+               column_types=GROUP_COLUMN_TYPES)
 
 
 @user_groups.command(name='add-user',
@@ -16,11 +16,13 @@
 
 from .. import env
 from ..cli import cfy
-from ..table import print_data
+from ..table import print_data, TIMESTAMP, LIST, BOOL
 from ..utils import handle_client_error
 
 USER_COLUMNS = ['username', 'groups', 'role', 'tenants', 'active',
                 'last_login_at']
+USER_COLUMN_TYPES = {'groups': LIST, 'tenants': LIST, 'active': BOOL,
+                     'last_login_at': TIMESTAMP}
 
 
 @cfy.group(name='users')
@@ -35,21 +37,27 @@ def users():
 @users.command(name='list', short_help='List users [manager only]')
 @cfy.options.sort_by('username')
 @cfy.options.descending
+@cfy.options.pagination()
+@cfy.options.list_filters
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.get_data
 @cfy.assert_manager_active()
 @cfy.pass_client()
 @cfy.pass_logger
-def list(sort_by, descending, get_data, logger, client):
+def list(sort_by, descending, pagination, filters, get_data, logger, client):
     """List all users
     """
     logger.info('Listing all users...')
-    users_list = client.users.list(
+    users_list = pagination.list(
+        client.users.list,
+        filters=filters,
         sort=sort_by,
         is_descending=descending,
         _get_data=get_data
     )
-    print_data(USER_COLUMNS, users_list, 'Users:')
+    print_data(USER_COLUMNS, users_list, 'Users:',
+               column_types=USER_COLUMN_TYPES)
 
 
 @users.command(name='create', short_help='Create a user [manager only]')
@@ -109,6 +117,7 @@ def set_role(username, security_role, logger, client):
                short_help='Get details for a single user [manager only]')
 @cfy.argument('username', callback=cfy.validate_name)
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.get_data
 @cfy.assert_manager_active()
 @cfy.pass_client()
@@ -120,7 +129,8 @@ def get(username, get_data, logger, client):
     """
     logger.info('Getting info for user `{0}`...'.format(username))
     user_details = client.users.get(username, _get_data=get_data)
-    print_data(USER_COLUMNS, user_details, 'Requested user info:')
+    print_data(USER_COLUMNS, user_details, 'Requested user info:',
+               column_types=USER_COLUMN_TYPES)
 
 
 @users.command(name='delete',
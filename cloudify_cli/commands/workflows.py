@@ -16,12 +16,13 @@
 
 from cloudify_rest_client.exceptions import CloudifyClientError
 
-from ..table import print_data
+from ..table import print_data, TIMESTAMP
 from .. import utils
 from ..cli import cfy
 from ..exceptions import CloudifyCliError
 
 WORKFLOW_COLUMNS = ['blueprint_id', 'deployment_id', 'name', 'created_at']
+WORKFLOW_COLUMN_TYPES = {'created_at': TIMESTAMP}
 
 
 @cfy.group(name='workflows')
@@ -37,6 +38,7 @@ def workflows():
 @cfy.argument('workflow-id')
 @cfy.options.deployment_id(required=True)
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.tenant_name(required=False, resource_name_for_help='deployment')
 @cfy.pass_logger
 @cfy.pass_client()
@@ -66,7 +68,8 @@ def get(workflow_id, deployment_id, logger, client, tenant_name):
         'blueprint_id': deployment.blueprint_id,
         'deployment_id': deployment.id
     }
-    print_data(WORKFLOW_COLUMNS, workflow, 'Workflows:', defaults=defaults)
+    print_data(WORKFLOW_COLUMNS, workflow, 'Workflows:', defaults=defaults,
+               column_types=WORKFLOW_COLUMN_TYPES)
 
     # print workflow parameters
     mandatory_params = dict()
@@ -101,6 +104,7 @@ def get(workflow_id, deployment_id, logger, client, tenant_name):
                    short_help='List workflows for a deployment [manager only]')
 @cfy.options.deployment_id(required=True)
 @cfy.options.verbose()
+@cfy.options.output_format
 @cfy.options.tenant_name(required=False, resource_name_for_help='deployment')
 @cfy.pass_logger
 @cfy.pass_client()
@@ -118,4 +122,5 @@ def list(deployment_id, logger, client, tenant_name):
         'blueprint_id': deployment.blueprint_id,
         'deployment_id': deployment.id
     }
-    print_data(WORKFLOW_COLUMNS, workflows, 'Workflows:', defaults=defaults)
+    print_data(WORKFLOW_COLUMNS, workflows, 'Workflows:', defaults=defaults,
+               column_types=WORKFLOW_COLUMN_TYPES)
@@ -0,0 +1,191 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""Read-only views of events in the internal format, over events in the
+format returned by the events API.
+
+`cloudify.event.Event` expects the context fields of an event under a
+`context` dict, and its message under a `message` dict. Rather than
+building those dicts, and deleting the keys they replace, for every
+fetched event, a `CompactEvent` looks the fields up in the API event
+when they are read.
+
+The views are read-only mappings, which implement the parts of the dict
+interface that handlers use. Unlike `collections.Mapping` subclasses
+(`Mapping` declares no `__slots__`), they have no `__dict__`, and the
+context and message views are only built if they are read.
+"""
+
+# The keys of an event's context, by the keys of the API event they are
+# read from
+CONTEXT_FIELDS = {
+    'deployment_id': 'deployment_id',
+    'execution_id': 'execution_id',
+    'node_name': 'node_name',
+    'operation': 'operation',
+    'workflow_id': 'workflow_id',
+    'node_id': 'node_instance_id',
+    'task_error_causes': 'error_causes',
+}
+
+# The keys of the API event which only show up in the context
+_CONTEXT_ONLY_KEYS = frozenset(CONTEXT_FIELDS.values())
+
+
+class _ReadOnlyMapping(object):
+    """The methods of a read-only mapping, given `__getitem__`, `__iter__`
+    and `__len__`.
+    """
+
+    __slots__ = ()
+    __hash__ = None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def keys(self):
+        return list(self)
+
+    def iteritems(self):
+        return ((key, self[key]) for key in self)
+
+    def items(self):
+        return list(self.iteritems())
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def __eq__(self, other):
+        try:
+            return dict(self.iteritems()) == dict(other.iteritems())
+        except AttributeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+
+class CompactEvent(_ReadOnlyMapping):
+    """An event in the internal format, backed by an event in API format.
+
+    :param event: The event, as returned by the events API. It's never
+                  modified.
+    """
+
+    __slots__ = ('_event', '_context', '_message')
+
+    def __init__(self, event):
+        self._event = event
+        self._context = None
+        self._message = None
+
+    def __getitem__(self, key):
+        if key == 'context':
+            if self._context is None:
+                self._context = _ContextView(self._event)
+            return self._context
+        if key == 'message':
+            if self._message is None:
+                self._message = _MessageView(self._event['message'])
+            return self._message
+        if key in _CONTEXT_ONLY_KEYS:
+            raise KeyError(key)
+        return self._event[key]
+
+    def __iter__(self):
+        yield 'context'
+        for key in self._event:
+            if key not in _CONTEXT_ONLY_KEYS:
+                yield key
+
+    def __len__(self):
+        return 1 + sum(1 for key in self._event
+                       if key not in _CONTEXT_ONLY_KEYS)
+
+    def __repr__(self):
+        return 'CompactEvent({0!r})'.format(self._event)
+
+    def to_dict(self):
+        """Return the event as a dict in the internal format, for handlers
+        that need one (e.g. to modify it, or to serialize it).
+        """
+        event = dict((key, value) for key, value in self._event.iteritems()
+                     if key not in _CONTEXT_ONLY_KEYS)
+        event['context'] = dict(self['context'])
+        if 'message' in self._event:
+            event['message'] = dict(self['message'])
+        return event
+
+
+class _ContextView(_ReadOnlyMapping):
+
+    __slots__ = ('_event',)
+
+    def __init__(self, event):
+        self._event = event
+
+    def __getitem__(self, key):
+        return self._event[CONTEXT_FIELDS[key]]
+
+    def get(self, key, default=None):
+        api_key = CONTEXT_FIELDS.get(key)
+        return self._event.get(api_key, default) if api_key else default
+
+    def __iter__(self):
+        return (key for key, api_key in CONTEXT_FIELDS.iteritems()
+                if api_key in self._event)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class _MessageView(_ReadOnlyMapping):
+
+    __slots__ = ('_text',)
+
+    def __init__(self, text):
+        self._text = text
+
+    def __getitem__(self, key):
+        if key == 'text':
+            return self._text
+        if key == 'arguments':
+            return None
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(('arguments', 'text'))
+
+    def __len__(self):
+        return 2
+
+
+def to_dict(event):
+    """Return an event in the internal format as a dict, whether it's a
+    `CompactEvent` or already a dict.
+    """
+    return event.to_dict() if isinstance(event, CompactEvent) else event
@@ -16,16 +16,19 @@
 
 
 import os
-import yaml
 
 from dsl_parser import utils as dsl_parser_utils
 from dsl_parser.constants import IMPORT_RESOLVER_KEY
 
 from .. import env
+from .. import yaml_io
 
 
 CLOUDIFY_CONFIG_PATH = os.path.join(env.CLOUDIFY_WORKDIR, 'config.yaml')
 
+# Loaded configs, as {config path: ((mtime, size), CloudifyConfig)}
+_configs = {}
+
 
 class CloudifyConfig(object):
 
@@ -43,8 +46,7 @@ class CloudifyConfig(object):
             return self._logging.get('loggers', {})
 
     def __init__(self):
-        with open(CLOUDIFY_CONFIG_PATH) as f:
-            self._config = yaml.safe_load(f.read())
+        self._config = yaml_io.load_path(CLOUDIFY_CONFIG_PATH, safe=True)
 
     @property
     def colors(self):
@@ -70,12 +72,32 @@ class CloudifyConfig(object):
     def validate_definitions_version(self):
         return self._config.get('validate_definitions_version', True)
 
+    @property
+    def event_store(self):
+        return self._config.get('event_store', False)
+
+
+def get_config():
+    """Return the process-wide CloudifyConfig.
+
+    config.yaml is only read once per process, and again whenever its
+    mtime or size change.
+    """
+    config_path = CLOUDIFY_CONFIG_PATH
+    stat = os.stat(config_path)
+    key = (stat.st_mtime, stat.st_size)
+    cached_key, config = _configs.get(config_path, (None, None))
+    if cached_key != key:
+        config = CloudifyConfig()
+        _configs[config_path] = key, config
+    return config
+
 
 def is_use_colors():
     if not env.is_initialized():
         return False
 
-    config = CloudifyConfig()
+    config = get_config()
     return config.colors
 
 
@@ -83,7 +105,7 @@ def is_auto_generate_ids():
     if not env.is_initialized():
         return False
 
-    config = CloudifyConfig()
+    config = get_config()
     return config.auto_generate_ids
 
 
@@ -91,7 +113,7 @@ def get_import_resolver():
     if not env.is_initialized():
         return None
 
-    config = CloudifyConfig()
+    config = get_config()
     # get the resolver configuration from the config file
     local_import_resolver = config.local_import_resolver
     return dsl_parser_utils.create_import_resolver(local_import_resolver)
@@ -100,5 +122,12 @@ def get_import_resolver():
 def is_validate_definitions_version():
     if not env.is_initialized():
         return True
-    config = CloudifyConfig()
+    config = get_config()
     return config.validate_definitions_version
+
+
+def is_use_event_store():
+    if not env.is_initialized():
+        return False
+    config = get_config()
+    return config.event_store
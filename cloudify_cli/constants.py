@@ -15,6 +15,9 @@
 ############
 
 CLOUDIFY_PROFILE_CONTEXT_FILE_NAME = 'context'
+CLOUDIFY_PROFILE_CONTEXT_CACHE_FILE_NAME = '.context.cache'
+CLOUDIFY_ID_INDEX_DIR_NAME = 'ids-index'
+CLOUDIFY_EVENT_STORE_FILE_NAME = 'events.db'
 CLOUDIFY_BASE_DIRECTORY_NAME = '.cloudify'
 CONFIG_FILE_NAME = 'cloudify-config.yaml'
 DEFAULTS_CONFIG_FILE_NAME = 'cloudify-config.defaults.yaml'
@@ -70,6 +73,9 @@ DEFAULT_TENANT_NAME = 'default_tenant'
 PUBLIC_REST_CERT = 'public_rest_cert.crt'
 LOCAL_REST_CERT_FILE = 'LOCAL_REST_CERT_FILE'
 CLOUDIFY_SSL_TRUST_ALL = 'CLOUDIFY_SSL_TRUST_ALL'
+CFY_TRACE_STARTUP_ENV = 'CFY_TRACE_STARTUP'
+CFY_USE_DAEMON_ENV = 'CFY_USE_DAEMON'
+CFY_DAEMON_SOCKET_FILE_NAME = 'cfy-daemon.sock'
 
 SSL_ENABLED_PROPERTY_NAME = 'enabled'
 SSL_CERTIFICATE_PATH_PROPERTY_NAME = 'certificate_path'
@@ -82,3 +88,20 @@ API_VERSION = 'v3.1'
 HELP_TEXT_COLUMN_BUFFER = 5
 
 SUPPORTED_ARCHIVE_TYPES = ('zip', 'tar', 'tar.gz', 'tar.bz2')
+
+# The bounds of the number of events fetched per request
+MIN_EVENTS_BATCH_SIZE = 10
+MAX_EVENTS_BATCH_SIZE = 1000
+
+# The formats data is printed in by list and get commands
+TABLE_FORMAT = 'table'
+JSON_FORMAT = 'json'
+NDJSON_FORMAT = 'ndjson'
+CSV_FORMAT = 'csv'
+YAML_FORMAT = 'yaml'
+OUTPUT_FORMATS = [TABLE_FORMAT, JSON_FORMAT, NDJSON_FORMAT, CSV_FORMAT,
+                  YAML_FORMAT]
+
+# The most items list commands fetch per request, unless `--page-size` is
+# passed
+DEFAULT_PAGE_SIZE = 1000
@@ -0,0 +1,488 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""An opt-in daemon which runs cfy commands in a warm process.
+
+`cfy-daemon` starts a long-lived process per user (and per `CFY_WORKDIR`),
+which has the CLI's modules imported, the profile parsed and HTTP
+connections to the manager pooled. When `CFY_USE_DAEMON` is set to `true`,
+`cfy` is just a thin client which sends its argv, environment and working
+directory to the daemon over a Unix socket, and streams back the command's
+stdout, stderr and exit code. When no daemon is running, `cfy` runs the
+command itself, as usual.
+
+Commands are run one at a time: while one runs, other clients are told
+the daemon is busy, and run their commands themselves. A command is
+aborted when its client disconnects (e.g. on Ctrl-C). Whether the client's
+stdout and stderr are terminals, and the terminal's size, are forwarded,
+so that output is formatted the same as it would be in the client's
+process. stdin is not forwarded, and the daemon detaches from its
+terminal, so interactive commands fail to prompt, and should not be run
+through the daemon.
+
+The client side of this module only uses the standard library, so that it
+stays cheap to import.
+"""
+
+import os
+import sys
+import json
+import errno
+import socket
+import Queue
+import struct
+import thread
+import threading
+import traceback
+
+from . import constants
+
+STDOUT_FRAME = 'o'
+STDERR_FRAME = 'e'
+EXIT_FRAME = 'x'
+BUSY_FRAME = 'b'
+_FRAME_HEADER = struct.Struct('>cI')
+# Seconds to wait for a client to send its request, after connecting
+_REQUEST_TIMEOUT = 10
+
+
+def get_socket_path():
+    # Same as env.CLOUDIFY_WORKDIR. env isn't imported, as it's expensive.
+    workdir = os.path.join(
+        os.environ.get('CFY_WORKDIR', os.path.expanduser('~')),
+        constants.CLOUDIFY_BASE_DIRECTORY_NAME)
+    return os.path.join(workdir, constants.CFY_DAEMON_SOCKET_FILE_NAME)
+
+
+def is_daemon_enabled():
+    return os.environ.get(constants.CFY_USE_DAEMON_ENV) == 'true' \
+        and hasattr(socket, 'AF_UNIX')
+
+
+def cfy():
+    """The `cfy` entry point.
+
+    Forward the command to the daemon if it is enabled and running,
+    otherwise run it in this process.
+    """
+    if is_daemon_enabled():
+        try:
+            exit_code = run_in_daemon(sys.argv[1:])
+        except KeyboardInterrupt:
+            # Closing the connection aborts the command in the daemon
+            sys.stderr.write('\nAborted!\n')
+            sys.exit(1)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from .main import _cfy
+    _cfy()
+
+
+def run_in_daemon(argv, socket_path=None):
+    """Run a cfy command in the daemon.
+
+    :return: The command's exit code, or None if no daemon is running,
+             or if it is busy running another command.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(socket_path or get_socket_path())
+        except socket.error as e:
+            if e.errno in (errno.ENOENT, errno.ECONNREFUSED):
+                return None
+            raise
+        environ = dict(os.environ)
+        environ.update(_get_terminal_size_environ(environ))
+        request = {
+            'argv': argv,
+            'env': environ,
+            'cwd': os.getcwd(),
+            'isatty': {
+                STDOUT_FRAME: _isatty(sys.stdout),
+                STDERR_FRAME: _isatty(sys.stderr)
+            }
+        }
+        sock.sendall(json.dumps(request) + '\n')
+        return _read_response(sock, sys.stdout, sys.stderr)
+    finally:
+        sock.close()
+
+
+def _isatty(stream):
+    try:
+        return stream.isatty()
+    except AttributeError:
+        return False
+
+
+def _get_terminal_size_environ(environ):
+    """Return COLUMNS and LINES of the terminal stdout is, unless they are
+    set already, as the daemon can't tell the size of the client's terminal.
+    """
+    if 'COLUMNS' in environ and 'LINES' in environ:
+        return {}
+    try:
+        import fcntl
+        import termios
+        lines, columns = struct.unpack('hh', fcntl.ioctl(
+            sys.stdout.fileno(), termios.TIOCGWINSZ, '1234'))
+    except (ImportError, AttributeError, ValueError, IOError):
+        return {}
+    if lines <= 0 or columns <= 0:
+        return {}
+    return {'COLUMNS': str(columns), 'LINES': str(lines)}
+
+
+def _read_response(sock, stdout, stderr):
+    streams = {STDOUT_FRAME: stdout, STDERR_FRAME: stderr}
+    for frame_type, data in _read_frames(sock):
+        if frame_type == EXIT_FRAME:
+            return int(data)
+        if frame_type == BUSY_FRAME:
+            return None
+        streams[frame_type].write(data)
+        streams[frame_type].flush()
+    stderr.write('The cfy daemon closed the connection before the command '
+                 'finished\n')
+    return 1
+
+
+def _read_frames(sock):
+    reader = sock.makefile('rb')
+    while True:
+        header = reader.read(_FRAME_HEADER.size)
+        if len(header) < _FRAME_HEADER.size:
+            return
+        frame_type, length = _FRAME_HEADER.unpack(header)
+        yield frame_type, reader.read(length)
+
+
+def _send_frame(sock, frame_type, data):
+    if isinstance(data, unicode):
+        data = data.encode('utf-8')
+    sock.sendall(_FRAME_HEADER.pack(frame_type, len(data)) + data)
+
+
+class _FrameStream(object):
+    """A file-like object which sends everything written to it as frames
+    of `frame_type` on `sock`.
+    """
+
+    encoding = 'utf-8'
+    closed = False
+
+    def __init__(self, sock, frame_type, isatty=False):
+        self._sock = sock
+        self._frame_type = frame_type
+        self._isatty = isatty
+
+    def write(self, data):
+        if data:
+            _send_frame(self._sock, self._frame_type, data)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return self._isatty
+
+
+def serve(socket_path=None):
+    """Run the daemon until it is interrupted.
+    """
+    socket_path = socket_path or get_socket_path()
+    if _is_listening(socket_path):
+        sys.stderr.write('A cfy daemon is already listening on {0}\n'
+                         .format(socket_path))
+        sys.exit(1)
+    if os.path.exists(socket_path):
+        # A leftover from a daemon that didn't exit cleanly
+        os.remove(socket_path)
+
+    _detach_from_terminal()
+    _warm_up()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # The forwarded environment holds credentials, so only the user
+    # may connect
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    connections = Queue.Queue()
+    busy = threading.Lock()
+    acceptor = threading.Thread(target=_accept_connections,
+                                args=(server, connections, busy))
+    acceptor.daemon = True
+    acceptor.start()
+    try:
+        while True:
+            try:
+                # With a timeout, so that Ctrl-C isn't blocked
+                connection = connections.get(timeout=1)
+            except Queue.Empty:
+                continue
+            try:
+                _handle_connection(connection, busy)
+            finally:
+                connection.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.remove(socket_path)
+
+
+def _accept_connections(server, connections, busy):
+    """Pass connections to the main thread to run their commands, one at a
+    time, and tell clients which connect while a command runs that the
+    daemon is busy.
+
+    Commands can't run concurrently, as the CLI keeps its state (e.g. the
+    environment, the working directory, stdout and the active profile) in
+    the process.
+    """
+    while True:
+        try:
+            connection, _ = server.accept()
+        except socket.error:
+            # The server socket was closed
+            return
+        _accept_connection(connection, connections, busy)
+
+
+def _accept_connection(connection, connections, busy):
+    if busy.acquire(False):
+        connections.put(connection)
+        return
+    try:
+        _send_frame(connection, BUSY_FRAME, '')
+    except socket.error:
+        pass
+    finally:
+        connection.close()
+
+
+def _is_listening(socket_path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        return True
+    except socket.error:
+        return False
+    finally:
+        sock.close()
+
+
+def _detach_from_terminal():
+    """Stop having the terminal the daemon was started from as the
+    controlling terminal, so that commands (e.g. `getpass`) can't prompt on
+    it, rather than on the client's.
+    """
+    try:
+        import fcntl
+        import termios
+        tty = os.open('/dev/tty', os.O_RDWR | os.O_NOCTTY)
+    except (ImportError, OSError):
+        # There is no controlling terminal
+        return
+    try:
+        fcntl.ioctl(tty, termios.TIOCNOTTY)
+    except IOError:
+        pass
+    finally:
+        os.close(tty)
+
+
+def _warm_up():
+    from . import main
+    from . import env
+
+    for name in list(main._COMMANDS) + list(main._CONTEXT_COMMANDS):
+        main._load_command(name)
+    # Have the REST clients of every command reuse the connections (and
+    # TLS sessions) to the manager
+    env.enable_connection_pooling()
+    env.profile = env.get_profile_context(suppress_error=True)
+
+
+def _handle_connection(connection, busy):
+    """Run the command a client requested, and report its output and exit
+    code to the client.
+
+    `busy` is released as soon as the command finished, before the client
+    is told its exit code, so that the client's next command doesn't find
+    the daemon busy. Errors are reported to the client (if it's still
+    there), rather than stopping the daemon.
+    """
+    try:
+        try:
+            exit_code = _run_request(connection)
+        finally:
+            busy.release()
+        if exit_code is not None:
+            _send_frame(connection, EXIT_FRAME, str(exit_code))
+    except socket.error:
+        # The client went away, there's no one to report to
+        pass
+    except Exception:
+        try:
+            _send_frame(connection, STDERR_FRAME, 'The cfy daemon failed: '
+                        '{0}'.format(traceback.format_exc()))
+            _send_frame(connection, EXIT_FRAME, '1')
+        except socket.error:
+            pass
+
+
+def _run_request(connection):
+    """Run the command requested on `connection`, streaming its output
+    to the client.
+
+    :return: The command's exit code, or None if the client went away
+             before it finished
+    """
+    connection.settimeout(_REQUEST_TIMEOUT)
+    request = json.loads(connection.makefile('rb').readline())
+    connection.settimeout(None)
+    isatty = request.get('isatty', {})
+    watcher = _DisconnectWatcher(connection)
+    try:
+        try:
+            # Started here, as the client may be gone already
+            watcher.start()
+            return _run_command(
+                request['argv'],
+                request['env'],
+                request['cwd'],
+                stdout=_FrameStream(connection, STDOUT_FRAME,
+                                    isatty=isatty.get(STDOUT_FRAME)),
+                stderr=_FrameStream(connection, STDERR_FRAME,
+                                    isatty=isatty.get(STDERR_FRAME)))
+        finally:
+            watcher.stop()
+    except KeyboardInterrupt:
+        # The command was aborted as its client went away
+        if not watcher.disconnected:
+            raise
+        return None
+
+
+class _DisconnectWatcher(object):
+    """Interrupts the command that runs in the main thread (the same as
+    Ctrl-C would) when its client disconnects, from `start` until `stop`
+    is called.
+
+    Clients send nothing after their request, so the connection is only
+    readable once the client closes it.
+    """
+
+    def __init__(self, connection):
+        self.disconnected = False
+        self._connection = connection
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._watch)
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def _watch(self):
+        try:
+            while self._connection.recv(1024):
+                pass
+        except socket.error:
+            pass
+        with self._lock:
+            if not self._stopped:
+                self.disconnected = True
+                thread.interrupt_main()
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+        try:
+            self._connection.shutdown(socket.SHUT_RD)
+        except socket.error:
+            pass
+        self._thread.join()
+
+
+def _run_command(argv, environ, cwd, stdout, stderr):
+    """Run `cfy argv` in this process as if it was run from `cwd` with
+    `environ`, writing its output to `stdout` and `stderr`.
+
+    :return: The command's exit code
+    """
+    from . import env
+    from . import main
+    from . import table
+    from . import logger
+
+    original_environ = dict(os.environ)
+    original_cwd = os.getcwd()
+    original_streams = sys.stdin, sys.stdout, sys.stderr
+    original_excepthook = sys.excepthook
+    devnull = open(os.devnull)
+    try:
+        os.environ.clear()
+        os.environ.update(environ)
+        os.chdir(cwd)
+        sys.stdin, sys.stdout, sys.stderr = devnull, stdout, stderr
+        # Reset whatever state a previous command may have left behind,
+        # the same way a new process would have it.
+        # Loggers are configured again as their handlers hold sys.stdout.
+        env.profile = env.get_profile_context(suppress_error=True)
+        logger.configure_loggers()
+        logger.set_global_verbosity_level(logger.NO_VERBOSE)
+        table.set_global_output_format(constants.TABLE_FORMAT)
+        try:
+            main._cfy.main(args=argv, prog_name='cfy')
+        except SystemExit as e:
+            return _get_exit_code(e.code, stderr)
+        except Exception:
+            # This is where the interpreter would call the hook that
+            # `cfy` sets, before exiting with 1
+            sys.excepthook(*sys.exc_info())
+            return 1
+        return 0
+    except Exception:
+        traceback.print_exc(file=stderr)
+        return 1
+    finally:
+        devnull.close()
+        sys.stdin, sys.stdout, sys.stderr = original_streams
+        sys.excepthook = original_excepthook
+        os.chdir(original_cwd)
+        os.environ.clear()
+        os.environ.update(original_environ)
+
+
+def _get_exit_code(code, stderr):
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    stderr.write('{0}\n'.format(code))
+    return 1
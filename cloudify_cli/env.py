@@ -19,6 +19,7 @@ import os
 import json
 import types
 import shutil
+import cPickle
 import pkgutil
 import getpass
 import tempfile
@@ -33,7 +34,9 @@ from cloudify_rest_client.client import HTTPClient
 from cloudify_rest_client.exceptions import (CloudifyClientError,
                                              NotClusterMaster)
 
+from . import yaml_io
 from . import constants
+from . import startup_trace
 from .exceptions import CloudifyCliError
 
 DEFAULT_LOG_FILE = os.path.expanduser(
@@ -49,6 +52,13 @@ MULTIPLE_LOCAL_BLUEPRINTS = (
     os.environ.get('CFY_MULTIPLE_BLUEPRINTS', 'true') == 'true')
 CLUSTER_RETRY_INTERVAL = 5
 
+# Parsed profile contexts, as {context path: (stat key, pickled context)}
+_profile_contexts = {}
+
+# HTTP adapters (i.e. connection pools) which the REST clients of this
+# process share, by URL prefix, or None to not share connections
+_http_adapters = None
+
 
 def delete_profile(profile_name):
     if is_profile_exists(profile_name):
@@ -143,14 +153,69 @@ def get_profile_context(profile_name=None, suppress_error=False):
         raise CloudifyCliError('Local profile does not have context')
     try:
         path = get_context_path(profile_name)
-        with open(path) as f:
-            return yaml.load(f.read())
+        return _load_profile_context(path)
     except CloudifyCliError:
         if suppress_error:
             return ProfileContext()
         raise
 
 
+def _load_profile_context(path):
+    """Load the profile context stored in the YAML file `path`.
+
+    Parsing the YAML is slow for profiles with a large provider context,
+    so the parsed context is pickled into a sidecar file next to it and
+    memoized for the life of the process. Both are keyed by the YAML's
+    content, so it is only parsed again after it changes.
+    A new ProfileContext instance is returned on every call.
+    """
+    with open(path) as f:
+        key = yaml_io.get_file_key(f)
+        cached_key, data = _profile_contexts.get(path, (None, None))
+        if cached_key != key:
+            data = _read_profile_context_cache(path, key)
+            if data is None:
+                data = cPickle.dumps(yaml_io.load(f),
+                                     cPickle.HIGHEST_PROTOCOL)
+                _write_profile_context_cache(path, key, data)
+            _profile_contexts[path] = key, data
+    return cPickle.loads(data)
+
+
+def _get_profile_context_cache_path(path):
+    return os.path.join(os.path.dirname(path),
+                        constants.CLOUDIFY_PROFILE_CONTEXT_CACHE_FILE_NAME)
+
+
+def _read_profile_context_cache(path, key):
+    """Return the pickled context from the sidecar of `path`, or None
+    if there is no sidecar or if it was written for another version
+    of the YAML file.
+    """
+    try:
+        with open(_get_profile_context_cache_path(path), 'rb') as f:
+            if f.readline().rstrip('\n') != key:
+                return None
+            return f.read()
+    except (IOError, OSError):
+        return None
+
+
+def _write_profile_context_cache(path, key, data):
+    # The sidecar is only an optimization, so failing to write it
+    # (e.g. on a read-only profile directory) is not an error.
+    cache_path = _get_profile_context_cache_path(path)
+    tmp_path = '{0}.{1}.tmp'.format(cache_path, os.getpid())
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(key + '\n')
+            f.write(data)
+        os.rename(tmp_path, cache_path)
+    except (IOError, OSError):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 def is_initialized(profile_name=None):
     """Check if a profile or an environment is initialized.
 
@@ -229,7 +294,9 @@ def get_rest_client(client_profile=None,
             profile=client_profile)
 
     else:
-        client = CloudifyClient(
+        client_class = PooledCloudifyClient if _http_adapters \
+            else CloudifyClient
+        client = client_class(
             host=rest_host,
             port=rest_port,
             protocol=rest_protocol,
@@ -365,7 +432,8 @@ def get_cli_manager_versions(rest_client):
 
 class ProfileContext(yaml.YAMLObject):
     yaml_tag = u'!CloudifyProfileContext'
-    yaml_loader = yaml.Loader
+    yaml_loader = yaml_io.Loader
+    yaml_dumper = yaml_io.Dumper
 
     def __init__(self, profile_name=None):
         # Note that __init__ is not called when loading from yaml.
@@ -455,7 +523,8 @@ class ProfileContext(yaml.YAMLObject):
             constants.CLOUDIFY_PROFILE_CONTEXT_FILE_NAME)
 
         with open(target_file_path, 'w') as f:
-            f.write(yaml.dump(self))
+            f.write(yaml_io.dump(self))
+        _profile_contexts.pop(target_file_path, None)
 
 
 def get_auth_header(username, password):
@@ -484,7 +553,56 @@ CLUSTER_NODE_ATTRS = ['manager_ip', 'rest_port', 'rest_protocol', 'ssh_port',
                       'ssh_user', 'ssh_key']
 
 
-class ClusterHTTPClient(HTTPClient):
+def enable_connection_pooling():
+    """Have the REST clients built from now on reuse the connections (and
+    TLS sessions) to the manager of the clients built before them.
+
+    Only the connections are shared: every client still sends its
+    requests through a session of its own, so that cookies and such
+    don't pass from one command to the next.
+    """
+    global _http_adapters
+    if _http_adapters is None:
+        _http_adapters = {
+            'http://': requests.adapters.HTTPAdapter(),
+            'https://': requests.adapters.HTTPAdapter()
+        }
+
+
+class PooledHTTPClient(HTTPClient):
+    """An HTTPClient which sends its requests over the connections pooled
+    by `adapters`, if any are passed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        adapters = kwargs.pop('adapters', None)
+        super(PooledHTTPClient, self).__init__(*args, **kwargs)
+        self._session = None
+        if adapters:
+            self._session = requests.Session()
+            for prefix, adapter in adapters.iteritems():
+                self._session.mount(prefix, adapter)
+
+    def _do_request(self, requests_method, **kwargs):
+        if self._session is not None:
+            # e.g. requests.get -> session.get
+            requests_method = getattr(self._session,
+                                      requests_method.__name__)
+        return super(PooledHTTPClient, self)._do_request(
+            requests_method=requests_method, **kwargs)
+
+
+class PooledCloudifyClient(CloudifyClient):
+    """A CloudifyClient which reuses the connections of the REST clients
+    built before it, see `enable_connection_pooling`.
+    """
+
+    def client_class(self, *args, **kwargs):
+        kwargs.setdefault('adapters', _http_adapters)
+        return PooledHTTPClient(*args, **kwargs)
+
+
+class ClusterHTTPClient(PooledHTTPClient):
     default_timeout_sec = 5
 
     def __init__(self, *args, **kwargs):
@@ -562,7 +680,9 @@ class CloudifyClusterClient(CloudifyClient):
 
     def client_class(self, *args, **kwargs):
         kwargs.setdefault('profile', self._profile)
+        kwargs.setdefault('adapters', _http_adapters)
         return ClusterHTTPClient(*args, **kwargs)
 
 
-profile = get_profile_context(suppress_error=True)
+with startup_trace.phase('load profile'):
+    profile = get_profile_context(suppress_error=True)
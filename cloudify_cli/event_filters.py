@@ -0,0 +1,193 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""Filtering the events fetched by `ExecutionEventsFetcher`.
+
+Filters which the manager supports (event types and time ranges) are
+added to the events query, so that the filtered out events aren't
+fetched at all. The rest, along with the former in case the manager
+ignores them, are compiled once into a predicate which the fetcher
+applies to every fetched event.
+
+The events which end a workflow are never filtered out, as waiting for
+an execution relies on them.
+"""
+
+import re
+from datetime import datetime, timedelta
+
+from .utils import parse_timestamp
+from .exceptions import CloudifyCliError
+from .execution_events_fetcher import WORKFLOW_END_TYPES
+
+_RELATIVE_TIME = re.compile(r'^(\d+)([smhd])$')
+_TIME_UNITS = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days'}
+
+
+class EventFilters(object):
+    """Filters for the events of an execution.
+
+    Every filter which is passed must match for an event to be kept.
+
+    :param nodes: Node names or node instance IDs
+    :param operations: Operation names, either full or their last part
+                       (e.g. `create`)
+    :param levels: Log levels. Only logs have a level, so this filters
+                   out events which aren't logs
+    :param event_types: Event types. Only events have a type, so this
+                        filters out logs
+    :param since: A UTC datetime, from which on events are kept
+    :param until: A UTC datetime, until which events are kept
+    :param message_regex: A regular expression to search messages for
+    """
+
+    def __init__(self,
+                 nodes=None,
+                 operations=None,
+                 levels=None,
+                 event_types=None,
+                 since=None,
+                 until=None,
+                 message_regex=None):
+        self.nodes = set(nodes or [])
+        self.operations = set(operations or [])
+        self.levels = set(level.lower() for level in levels or [])
+        self.event_types = set(event_types or [])
+        self.since = since
+        self.until = until
+        try:
+            self.message_regex = \
+                re.compile(message_regex) if message_regex else None
+        except re.error as e:
+            raise CloudifyCliError(
+                'Invalid message regex {0}: {1}'.format(message_regex, e))
+
+    def __nonzero__(self):
+        return bool(self.nodes or self.operations or self.levels or
+                    self.event_types or self.since or self.until or
+                    self.message_regex)
+
+    def get_query(self):
+        """Return the parameters of the events query which filter events
+        on the manager.
+        """
+        query = {}
+        if self.event_types:
+            query['event_type'] = sorted(self.event_types | WORKFLOW_END_TYPES)
+        if self.since:
+            query['from_datetime'] = self.since
+        if self.until:
+            query['to_datetime'] = self.until
+        return query
+
+    def compile(self):
+        """Return a function which tells whether an event in the internal
+        format (see `ExecutionEventsFetcher`) passes the filters.
+        """
+        checks = []
+        if self.nodes:
+            nodes = self.nodes
+            checks.append(lambda event: (
+                event['context'].get('node_name') in nodes or
+                event['context'].get('node_id') in nodes))
+        if self.operations:
+            operations = self.operations
+            checks.append(lambda event: _get_operation_names(
+                event['context'].get('operation')) & operations)
+        if self.levels:
+            levels = self.levels
+            checks.append(lambda event: event.get('level') in levels)
+        if self.event_types:
+            event_types = self.event_types
+            checks.append(lambda event: event.get('event_type') in event_types)
+        if self.since or self.until:
+            in_range = in_time_range(self.since, self.until)
+            checks.append(lambda event: in_range(event.get('timestamp')))
+        if self.message_regex:
+            search = self.message_regex.search
+            checks.append(lambda event: search(
+                (event.get('message') or {}).get('text') or ''))
+
+        def passes(event):
+            if event.get('event_type') in WORKFLOW_END_TYPES:
+                return True
+            for check in checks:
+                if not check(event):
+                    return False
+            return True
+        return passes
+
+
+def parse_time(value):
+    """Parse a `--since`/`--until` value: either a UTC timestamp (e.g.
+    `2017-05-01T10:00:00`), or a duration before now (e.g. `10m`, `2h`).
+
+    :return: A UTC datetime, or None if `value` is empty
+    """
+    if not value:
+        return None
+    relative = _RELATIVE_TIME.match(value.strip())
+    if relative:
+        amount, unit = relative.groups()
+        return datetime.utcnow() - \
+            timedelta(**{_TIME_UNITS[unit]: int(amount)})
+    timestamp = parse_timestamp(value)
+    if timestamp:
+        return timestamp
+    raise CloudifyCliError(
+        'Invalid time {0}. Expected a UTC timestamp such as '
+        '2017-05-01T10:00:00, or a duration before now such as 10m, 2h '
+        'or 1d'.format(value))
+
+
+def in_time_range(since, until):
+    """Return a function which tells whether a timestamp, as the manager
+    returns them (e.g. of events, or of when resources were created), is
+    between the `since` and `until` UTC datetimes, either of which may be
+    None.
+    """
+    since = _format_timestamp(since)
+    until = _format_timestamp(until)
+    return lambda timestamp: _in_range(timestamp, since, until)
+
+
+def _get_operation_names(operation):
+    """Return the names an operation can be filtered by: its full name and
+    its last part.
+    """
+    if not operation:
+        return set()
+    return {operation, operation.rsplit('.', 1)[-1]}
+
+
+def _format_timestamp(timestamp):
+    # Events' timestamps are ISO 8601 strings, which compare like the
+    # times they represent
+    return timestamp.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] \
+        if timestamp else None
+
+
+def _in_range(timestamp, since, until):
+    if not timestamp:
+        return True
+    timestamp = timestamp.rstrip('Z').replace(' ', 'T')
+    if '.' not in timestamp:
+        timestamp += '.000'
+    if since and timestamp < since:
+        return False
+    if until and timestamp > until:
+        return False
+    return True
@@ -0,0 +1,180 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""A local store of the events fetched from the manager.
+
+When the store is enabled (`event_store: true` in the CLI's config.yaml),
+`ExecutionEventsFetcher` keeps the events it fetches in an SQLite database
+under the profile's directory. Fetching the events of the same execution
+again replays the stored ones, and only asks the manager for the events
+following them. Once an execution ended and all of its events were
+stored, the manager isn't asked for its events at all.
+
+The events of an execution with and without logs are stored separately,
+and the events of the least recently used executions are removed when
+more than MAX_STORED_EXECUTIONS are stored.
+"""
+
+import os
+import json
+import time
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+from . import env
+from . import constants
+from .config import config
+from .compact_event import to_dict
+
+# The most executions whose events are kept
+MAX_STORED_EXECUTIONS = 100
+
+_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS streams ('
+    '    execution_id TEXT NOT NULL,'
+    '    include_logs INTEGER NOT NULL,'
+    '    events INTEGER NOT NULL,'
+    '    position TEXT,'
+    '    complete INTEGER NOT NULL,'
+    '    used_at REAL NOT NULL,'
+    '    PRIMARY KEY (execution_id, include_logs))',
+    'CREATE TABLE IF NOT EXISTS events ('
+    '    execution_id TEXT NOT NULL,'
+    '    include_logs INTEGER NOT NULL,'
+    '    seq INTEGER NOT NULL,'
+    '    event TEXT NOT NULL,'
+    '    PRIMARY KEY (execution_id, include_logs, seq))',
+]
+
+
+class EventStore(object):
+    """The stored events, in the SQLite database at `path`.
+
+    The events of every execution are stored as a stream, identified by
+    the execution's ID and by whether logs are included, along with the
+    position of the fetcher which fetched them, to continue fetching from.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # The fetcher may use the store from its pipeline's thread, one
+        # thread at a time
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def close(self):
+        self._connection.close()
+
+    def get_stream(self, execution_id, include_logs):
+        """Return the state of the stored events of an execution.
+
+        :return: A dict with the number of stored `events`, the `position`
+                 to continue fetching from (None if no events were stored)
+                 and whether the stream is `complete`
+        """
+        with self._connection:
+            row = self._connection.execute(
+                'SELECT events, position, complete FROM streams '
+                'WHERE execution_id = ? AND include_logs = ?',
+                (execution_id, include_logs)).fetchone()
+            if row is None:
+                return {'events': 0, 'position': None, 'complete': False}
+            self._connection.execute(
+                'UPDATE streams SET used_at = ? '
+                'WHERE execution_id = ? AND include_logs = ?',
+                (time.time(), execution_id, include_logs))
+        events, position, complete = row
+        return {
+            'events': events,
+            'position': json.loads(position) if position else None,
+            'complete': bool(complete)
+        }
+
+    def get_events(self, execution_id, include_logs, offset, limit):
+        rows = self._connection.execute(
+            'SELECT event FROM events '
+            'WHERE execution_id = ? AND include_logs = ? AND seq >= ? '
+            'ORDER BY seq LIMIT ?',
+            (execution_id, include_logs, offset, limit))
+        return [json.loads(event) for event, in rows]
+
+    def add_events(self, execution_id, include_logs, events, position,
+                   complete=False):
+        """Append fetched events to the stream of an execution.
+
+        :param position: The position of the fetcher after fetching them
+        :param complete: Whether these are the last events of the
+                         execution
+        """
+        with self._connection:
+            row = self._connection.execute(
+                'SELECT events FROM streams '
+                'WHERE execution_id = ? AND include_logs = ?',
+                (execution_id, include_logs)).fetchone()
+            first_seq = row[0] if row else 0
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO events '
+                '(execution_id, include_logs, seq, event) '
+                'VALUES (?, ?, ?, ?)',
+                ((execution_id, include_logs, first_seq + index,
+                  json.dumps(to_dict(event)))
+                 for index, event in enumerate(events)))
+            self._connection.execute(
+                'INSERT OR REPLACE INTO streams '
+                '(execution_id, include_logs, events, position, complete, '
+                ' used_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (execution_id, include_logs, first_seq + len(events),
+                 json.dumps(position), complete, time.time()))
+            if row is None:
+                self._evict()
+
+    def clear(self):
+        """Remove all of the stored events, e.g. after events were deleted
+        from the manager.
+        """
+        with self._connection:
+            for table in ('events', 'streams'):
+                self._connection.execute('DELETE FROM {0}'.format(table))
+
+    def _evict(self):
+        stale = self._connection.execute(
+            'SELECT execution_id, include_logs FROM streams '
+            'ORDER BY used_at DESC LIMIT -1 OFFSET ?',
+            (MAX_STORED_EXECUTIONS,)).fetchall()
+        for table in ('events', 'streams'):
+            self._connection.executemany(
+                'DELETE FROM {0} '
+                'WHERE execution_id = ? AND include_logs = ?'.format(table),
+                stale)
+
+
+def get_event_store():
+    """Return the event store of the active profile, or None if the store
+    is disabled.
+    """
+    if sqlite3 is None or not config.is_use_event_store() or \
+            not env.get_active_profile():
+        return None
+    profile_dir = env.get_profile_dir(suppress_error=True)
+    if not os.path.isdir(profile_dir):
+        return None
+    return EventStore(os.path.join(
+        profile_dir, constants.CLOUDIFY_EVENT_STORE_FILE_NAME))
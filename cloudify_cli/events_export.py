@@ -0,0 +1,219 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""Exporting the events of executions to compressed NDJSON files.
+
+Events are written one JSON document per line, in the format of
+`cfy events list --json-output`, and compressed as they are fetched, so
+exporting takes the same memory however many events there are.
+
+Every CHECKPOINT_INTERVAL events, the current compressed stream is ended
+(gzip members and zstd frames may be concatenated), and a checkpoint
+recording the size of the file and how many events of which executions
+it holds is written next to it. An interrupted export is resumed by
+truncating the file to the checkpointed size, and fetching the events
+following the checkpointed ones.
+"""
+
+import os
+import json
+import zlib
+import tempfile
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from .utils import remove_if_exists
+from .exceptions import CloudifyCliError
+from .execution_events_fetcher import ExecutionEventsFetcher
+
+CHECKPOINT_SUFFIX = '.checkpoint'
+
+# The most events exported between checkpoints
+CHECKPOINT_INTERVAL = 10000
+
+# The number of events fetched per request
+EXPORT_BATCH_SIZE = 1000
+
+GZIP = 'gzip'
+ZSTD = 'zstd'
+COMPRESSIONS = [GZIP, ZSTD]
+
+
+class EventsExport(object):
+    """An export of the events of executions to a file.
+
+    :param output_path: The file to export to
+    :param execution_ids: The executions whose events are exported,
+                          in order
+    :param include_logs: Whether to export logs as well
+    :param compression: One of COMPRESSIONS
+    """
+
+    def __init__(self,
+                 output_path,
+                 execution_ids,
+                 include_logs=True,
+                 compression=GZIP,
+                 checkpoint_interval=CHECKPOINT_INTERVAL):
+        if compression == ZSTD and zstandard is None:
+            raise CloudifyCliError(
+                'zstd compression requires the `zstandard` package')
+        self.output_path = output_path
+        self.checkpoint_path = output_path + CHECKPOINT_SUFFIX
+        self._checkpoint_interval = checkpoint_interval
+        self._state = {
+            'execution_ids': execution_ids,
+            'include_logs': include_logs,
+            'compression': compression,
+            # Executions whose events were all exported
+            'exported_executions': 0,
+            # The number of events of the next execution exported
+            'execution_events': 0,
+            'events': 0,
+            'size': 0
+        }
+        self._resumed = False
+        self._output = None
+        self._compressor = None
+        self._uncheckpointed_events = 0
+        # Whether the output holds exactly the events counted in the
+        # state, which is only false while events are being written
+        self._consistent = True
+
+    @property
+    def exported_events(self):
+        return self._state['events']
+
+    def resume(self):
+        """Continue from the checkpoint of an interrupted export to the
+        same file, if there is one.
+
+        :return: Whether there was a checkpoint to continue from
+        """
+        try:
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except IOError:
+            return False
+        except ValueError:
+            raise CloudifyCliError(
+                'The checkpoint file {0} is corrupted, use --restart to '
+                'export from the start'.format(self.checkpoint_path))
+        exported_ids = checkpoint['execution_ids'][
+            :checkpoint['exported_executions'] + 1]
+        execution_ids = self._state['execution_ids']
+        if checkpoint['include_logs'] != self._state['include_logs'] or \
+                checkpoint['compression'] != self._state['compression'] or \
+                execution_ids[:len(exported_ids)] != exported_ids:
+            raise CloudifyCliError(
+                'The interrupted export to {0} was of other events, or '
+                'with other options. Use --restart to export from the '
+                'start'.format(self.output_path))
+        checkpoint['execution_ids'] = execution_ids
+        self._state = checkpoint
+        self._resumed = True
+        return True
+
+    def run(self, client):
+        """Export the events.
+
+        :return: The number of events exported, including those exported
+                 before resuming
+        """
+        if self._resumed:
+            self._output = open(self.output_path, 'r+b')
+            self._output.truncate(self._state['size'])
+            self._output.seek(self._state['size'])
+        else:
+            remove_if_exists(self.checkpoint_path)
+            self._output = open(self.output_path, 'wb')
+        try:
+            execution_ids = self._state['execution_ids']
+            while self._state['exported_executions'] < len(execution_ids):
+                self._export_execution(
+                    client,
+                    execution_ids[self._state['exported_executions']])
+            self._end_stream()
+        except BaseException:
+            # Keep what was exported so far, to resume from it
+            if self._consistent:
+                self._checkpoint()
+            raise
+        finally:
+            self._output.close()
+        remove_if_exists(self.checkpoint_path)
+        return self._state['events']
+
+    def _export_execution(self, client, execution_id):
+        fetcher = ExecutionEventsFetcher(
+            client,
+            execution_id,
+            batch_size=EXPORT_BATCH_SIZE,
+            include_logs=self._state['include_logs'],
+            verify_execution=False,
+            compact_events=False)
+        fetcher.seek(self._state['execution_events'])
+        fetcher.fetch_and_process_events(events_handler=self._write_events,
+                                         timeout=None,
+                                         pipelined=True)
+        self._state['exported_executions'] += 1
+        self._state['execution_events'] = 0
+
+    def _write_events(self, events):
+        if self._compressor is None:
+            self._compressor = _make_compressor(self._state['compression'])
+        data = ''.join('{0}\n'.format(json.dumps(event)) for event in events)
+        self._consistent = False
+        self._output.write(self._compressor.compress(data))
+        self._consistent = True
+        self._state['execution_events'] += len(events)
+        self._state['events'] += len(events)
+        self._uncheckpointed_events += len(events)
+        if self._uncheckpointed_events >= self._checkpoint_interval:
+            self._checkpoint()
+
+    def _end_stream(self):
+        """End the current compressed stream, so that the file can be
+        truncated after it.
+        """
+        if self._compressor is not None:
+            self._consistent = False
+            self._output.write(self._compressor.flush())
+            self._compressor = None
+            self._consistent = True
+        self._output.flush()
+        os.fsync(self._output.fileno())
+
+    def _checkpoint(self):
+        self._end_stream()
+        self._state['size'] = self._output.tell()
+        self._uncheckpointed_events = 0
+        checkpoint_dir = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        fd, temp_path = tempfile.mkstemp(dir=checkpoint_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._state, f)
+        os.rename(temp_path, self.checkpoint_path)
+
+
+def _make_compressor(compression):
+    if compression == ZSTD:
+        return zstandard.ZstdCompressor().compressobj()
+    # A window of 16 + MAX_WBITS makes zlib write a gzip header and trailer
+    return zlib.compressobj(
+        zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
@@ -15,18 +15,99 @@
 ############
 
 
+import sys
 import time
+import Queue
+import threading
+from collections import deque
 
 from cloudify_rest_client.executions import Execution
+from cloudify_rest_client.exceptions import CloudifyClientError
 
+from .polling import Poller
+from .utils import parse_timestamp
+from .compact_event import CompactEvent
+from .constants import MIN_EVENTS_BATCH_SIZE, MAX_EVENTS_BATCH_SIZE
 from .exceptions import (ExecutionTimeoutError,
                          EventProcessingTimeoutError)
 
 
-WAIT_FOR_EXECUTION_SLEEP_INTERVAL = 3
 WORKFLOW_END_TYPES = {u'workflow_succeeded', u'workflow_failed',
                       u'workflow_cancelled'}
 
+# How many of the most recently fetched events are remembered, to drop
+# them if they are fetched again
+RECENT_EVENT_KEYS_SIZE = 1000
+
+# How many fetched batches may wait to be processed in pipelined mode
+# before fetching pauses
+PIPELINE_QUEUE_SIZE = 2
+
+# Seconds between the checks of the pipeline's threads for whether the
+# other one is done, while they wait on its queue
+_PIPELINE_POLL_INTERVAL = 0.1
+
+# The number of events the first request of an adaptive batch size
+# fetches
+INITIAL_BATCH_SIZE = 100
+
+# Seconds a request for events should take. Faster requests let full
+# batches grow, and slower ones shrink them
+TARGET_BATCH_LATENCY = 1.0
+
+# The most characters of messages a batch should hold, as logs with long
+# messages (e.g. tracebacks) make large responses
+TARGET_BATCH_MESSAGES_SIZE = 1024 * 1024
+
+
+class BatchSizer(object):
+    """Chooses the number of events to fetch per request.
+
+    Unless a fixed `size` is passed, the size adapts to the responses:
+    it doubles while batches come back full and fast, shrinks in
+    proportion when a response takes longer than `target_latency` or its
+    messages are larger than `target_messages_size`, and halves while
+    batches come back partial (e.g. when tailing a quiet execution). It
+    always stays between `min_size` and `max_size`.
+    """
+
+    def __init__(self,
+                 size=None,
+                 min_size=MIN_EVENTS_BATCH_SIZE,
+                 max_size=MAX_EVENTS_BATCH_SIZE,
+                 target_latency=TARGET_BATCH_LATENCY,
+                 target_messages_size=TARGET_BATCH_MESSAGES_SIZE):
+        self.adaptive = size is None
+        self.size = INITIAL_BATCH_SIZE if size is None else size
+        self._min_size = min_size
+        self._max_size = max_size
+        self._target_latency = target_latency
+        self._target_messages_size = target_messages_size
+
+    def update(self, size, events, latency):
+        """Adapt the size to a response.
+
+        :param size: The size of the batch that was requested
+        :param events: The events returned, in the API format
+        :param latency: Seconds the request took
+        """
+        if not self.adaptive:
+            return
+        messages_size = sum(len(event.get('message') or '')
+                            for event in events)
+        scale = min(
+            float(self._target_latency) / max(latency, 1e-6),
+            float(self._target_messages_size) / max(messages_size, 1))
+        if scale < 1:
+            new_size = int(size * scale)
+        elif len(events) < size:
+            new_size = size // 2
+        elif scale >= 2:
+            new_size = size * 2
+        else:
+            new_size = size
+        self.size = max(self._min_size, min(new_size, self._max_size))
+
 
 class ExecutionEventsFetcher(object):
 
@@ -38,16 +119,81 @@ class ExecutionEventsFetcher(object):
         'workflow_id',
     ]
 
-    def __init__(self, client, execution_id, batch_size=100,
-                 include_logs=False):
+    def __init__(self, client, execution_id, batch_size=None,
+                 include_logs=False, use_cursor=True,
+                 verify_execution=True, event_store=None, filters=None,
+                 fields=None, compact_events=True):
+        """
+        :param batch_size: The number of events to fetch per request, or
+                           None to adapt it to the manager's responses
+                           (see `BatchSizer`)
+        :param compact_events: Whether to pass events to handlers as
+                               `CompactEvent`s, rather than as dicts in
+                               the internal format
+        """
         self._client = client
+        self._compact_events = compact_events
         self._execution_id = execution_id
-        self._batch_size = batch_size
+        self._batch_sizer = BatchSizer(batch_size)
         self._from_event = 0
         self._include_logs = include_logs
+        # In cursor mode, batches are fetched from the timestamp of the
+        # last event seen, instead of from an ever-growing offset. Events
+        # with equal timestamps may be listed in any order, so those with
+        # the cursor's timestamp are fetched again, and the ones which were
+        # already seen are dropped by remembering the most recently seen
+        # events. `_cursor_offset` counts the events seen with the cursor's
+        # timestamp, which are only skipped by count when they aren't all
+        # remembered (e.g. after resuming from a stored position).
+        self._use_cursor = use_cursor
+        self._cursor_timestamp = None
+        self._cursor_offset = 0
+        self._recent_event_keys = set()
+        self._recent_event_keys_order = deque()
+        # The number of events the last batch fetched, including dropped
+        # duplicates, out of the number it asked for. A full batch means
+        # there may be more to fetch
+        self._last_batch_fetched_count = 0
+        self._last_batch_size = 0
+        # Whether the execution had ended before fetching its events
+        # started, which is only known when verifying it
+        self._execution_ended = False
         # make sure execution exists before proceeding
         # a 404 will be raised otherwise
-        self._client.executions.get(execution_id)
+        if verify_execution:
+            execution = self._client.executions.get(execution_id)
+            self._execution_ended = \
+                execution.status in Execution.END_STATES
+        # Filters the manager supports are added to the events query, and
+        # all of them are applied to the fetched events
+        self._query = filters.get_query() if filters else {}
+        self._passes_filters = filters.compile() if filters else None
+        # Only the stream of all of an execution's events is stored, and
+        # with all of their fields
+        if self._query:
+            event_store = None
+        self._fields = fields if event_store is None else None
+        # With an event store, the stored events are replayed first, and
+        # fetching from the manager continues after them
+        self._event_store = event_store
+        self._stored_events_count = 0
+        self._replayed_events_count = 0
+        self._stream_complete = False
+        self._end_event_received = False
+        if event_store is not None:
+            stream = event_store.get_stream(execution_id, include_logs)
+            self._stored_events_count = stream['events']
+            self._stream_complete = stream['complete']
+            if stream['position'] is not None:
+                self._set_position(stream['position'])
+
+    def seek(self, events_count):
+        """Skip the first `events_count` events of the execution, e.g. to
+        resume fetching them after an interruption.
+        """
+        self._from_event = events_count
+        self._cursor_timestamp = None
+        self._cursor_offset = events_count
 
     def _fetch_and_process_events_batch(self, events_handler=None):
         events = self._fetch_events_batch()
@@ -56,18 +202,189 @@ class ExecutionEventsFetcher(object):
 
         return len(events)
 
+    @property
+    def _last_batch_full(self):
+        return 0 < self._last_batch_size <= self._last_batch_fetched_count
+
     def _fetch_events_batch(self):
+        events = self._fetch_unfiltered_events_batch()
+        if self._passes_filters is not None:
+            events = [event for event in events if self._passes_filters(event)]
+        return events
+
+    def _fetch_unfiltered_events_batch(self):
+        if self._event_store is None:
+            return self._fetch_remote_events_batch()
+
+        if self._replayed_events_count < self._stored_events_count:
+            self._last_batch_size = self._batch_sizer.size
+            events = self._event_store.get_events(
+                self._execution_id,
+                self._include_logs,
+                offset=self._replayed_events_count,
+                limit=self._last_batch_size)
+            self._replayed_events_count += len(events)
+            self._check_end_event(events)
+            # Unless the stored events are all of the execution's events,
+            # the manager is asked for the following ones after replaying
+            # them
+            if self._replayed_events_count >= self._stored_events_count \
+                    and self._stream_complete:
+                self._last_batch_fetched_count = len(events)
+            else:
+                self._last_batch_fetched_count = self._last_batch_size
+            return events
+
+        if self._stream_complete:
+            self._last_batch_fetched_count = 0
+            return []
+        events = self._fetch_remote_events_batch()
+        self._check_end_event(events)
+        # The events of an execution which had ended are all stored once
+        # its end event was fetched, and no more are found after it
+        complete = self._execution_ended and self._end_event_received and \
+            not self._last_batch_full
+        if self._last_batch_fetched_count or complete:
+            self._event_store.add_events(self._execution_id,
+                                         self._include_logs,
+                                         events,
+                                         self._get_position(),
+                                         complete=complete)
+        self._stored_events_count += len(events)
+        self._replayed_events_count += len(events)
+        self._stream_complete = complete
+        return events
+
+    def _check_end_event(self, events):
+        if any(event.get('event_type') in WORKFLOW_END_TYPES
+               for event in events):
+            self._end_event_received = True
+
+    def _get_position(self):
+        """Return where fetching from the manager continues, in a JSON
+        serializable form.
+        """
+        return {
+            'from_event': self._from_event,
+            'use_cursor': self._use_cursor,
+            'cursor_timestamp': self._cursor_timestamp.isoformat()
+            if self._cursor_timestamp else None,
+            'cursor_offset': self._cursor_offset
+        }
+
+    def _set_position(self, position):
+        self._from_event = position['from_event']
+        self._use_cursor = position['use_cursor']
+        self._cursor_timestamp = parse_timestamp(
+            position['cursor_timestamp'])
+        self._cursor_offset = position['cursor_offset']
+
+    def _fetch_remote_events_batch(self):
+        if self._use_cursor:
+            events = self._fetch_events_batch_from_cursor()
+            if events is not None:
+                return events
+        return self._process_events_batch(
+            self._list_events(_offset=self._from_event))
+
+    def _process_events_batch(self, events):
+        self._last_batch_fetched_count = len(events)
+        self._from_event += len(events)
+        return [self._map_event(event) for event in events]
+
+    def _fetch_events_batch_from_cursor(self):
+        """Fetch the events following the cursor.
+
+        :return: The new events, or None if the manager doesn't support
+                 cursors, in which case offsets are used from now on
+        """
+        size = self._batch_sizer.size
+        if self._cursor_timestamp is not None and \
+                self._cursor_offset <= len(self._recent_event_keys_order) \
+                and self._cursor_offset + size <= RECENT_EVENT_KEYS_SIZE:
+            offset = 0
+            overlap = self._cursor_offset
+        else:
+            offset = self._cursor_offset
+            overlap = 0
+        try:
+            events = self._list_events(
+                _offset=offset,
+                overlap=overlap,
+                from_datetime=self._cursor_timestamp)
+        except CloudifyClientError as e:
+            # Older managers reject the timestamp range
+            if e.status_code != 400:
+                raise
+            self._use_cursor = False
+            return None
+        timestamps = [_get_event_timestamp(event) for event in events]
+        if None in timestamps:
+            self._use_cursor = False
+            if self._cursor_timestamp is None:
+                # No cursor was set yet, so these events were fetched
+                # from the same offset an offsets query would use
+                return self._process_events_batch(events)
+            return None
+
+        self._last_batch_fetched_count = len(events)
+        new_events = []
+        for event, timestamp in zip(events, timestamps):
+            key = _get_event_key(event)
+            if key in self._recent_event_keys:
+                continue
+            self._remember_event_key(key)
+            if timestamp == self._cursor_timestamp:
+                self._cursor_offset += 1
+            else:
+                self._cursor_timestamp = timestamp
+                self._cursor_offset = 1
+            new_events.append(self._map_event(event))
+        self._from_event += len(new_events)
+        return new_events
+
+    def _list_events(self, from_datetime=None, overlap=0, **kwargs):
+        """List a batch of events.
+
+        :param overlap: How many events, which were already fetched, to
+                        fetch on top of the batch
+        """
+        query = dict(self._query)
+        since = query.pop('from_datetime', None)
+        # The cursor never precedes the filtered time range, unless it
+        # wasn't set yet
+        if from_datetime is None or (since and since > from_datetime):
+            from_datetime = since
+        if from_datetime is not None:
+            query['from_datetime'] = from_datetime
+        if self._fields:
+            query['_include'] = self._fields
+        query.update(kwargs)
+        size = self._batch_sizer.size
+        started_at = time.time()
         events = self._client.events.list(
             execution_id=self._execution_id,
-            _offset=self._from_event,
-            _size=self._batch_size,
+            _size=size + overlap,
             include_logs=self._include_logs,
-            sort='@timestamp').items
-        self._from_event += len(events)
-        return [
-            self._map_api_event_to_internal_event(event)
-            for event in events
-        ]
+            sort='@timestamp',
+            **query).items
+        # The overlapping events aren't part of the batch, size-wise
+        self._batch_sizer.update(
+            size, events[overlap:], time.time() - started_at)
+        self._last_batch_size = size + overlap
+        return events
+
+    def _remember_event_key(self, key):
+        if len(self._recent_event_keys_order) >= RECENT_EVENT_KEYS_SIZE:
+            self._recent_event_keys.discard(
+                self._recent_event_keys_order.popleft())
+        self._recent_event_keys_order.append(key)
+        self._recent_event_keys.add(key)
+
+    def _map_event(self, event):
+        if self._compact_events:
+            return CompactEvent(event)
+        return self._map_api_event_to_internal_event(event)
 
     def _map_api_event_to_internal_event(self, event):
         """Map data structure from API to internal.
@@ -104,7 +421,22 @@ class ExecutionEventsFetcher(object):
 
         return event
 
-    def fetch_and_process_events(self, events_handler=None, timeout=60):
+    def fetch_and_process_events(self, events_handler=None, timeout=60,
+                                 pipelined=False):
+        """Fetch the events which weren't fetched yet, and pass them to
+        `events_handler`.
+
+        :param timeout: Seconds to fetch the events for, or None to never
+                        time out
+        :param pipelined: Whether to fetch the next batch of events in a
+                          background thread while `events_handler` handles
+                          the current one
+        :return: The number of events fetched
+        """
+        if pipelined and events_handler is not None:
+            return self._fetch_and_process_events_pipelined(
+                events_handler, timeout)
+
         total_events_count = 0
 
         # timeout can be None (never time out), for example when tail is used
@@ -121,13 +453,109 @@ class ExecutionEventsFetcher(object):
                 events_handler=events_handler)
 
             total_events_count += events_batch_count
-            if events_batch_count < self._batch_size:
-                # returned less events than allowed by _batch_size,
+            if not self._last_batch_full:
+                # returned less events than the batch asked for,
                 # this means these are the last events found so far
                 break
 
         return total_events_count
 
+    def _fetch_and_process_events_pipelined(self, events_handler, timeout):
+        """Fetch batches in a background thread, and handle them in this one.
+
+        When handling the events is slow (e.g. a slow terminal), the
+        next batches are fetched in the meantime, and when fetching is
+        slow (e.g. a high latency link), the last batch is handled in the
+        meantime. Up to PIPELINE_QUEUE_SIZE batches wait to be handled,
+        after which fetching waits for the handler to catch up.
+        """
+        batches = Queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        stopped = threading.Event()
+        deadline = None if timeout is None else time.time() + timeout
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    batches.put(item, timeout=_PIPELINE_POLL_INTERVAL)
+                    return
+                except Queue.Full:
+                    pass
+
+        def fetch():
+            try:
+                while not stopped.is_set():
+                    if deadline is not None and time.time() > deadline:
+                        raise EventProcessingTimeoutError(
+                            self._execution_id,
+                            'events/log fetching timed out')
+                    put(self._fetch_events_batch())
+                    if not self._last_batch_full:
+                        break
+                put(_PipelineEnd())
+            except BaseException:
+                put(_PipelineEnd(sys.exc_info()))
+
+        fetcher = threading.Thread(target=fetch)
+        fetcher.daemon = True
+        fetcher.start()
+        total_events_count = 0
+        try:
+            while True:
+                try:
+                    batch = batches.get(timeout=_PIPELINE_POLL_INTERVAL)
+                except Queue.Empty:
+                    continue
+                if isinstance(batch, _PipelineEnd):
+                    batch.reraise()
+                    break
+                if batch:
+                    events_handler(batch)
+                total_events_count += len(batch)
+        except BaseException:
+            # The fetching thread stops once its request (which may take
+            # long, e.g. on Ctrl-C) returns, which isn't waited for
+            stopped.set()
+            raise
+        # Fetching is done, so the thread is just ending
+        fetcher.join()
+        return total_events_count
+
+
+class _PipelineEnd(object):
+    """Marks the end of the batches of a pipelined fetch, because all of
+    them were fetched or because fetching failed.
+    """
+
+    def __init__(self, exc_info=None):
+        self._exc_info = exc_info
+
+    def reraise(self):
+        if self._exc_info is not None:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+
+
+def _get_event_timestamp(event):
+    """Return the timestamp of an event in API format as a datetime,
+    or None if it has none.
+    """
+    return parse_timestamp(event.get('timestamp') or event.get('@timestamp'))
+
+
+def _get_event_key(event):
+    """Return a key identifying an event in API format.
+    """
+    if event.get('id') is not None:
+        return event['id']
+    message = event.get('message')
+    if isinstance(message, dict):
+        message = message.get('text')
+    return (event.get('timestamp'),
+            event.get('type'),
+            event.get('event_type'),
+            event.get('node_instance_id'),
+            event.get('operation'),
+            message)
+
 
 def get_deployment_environment_creation_execution(client, deployment_id):
     executions = client.executions.list(deployment_id=deployment_id)
@@ -171,46 +599,59 @@ def wait_for_execution(client,
                        execution,
                        events_handler=None,
                        include_logs=False,
-                       timeout=900):
+                       timeout=900,
+                       pipelined=False,
+                       event_store=None,
+                       filters=None,
+                       fields=None,
+                       batch_size=None,
+                       compact_events=True):
 
     # if execution already ended - return without waiting
     if execution.status in Execution.END_STATES:
         return execution
 
-    if timeout is not None:
-        deadline = time.time() + timeout
-
+    poller = Poller(timeout=timeout)
     events_fetcher = ExecutionEventsFetcher(client, execution.id,
-                                            include_logs=include_logs)
+                                            include_logs=include_logs,
+                                            event_store=event_store,
+                                            filters=filters,
+                                            fields=fields,
+                                            batch_size=batch_size,
+                                            compact_events=compact_events)
 
     # Poll for execution status and execution logs, until execution ends
     # and we receive an event of type in WORKFLOW_END_TYPES
     execution_ended = False
     events_watcher = EventsWatcher(events_handler)
     while True:
-        if timeout is not None:
-            if time.time() > deadline:
-                raise ExecutionTimeoutError(
-                    execution.id,
-                    'execution of operation {0} for deployment {1} '
-                    'timed out'.format(execution.workflow_id,
-                                       execution.deployment_id))
-            else:
-                # update the remaining timeout
-                timeout = deadline - time.time()
-
+        if poller.timed_out:
+            raise ExecutionTimeoutError(
+                execution.id,
+                'execution of operation {0} for deployment {1} '
+                'timed out'.format(execution.workflow_id,
+                                   execution.deployment_id))
+
+        # Poll quickly while the execution's status changes or it
+        # reports events, and back off while it's idle
+        activity = False
         if not execution_ended:
+            previous_status = execution.status
             execution = client.executions.get(execution.id)
             execution_ended = execution.status in Execution.END_STATES
+            activity = execution.status != previous_status
 
         if not events_watcher.end_log_received and \
                 execution.status != Execution.PENDING:
-            events_fetcher.fetch_and_process_events(
-                events_handler=events_watcher, timeout=timeout)
+            if events_fetcher.fetch_and_process_events(
+                    events_handler=events_watcher,
+                    timeout=poller.remaining,
+                    pipelined=pipelined):
+                activity = True
 
         if execution_ended and events_watcher.end_log_received:
             break
 
-        time.sleep(WAIT_FOR_EXECUTION_SLEEP_INTERVAL)
+        poller.wait(activity=activity)
 
     return execution
@@ -0,0 +1,184 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""Waiting for many executions at once.
+
+Commands which start an execution per deployment (e.g. `agents install`)
+used to wait for each one in a thread of its own, with every thread
+getting its execution and fetching its events on every poll. Instead, an
+`ExecutionMultiplexer` gets the status of all of the executions it watches
+with one `executions.list` query per poll, and fetches the events of a
+bounded number of them per poll, in turns.
+"""
+
+from collections import deque
+
+from cloudify_rest_client.executions import Execution
+
+from .polling import Poller
+from .exceptions import EventProcessingTimeoutError
+from .execution_events_fetcher import EventsWatcher, ExecutionEventsFetcher
+
+# The most executions whose events are fetched in a single poll
+DEFAULT_MAX_EVENT_FETCHES = 10
+
+# The most executions whose status is listed in a single request, which
+# keeps the URL of the request short enough
+STATUS_QUERY_SIZE = 100
+
+_STATUS_FIELDS = ['id', 'status', 'error', 'deployment_id', 'workflow_id']
+
+
+class ExecutionMultiplexer(object):
+    """Waits for many executions to end, and for their end events.
+
+    :param client: The rest client
+    :param include_logs: Whether to fetch logs along with the events
+    :param timeout: Seconds to wait for all of the executions, or None
+                    to wait forever
+    :param max_event_fetches: The most executions whose events are
+                              fetched in a single poll
+    """
+
+    def __init__(self,
+                 client,
+                 include_logs=False,
+                 timeout=900,
+                 max_event_fetches=DEFAULT_MAX_EVENT_FETCHES):
+        self._client = client
+        self._include_logs = include_logs
+        self._timeout = timeout
+        self._max_event_fetches = max_event_fetches
+        self._watched = []
+
+    def add(self, execution, events_handler=None, end_handler=None):
+        """Watch an execution.
+
+        :param execution: The execution, as returned when starting it
+        :param events_handler: Called with every batch of the execution's
+                               events
+        :param end_handler: Called with the execution once it ended and
+                            its end event was received
+        """
+        watched = _WatchedExecution(
+            execution,
+            ExecutionEventsFetcher(self._client,
+                                   execution.id,
+                                   include_logs=self._include_logs,
+                                   verify_execution=False),
+            EventsWatcher(events_handler),
+            end_handler)
+        # Like wait_for_execution, don't wait for the events of an
+        # execution which already ended
+        if watched.ended:
+            watched.watcher.end_log_received = True
+        self._watched.append(watched)
+
+    def run(self):
+        """Wait until all of the executions ended, or until the timeout.
+
+        :return: The executions which didn't end in time
+        """
+        poller = Poller(timeout=self._timeout)
+        pending = deque(watched for watched in self._watched
+                        if not watched.done)
+        self._end(watched for watched in self._watched if watched.done)
+        while pending:
+            if poller.timed_out:
+                break
+            activity = self._update_statuses(pending)
+            try:
+                if self._fetch_events(pending, poller.remaining):
+                    activity = True
+            except EventProcessingTimeoutError:
+                break
+            done = [watched for watched in pending if watched.done]
+            if done:
+                pending = deque(watched for watched in pending
+                                if not watched.done)
+                self._end(done)
+            if pending:
+                poller.wait(activity=activity)
+        return [watched.execution for watched in pending]
+
+    def _update_statuses(self, pending):
+        """Get the status of the pending executions which didn't end yet.
+
+        :return: Whether the status of any of them changed
+        """
+        running = dict((watched.execution.id, watched) for watched in pending
+                       if not watched.ended)
+        ids = list(running)
+        changed = False
+        for start in xrange(0, len(ids), STATUS_QUERY_SIZE):
+            executions = self._client.executions.list(
+                id=ids[start:start + STATUS_QUERY_SIZE],
+                include_system_workflows=True,
+                _include=_STATUS_FIELDS)
+            for execution in executions:
+                watched = running.get(execution.id)
+                if watched is None:
+                    continue
+                if execution.status != watched.execution.status:
+                    changed = True
+                watched.execution = execution
+        return changed
+
+    def _fetch_events(self, pending, timeout):
+        """Fetch the events of up to `max_event_fetches` executions.
+
+        The executions take turns, so that all of them get their events
+        fetched even when there are more of them than fetches per poll.
+
+        :return: Whether any events were fetched
+        """
+        fetched = False
+        fetches = 0
+        for _ in xrange(len(pending)):
+            if fetches >= self._max_event_fetches:
+                break
+            watched = pending[0]
+            pending.rotate(-1)
+            if watched.watcher.end_log_received or \
+                    watched.execution.status == Execution.PENDING:
+                continue
+            fetches += 1
+            if watched.fetcher.fetch_and_process_events(
+                    events_handler=watched.watcher, timeout=timeout):
+                fetched = True
+        return fetched
+
+    def _end(self, done):
+        for watched in done:
+            if watched.end_handler is not None:
+                watched.end_handler(watched.execution)
+
+
+class _WatchedExecution(object):
+
+    def __init__(self, execution, fetcher, watcher, end_handler):
+        self.execution = execution
+        self.fetcher = fetcher
+        self.watcher = watcher
+        self.end_handler = end_handler
+
+    @property
+    def ended(self):
+        return self.execution.status in Execution.END_STATES
+
+    @property
+    def done(self):
+        return self.ended and self.watcher.end_log_received
@@ -0,0 +1,394 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""Timing analysis of an execution, from its events.
+
+An `ExecutionProfile` is an events handler: it's passed the events of an
+execution in order, as fetched by `ExecutionEventsFetcher`, and keeps one
+record per task (an operation of a node instance), rather than the
+events themselves.
+
+Every attempt of a task is timed from `sending_task` (the task was
+queued), through `task_started`, to `task_succeeded`, `task_failed` or
+`task_rescheduled`. The time between the first two is the attempt's
+queue wait. An attempt is a retry of the task if the previous attempt
+failed or was rescheduled; after one which succeeded, the operation is
+run again on the node instance (e.g. a relationship operation, which
+runs once per relationship), which makes a new task.
+
+Events don't tell which tasks waited for which, so the critical path is
+estimated from timing alone: starting from the task which ended last,
+every task's predecessor is the task which ended last before it was
+queued.
+"""
+
+import json
+import heapq
+import bisect
+import calendar
+from collections import defaultdict
+
+from .utils import parse_timestamp
+from .execution_events_fetcher import WORKFLOW_END_TYPES
+
+SENDING_TASK = 'sending_task'
+TASK_STARTED = 'task_started'
+TASK_SUCCEEDED = 'task_succeeded'
+TASK_FAILED = 'task_failed'
+TASK_RESCHEDULED = 'task_rescheduled'
+TASK_END_TYPES = frozenset([TASK_SUCCEEDED, TASK_FAILED, TASK_RESCHEDULED])
+WORKFLOW_STARTED = 'workflow_started'
+
+# The event types a profile is computed from, besides those which end the
+# workflow
+PROFILED_EVENT_TYPES = [SENDING_TASK, TASK_STARTED, TASK_SUCCEEDED,
+                        TASK_FAILED, TASK_RESCHEDULED, WORKFLOW_STARTED]
+
+# The fields of events, as listed by the manager, a profile needs
+PROFILED_EVENT_FIELDS = ['timestamp', 'reported_timestamp', 'type',
+                         'event_type', 'node_name', 'node_instance_id',
+                         'operation', 'deployment_id', 'execution_id',
+                         'workflow_id', 'message', 'error_causes']
+
+
+class _Attempt(object):
+
+    __slots__ = ('sent_at', 'started_at', 'ended_at', 'outcome', 'lane')
+
+    def __init__(self, sent_at=None):
+        self.sent_at = sent_at
+        self.started_at = None
+        self.ended_at = None
+        self.outcome = None
+        self.lane = None
+
+    @property
+    def queue_wait(self):
+        if self.sent_at is None or self.started_at is None:
+            return 0.0
+        return self.started_at - self.sent_at
+
+
+class _Task(object):
+    """The attempts to run an operation of a node instance.
+    """
+
+    __slots__ = ('node_id', 'node_name', 'operation', 'attempts')
+
+    def __init__(self, node_id, node_name, operation):
+        self.node_id = node_id
+        self.node_name = node_name
+        self.operation = operation
+        self.attempts = []
+
+    @property
+    def queued_at(self):
+        first = self.attempts[0]
+        return first.sent_at if first.sent_at is not None \
+            else first.started_at
+
+    @property
+    def ended_at(self):
+        return self.attempts[-1].ended_at
+
+    @property
+    def ended(self):
+        return bool(self.attempts) and self.ended_at is not None and \
+            self.queued_at is not None
+
+    @property
+    def duration(self):
+        return self.ended_at - self.queued_at
+
+    @property
+    def run_time(self):
+        return sum(attempt.ended_at - attempt.started_at
+                   for attempt in self.attempts
+                   if attempt.started_at is not None and
+                   attempt.ended_at is not None) or 0.0
+
+    @property
+    def queue_wait(self):
+        return sum(attempt.queue_wait for attempt in self.attempts) or 0.0
+
+    @property
+    def retries(self):
+        return len(self.attempts) - 1
+
+    @property
+    def outcome(self):
+        return self.attempts[-1].outcome
+
+    @property
+    def succeeded(self):
+        return bool(self.attempts) and self.outcome == TASK_SUCCEEDED
+
+
+class ExecutionProfile(object):
+    """The timing of the tasks of an execution, computed from its events
+    in a single pass.
+
+    Call it with every batch of the execution's events, in order, and
+    then read the results from `summary`, `operations`, `nodes`,
+    `slowest_tasks` and `critical_path`, or export them with
+    `chrome_trace`.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self._task_order = []
+        self.workflow_started_at = None
+        self.workflow_ended_at = None
+        self.workflow_outcome = None
+        # Concurrency, as the number of running attempts over time
+        self.running = 0
+        self.peak_concurrency = 0
+        self._running_since = None
+        self._running_time = 0.0
+        self.concurrency = []
+        # The lanes of a Chrome trace, which running attempts take up one
+        # each, like threads
+        self._free_lanes = []
+        self._lanes = 0
+
+    def __call__(self, events):
+        for event in events:
+            self.add_event(event)
+
+    def add_event(self, event):
+        """Account for an event in the internal format.
+        """
+        event_type = event.get('event_type')
+        timestamp = _get_timestamp(event)
+        if event_type is None or timestamp is None:
+            return
+        if event_type == WORKFLOW_STARTED:
+            if self.workflow_started_at is None:
+                self.workflow_started_at = timestamp
+            return
+        if event_type in WORKFLOW_END_TYPES:
+            self.workflow_ended_at = timestamp
+            self.workflow_outcome = event_type[len('workflow_'):]
+            return
+        if event_type != SENDING_TASK and event_type != TASK_STARTED and \
+                event_type not in TASK_END_TYPES:
+            return
+
+        context = event['context']
+        operation = context.get('operation')
+        if not operation:
+            return
+        task = self._get_task(context.get('node_id'),
+                              context.get('node_name'),
+                              operation,
+                              new_attempt=event_type not in TASK_END_TYPES)
+        attempt = task.attempts[-1] if task.attempts else None
+        if event_type == SENDING_TASK:
+            if attempt is None or attempt.ended_at is not None:
+                task.attempts.append(_Attempt(timestamp))
+        elif event_type == TASK_STARTED:
+            if attempt is None or attempt.ended_at is not None or \
+                    attempt.started_at is not None:
+                attempt = _Attempt()
+                task.attempts.append(attempt)
+            attempt.started_at = timestamp
+            attempt.lane = self._take_lane()
+            self._set_running(timestamp, self.running + 1)
+        elif attempt is not None and attempt.ended_at is None:
+            attempt.ended_at = timestamp
+            attempt.outcome = event_type
+            if attempt.started_at is not None:
+                self._free_lane(attempt.lane)
+                self._set_running(timestamp, self.running - 1)
+
+    def _get_task(self, node_id, node_name, operation, new_attempt):
+        key = (node_id, operation)
+        task = self._tasks.get(key)
+        if task is None or (new_attempt and task.succeeded):
+            task = self._tasks[key] = _Task(node_id, node_name, operation)
+            self._task_order.append(task)
+        return task
+
+    def _set_running(self, timestamp, running):
+        if self._running_since is not None:
+            self._running_time += \
+                self.running * (timestamp - self._running_since)
+        self._running_since = timestamp
+        self.running = max(running, 0)
+        self.peak_concurrency = max(self.peak_concurrency, self.running)
+        self.concurrency.append((timestamp, self.running))
+
+    def _take_lane(self):
+        if self._free_lanes:
+            return heapq.heappop(self._free_lanes)
+        self._lanes += 1
+        return self._lanes
+
+    def _free_lane(self, lane):
+        if lane is not None:
+            heapq.heappush(self._free_lanes, lane)
+
+    @property
+    def tasks(self):
+        """The tasks which ended, in the order they were first seen.
+        """
+        return [task for task in self._task_order if task.ended]
+
+    @property
+    def start(self):
+        starts = [task.queued_at for task in self.tasks]
+        if self.workflow_started_at is not None:
+            starts.append(self.workflow_started_at)
+        return min(starts) if starts else None
+
+    @property
+    def summary(self):
+        tasks = self.tasks
+        start = self.start
+        end = self.workflow_ended_at
+        if end is None and tasks:
+            end = max(task.ended_at for task in tasks)
+        duration = end - start if start is not None and end is not None \
+            else 0.0
+        task_time = sum(task.run_time for task in tasks)
+        return {
+            'duration': duration,
+            'outcome': self.workflow_outcome,
+            'tasks': len(tasks),
+            'attempts': sum(len(task.attempts) for task in tasks),
+            'retries': sum(task.retries for task in tasks),
+            'failed_tasks': sum(1 for task in tasks
+                                if task.outcome == TASK_FAILED),
+            'task_time': task_time,
+            'queue_wait': sum(task.queue_wait for task in tasks),
+            'peak_concurrency': self.peak_concurrency,
+            'average_concurrency':
+                self._running_time / duration if duration else 0.0,
+        }
+
+    @property
+    def operations(self):
+        """The tasks' timing summed up per operation, slowest first.
+        """
+        return self._aggregate(lambda task: task.operation, 'operation')
+
+    @property
+    def nodes(self):
+        """The tasks' timing summed up per node, slowest first.
+        """
+        return self._aggregate(lambda task: task.node_name, 'node')
+
+    def _aggregate(self, get_key, key_name):
+        groups = defaultdict(list)
+        for task in self.tasks:
+            groups[get_key(task)].append(task)
+        rows = []
+        for key, tasks in groups.iteritems():
+            durations = [task.duration for task in tasks]
+            rows.append({
+                key_name: key,
+                'tasks': len(tasks),
+                'total': sum(durations),
+                'average': sum(durations) / len(durations),
+                'max': max(durations),
+                'span': max(task.ended_at for task in tasks) -
+                min(task.queued_at for task in tasks),
+                'queue_wait': sum(task.queue_wait for task in tasks),
+                'retries': sum(task.retries for task in tasks),
+            })
+        rows.sort(key=lambda row: row['total'], reverse=True)
+        return rows
+
+    def slowest_tasks(self, count=10):
+        return heapq.nlargest(count, self.tasks,
+                              key=lambda task: task.duration)
+
+    @property
+    def critical_path(self):
+        """The chain of tasks, each of which ended before the next one was
+        queued, that ends with the task which ended last.
+        """
+        tasks = sorted(self.tasks, key=lambda task: task.ended_at)
+        if not tasks:
+            return []
+        ends = [task.ended_at for task in tasks]
+        index = len(tasks) - 1
+        path = [tasks[index]]
+        while True:
+            # The last task which ended before the current one was queued
+            index = min(bisect.bisect_right(ends, path[-1].queued_at),
+                        index) - 1
+            if index < 0:
+                break
+            path.append(tasks[index])
+        path.reverse()
+        return path
+
+    def chrome_trace(self):
+        """Return the profile in the Chrome trace event format, which
+        chrome://tracing, Perfetto and speedscope show as a timeline.
+        """
+        start = self.start or 0
+        trace_events = []
+
+        def micros(timestamp):
+            return int(round((timestamp - start) * 1000000))
+
+        for task in self.tasks:
+            for number, attempt in enumerate(task.attempts):
+                if attempt.started_at is None or attempt.ended_at is None:
+                    continue
+                trace_events.append({
+                    'name': task.operation,
+                    'cat': task.node_name or '',
+                    'ph': 'X',
+                    'ts': micros(attempt.started_at),
+                    'dur': micros(attempt.ended_at) -
+                    micros(attempt.started_at),
+                    'pid': 1,
+                    'tid': attempt.lane,
+                    'args': {
+                        'node_instance': task.node_id,
+                        'attempt': number + 1,
+                        'outcome': attempt.outcome,
+                        'queue_wait': attempt.queue_wait,
+                    }
+                })
+        for timestamp, running in self.concurrency:
+            trace_events.append({
+                'name': 'running tasks',
+                'ph': 'C',
+                'ts': micros(timestamp),
+                'pid': 1,
+                'args': {'running': running}
+            })
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def _get_timestamp(event):
+    """Return the time of an event in seconds since the epoch, preferring
+    the time it was reported at over the time it was stored at.
+    """
+    for field in ('reported_timestamp', 'timestamp'):
+        timestamp = parse_timestamp(event.get(field))
+        if timestamp is not None:
+            return calendar.timegm(timestamp.timetuple()) + \
+                timestamp.microsecond / 1000000.0
+    return None
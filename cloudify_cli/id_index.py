@@ -0,0 +1,217 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""An on-disk index of the IDs of the manager's resources.
+
+Shell completion needs the IDs of e.g. all deployments on every tab press,
+and listing them from a large manager takes seconds. Instead, completers
+look IDs up in an index kept per profile and per tenant, under the
+profile's directory.
+
+An index older than its TTL is still used, but is refreshed in a
+background process, so that the next lookup sees fresh IDs. A missing
+index is fetched from the manager right away. The CLI's own commands
+which create or delete resources invalidate the matching indexes.
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import bisect
+import tempfile
+
+from . import env
+from . import constants
+from .utils import remove_if_exists
+
+# Seconds after which an index is refreshed
+DEFAULT_TTL = 300
+
+# A refresh which hasn't finished after that many seconds is assumed to
+# have died, and another one may start
+REFRESH_TIMEOUT = 60
+
+
+class IdIndex(object):
+    """The IDs of one type of resource, in the active profile.
+
+    :param name: The name of the index (e.g. `deployments`)
+    :param fetch_ids: A function that takes a rest client and returns the
+                      IDs to index
+    :param tenant_name: The tenant the IDs belong to, the profile's tenant
+                        by default
+    :param ttl: Seconds after which the index is refreshed
+    """
+
+    def __init__(self, name, fetch_ids, tenant_name=None, ttl=DEFAULT_TTL):
+        self.name = name
+        self._fetch_ids = fetch_ids
+        self._tenant_name = tenant_name
+        self._ttl = ttl
+        self.path = os.path.join(
+            _get_index_dir(tenant_name), '{0}.json'.format(name))
+
+    def lookup(self, prefix=''):
+        """Return the sorted IDs starting with `prefix`.
+        """
+        index = self._load()
+        if index is None:
+            ids = self.refresh()
+        else:
+            ids = index['ids']
+            if time.time() - index['updated_at'] > self._ttl:
+                self._refresh_in_background()
+        start = bisect.bisect_left(ids, prefix)
+        end = start
+        while end < len(ids) and ids[end].startswith(prefix):
+            end += 1
+        return ids[start:end]
+
+    def refresh(self):
+        """Fetch the IDs from the manager and write them to the index.
+
+        :return: The sorted IDs
+        """
+        client = env.get_rest_client(tenant_name=self._tenant_name)
+        ids = sorted(self._fetch_ids(client))
+        index_dir = os.path.dirname(self.path)
+        if not os.path.isdir(index_dir):
+            os.makedirs(index_dir)
+        # Written to a temporary file first, so that a concurrent lookup
+        # never reads a partial index
+        fd, temp_path = tempfile.mkstemp(dir=index_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'updated_at': time.time(), 'ids': ids}, f)
+        os.rename(temp_path, self.path)
+        return ids
+
+    def invalidate(self):
+        remove_if_exists(self.path)
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return None
+
+    def _refresh_in_background(self):
+        if not self._start_refresh():
+            return
+        if not hasattr(os, 'fork'):
+            self._refresh_and_finish()
+            return
+        if os.fork():
+            return
+        # The child refreshes the index on its own, without holding on to
+        # the shell's completion output
+        try:
+            os.setsid()
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for stream in (sys.stdin, sys.stdout, sys.stderr):
+                os.dup2(devnull, stream.fileno())
+            self._refresh_and_finish()
+        finally:
+            os._exit(0)
+
+    def _start_refresh(self):
+        """Mark the index as being refreshed.
+
+        :return: False if another refresh is already in progress
+        """
+        marker = self.path + '.refreshing'
+        try:
+            if time.time() - os.path.getmtime(marker) > REFRESH_TIMEOUT:
+                remove_if_exists(marker)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                return False
+            raise
+        return True
+
+    def _refresh_and_finish(self):
+        try:
+            self.refresh()
+        except Exception:
+            # The stale index is still better than nothing, the next
+            # lookup will try again
+            pass
+        finally:
+            remove_if_exists(self.path + '.refreshing')
+
+
+def get_objects_index(objects_type, tenant_name=None):
+    """Return the index of the IDs of `objects_type` (e.g. `deployments`),
+    as listed by the rest client.
+    """
+    def fetch_ids(client):
+        objects = getattr(client, objects_type).list(_include=['id'])
+        return [obj.id for obj in objects]
+    return IdIndex(objects_type, fetch_ids, tenant_name=tenant_name)
+
+
+def get_workflows_index(deployment_id, tenant_name=None):
+    """Return the index of the workflows of a deployment.
+    """
+    def fetch_ids(client):
+        deployment = client.deployments.get(
+            deployment_id, _include=['workflows'])
+        return [workflow.id for workflow in deployment.workflows]
+    return IdIndex(_get_workflows_index_name(deployment_id),
+                   fetch_ids,
+                   tenant_name=tenant_name)
+
+
+def invalidate(objects_type, deployment_id=None):
+    """Invalidate the index of `objects_type` in every tenant of the
+    active profile.
+
+    If `deployment_id` is passed, the index of its workflows is
+    invalidated as well.
+    """
+    names = [objects_type]
+    if deployment_id:
+        names.append(_get_workflows_index_name(deployment_id))
+    if not env.get_active_profile():
+        return
+    root_dir = _get_root_dir()
+    if not os.path.isdir(root_dir):
+        return
+    for tenant_dir in os.listdir(root_dir):
+        for name in names:
+            remove_if_exists(os.path.join(
+                root_dir, tenant_dir, '{0}.json'.format(name)))
+
+
+def _get_root_dir():
+    return os.path.join(env.get_profile_dir(suppress_error=True),
+                        constants.CLOUDIFY_ID_INDEX_DIR_NAME)
+
+
+def _get_index_dir(tenant_name=None):
+    tenant_name = tenant_name or env.get_tenant_name() or \
+        constants.DEFAULT_TENANT_NAME
+    return os.path.join(_get_root_dir(), tenant_name)
+
+
+def _get_workflows_index_name(deployment_id):
+    return 'workflows-{0}'.format(deployment_id)
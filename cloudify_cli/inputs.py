@@ -15,8 +15,8 @@
 
 import os
 import glob
-import yaml
 
+from . import yaml_io
 from .logger import get_logger
 from.exceptions import CloudifyCliError
 
@@ -84,12 +84,11 @@ def _parse_yaml_path(resource):
     try:
         # if resource is a path - parse as a yaml file
         if os.path.isfile(resource):
-            with open(resource) as f:
-                content = yaml.load(f.read())
+            content = yaml_io.load_path(resource)
         else:
             # parse resource content as yaml
-            content = yaml.load(resource)
-    except yaml.error.YAMLError as e:
+            content = yaml_io.load(resource)
+    except yaml_io.YAMLError as e:
         raise CloudifyCliError("'{0}' is not a valid YAML. {1}".format(
             resource, str(e)))
 
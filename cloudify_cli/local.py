@@ -30,7 +30,7 @@ from . import utils
 from . import constants
 from . import exceptions
 from .logger import get_logger
-from .config.config import CloudifyConfig
+from .config.config import get_config
 
 
 _ENV_NAME = 'local'
@@ -48,7 +48,7 @@ def initialize_blueprint(blueprint_path,
     if install_plugins:
         _install_plugins(blueprint_path=blueprint_path)
 
-    config = CloudifyConfig()
+    config = get_config()
     return local.init_env(
         blueprint_path=blueprint_path,
         name=name,
@@ -17,10 +17,11 @@
 
 import os
 import sys
-import copy
 import json
+import time
 import logging
-import logging.config
+import logging.handlers
+from contextlib import contextmanager
 
 import colorama
 
@@ -28,8 +29,9 @@ from cloudify import logs
 
 from . import env
 from .config.config import is_use_colors
-from .config.config import CloudifyConfig
+from .config.config import get_config
 from .colorful_event import ColorfulEvent
+from .compact_event import to_dict
 
 DEFAULT_LOG_FILE = os.path.join(env.CLOUDIFY_WORKDIR, 'logs', 'cli.log')
 
@@ -46,30 +48,41 @@ _lgr = None
 _all_loggers = set()
 
 
-LOGGER = {
-    "version": 1,
-    "formatters": {
-        "file": {
-            "format": "%(asctime)s [%(levelname)s] %(message)s"
-        },
-        "console": {
-            "format": "%(message)s"
-        }
-    },
-    "handlers": {
-        "file": {
-            "class": "logging.handlers.RotatingFileHandler",
-            "formatter": "file",
-            "maxBytes": "5000000",
-            "backupCount": "20"
-        },
-        "console": {
-            "class": "logging.StreamHandler",
-            "stream": "ext://sys.stdout",
-            "formatter": "console"
-        }
-    }
-}
+FILE_LOG_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+CONSOLE_LOG_FORMAT = '%(message)s'
+LOG_FILE_MAX_BYTES = 5000000
+LOG_FILE_BACKUP_COUNT = 20
+
+# The most seconds rendered events wait to be written, while rendering a
+# large batch of events
+EVENTS_FLUSH_INTERVAL = 0.2
+
+# The level each configured logger should have when not running verbosely
+_logger_levels = {}
+
+_console_handler = None
+# File handlers, by the absolute path of their log file
+_file_handlers = {}
+
+
+class _DelayedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """A RotatingFileHandler which only creates the log file (and its
+    directory) when the first record is written to it.
+    """
+
+    def __init__(self, filename):
+        logging.handlers.RotatingFileHandler.__init__(
+            self,
+            filename,
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
+            delay=True)
+
+    def _open(self):
+        logfile_dir = os.path.dirname(self.baseFilename)
+        if not os.path.exists(logfile_dir):
+            os.makedirs(logfile_dir)
+        return logging.handlers.RotatingFileHandler._open(self)
 
 
 def get_logger():
@@ -83,6 +96,17 @@ def all_loggers():
 
 
 def configure_loggers():
+    """Configure the CLI's loggers.
+
+    The handlers are built once per process, and the log file is only
+    opened when something is first logged to it, so this is cheap to call
+    for commands that log nothing, and to call again.
+    """
+    # The console handler is only built once, but writes to whatever
+    # stdout is whenever the loggers are configured (e.g. the stdout of a
+    # daemon's client)
+    _get_console_handler().stream = sys.stdout
+
     # first off, configure defaults
     # to enable the use of the logger
     # even before the init was executed.
@@ -95,6 +119,7 @@ def configure_loggers():
 
     global _lgr
     _lgr = logging.getLogger('cloudify.cli.main')
+    _apply_verbosity()
 
     # configuring events/logs loggers
     # (this will also affect local workflow loggers, which don't use
@@ -106,58 +131,102 @@ def configure_loggers():
 
 
 def _configure_defaults():
-
-    # add handlers to the main logger
-    logger_dict = copy.deepcopy(LOGGER)
-    logger_dict['loggers'] = {
-        'cloudify.cli.main': {
-            'handlers': list(logger_dict['handlers'].keys())
-        }
-    }
-    logger_dict['handlers']['file']['filename'] = DEFAULT_LOG_FILE
-    logfile_dir = os.path.dirname(DEFAULT_LOG_FILE)
-    if not os.path.exists(logfile_dir):
-        os.makedirs(logfile_dir)
-
-    logging.config.dictConfig(logger_dict)
-    logging.getLogger('cloudify.cli.main').setLevel(logging.INFO)
-    _all_loggers.add('cloudify.cli.main')
+    _configure_logger('cloudify.cli.main', logging.INFO, DEFAULT_LOG_FILE)
+    _disable_existing_loggers(['cloudify.cli.main'])
 
 
 def _configure_from_file():
-
-    config = CloudifyConfig()
+    config = get_config()
     logging_config = config.logging
-    loggers_config = logging_config.loggers
-    logfile = logging_config.filename
-
-    # set filename on file handler
-    logger_dict = copy.deepcopy(LOGGER)
-    logger_dict['handlers']['file']['filename'] = logfile
-    logfile_dir = os.path.dirname(logfile)
-    if not os.path.exists(logfile_dir):
-        os.makedirs(logfile_dir)
-
-    # add handlers to every logger
-    # specified in the file
-    loggers = {}
-    for logger_name in loggers_config:
-        loggers[logger_name] = {
-            'handlers': list(logger_dict['handlers'].keys())
-        }
-    logger_dict['loggers'] = loggers
-
-    # set level for each logger
-    for logger_name, logging_level in loggers_config.iteritems():
-        log = logging.getLogger(logger_name)
+    for logger_name, logging_level in logging_config.loggers.iteritems():
         level = logging._levelNames[logging_level.upper()]
-        log.setLevel(level)
-        _all_loggers.add(logger_name)
-
-    logging.config.dictConfig(logger_dict)
+        _configure_logger(logger_name, level, logging_config.filename)
+    _disable_existing_loggers(logging_config.loggers)
+
+
+def _configure_logger(logger_name, level, logfile):
+    log = logging.getLogger(logger_name)
+    for handler in list(log.handlers):
+        log.removeHandler(handler)
+    log.addHandler(_get_console_handler())
+    log.addHandler(_get_file_handler(logfile))
+    log.setLevel(level)
+    log.disabled = False
+    _logger_levels[logger_name] = level
+    _all_loggers.add(logger_name)
+
+
+def _disable_existing_loggers(logger_names):
+    """Disable every other logger which already exists, other than the
+    children of `logger_names`, which are reset to log through them,
+    the same as `logging.config.dictConfig` does.
+    """
+    logger_names = set(logger_names)
+    prefixes = tuple('{0}.'.format(name) for name in logger_names)
+    for name, log in logging.Logger.manager.loggerDict.items():
+        if name in logger_names or not isinstance(log, logging.Logger):
+            continue
+        if name.startswith(prefixes):
+            log.setLevel(logging.NOTSET)
+            log.handlers = []
+            log.propagate = True
+        else:
+            log.disabled = True
+
+
+def _get_console_handler():
+    global _console_handler
+    if _console_handler is None:
+        _console_handler = logging.StreamHandler(sys.stdout)
+        _console_handler.setFormatter(logging.Formatter(CONSOLE_LOG_FORMAT))
+    return _console_handler
+
+
+def _get_file_handler(logfile):
+    logfile = os.path.abspath(logfile)
+    if logfile not in _file_handlers:
+        file_handler = _DelayedRotatingFileHandler(logfile)
+        file_handler.setFormatter(logging.Formatter(FILE_LOG_FORMAT))
+        _file_handlers[logfile] = file_handler
+    return _file_handlers[logfile]
+
+
+# The fields of events, as listed by the manager, which the text events
+# logger needs
+TEXT_EVENT_FIELDS = [
+    'deployment_id',
+    'execution_id',
+    'workflow_id',
+    'node_name',
+    'node_instance_id',
+    'operation',
+    'error_causes',
+    'message',
+    'timestamp',
+    'reported_timestamp',
+    'type',
+    'event_type',
+    'level',
+    'logger',
+]
+
+
+def get_event_fields(json_output):
+    """Return the fields of events which the events logger needs, or None
+    if it needs all of them.
+    """
+    return None if json_output else TEXT_EVENT_FIELDS
 
 
 def get_events_logger(json_output):
+    """Return a handler which prints batches of events.
+
+    Every batch is rendered into a single buffer, which is written once
+    to the console (rather than once per event), and flushed at the end
+    of the batch. While a large batch is rendered, the rendered events
+    are written every EVENTS_FLUSH_INTERVAL seconds, so that they show up
+    without waiting for the whole batch.
+    """
 
     def json_events_logger(events):
         """The json events logger prints events as consumable JSON formatted
@@ -168,33 +237,127 @@ def get_events_logger(json_output):
         """
         # TODO: Why we're writing directly to stdout here
         # but use the logger when the --json-output flag isn't passed.
-        for event in events:
-            sys.stdout.write('{}\n'.format(json.dumps(event)))
+        for lines in _render_events(
+                events, lambda event: json.dumps(to_dict(event))):
+            sys.stdout.write(''.join('{0}\n'.format(line) for line in lines))
             sys.stdout.flush()
 
     def text_events_logger(events):
         """The default events logger prints events as short messages.
 
+        Every event is logged as a record of its own (so that every line
+        of the log file has its time and level), but the console handler
+        writes all of the messages rendered at once in one go.
+
         :param events: The events to print.
         :return:
         """
-        for event in events:
-            output = logs.create_event_message_prefix(event)
-            if output:
-                _lgr.info(output)
+        for lines in _render_events(events, logs.create_event_message_prefix):
+            with _buffered_console():
+                for line in lines:
+                    _lgr.info(line)
 
     return json_events_logger if json_output else text_events_logger
 
 
+@contextmanager
+def _buffered_console():
+    """Buffer what the console handler writes, and write all of it to the
+    console at once on exit.
+
+    The handler is locked meanwhile, so that records logged from other
+    threads don't end up in the buffer.
+    """
+    handler = _get_console_handler()
+    handler.acquire()
+    try:
+        stream = handler.stream
+        handler.stream = _ConsoleBuffer(stream)
+        try:
+            yield
+        finally:
+            output = handler.stream.getvalue()
+            handler.stream = stream
+        if output:
+            stream.write(output)
+            stream.flush()
+    finally:
+        handler.release()
+
+
+class _ConsoleBuffer(object):
+    """Buffers what's written to a stream, encoded the way the stream
+    would encode it.
+
+    As with the stream itself, `logging.StreamHandler` falls back to
+    writing UTF-8 when a message can't be encoded with the stream's
+    encoding. Streams which have no encoding (e.g. stdout which is piped)
+    are written UTF-8 as well.
+    """
+
+    def __init__(self, stream):
+        self.encoding = getattr(stream, 'encoding', None)
+        self._chunks = []
+
+    def write(self, text):
+        if isinstance(text, unicode):
+            text = text.encode(self.encoding or 'utf-8')
+        self._chunks.append(text)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        return ''.join(self._chunks)
+
+
+def _render_events(events, render):
+    """Render events to lines of output.
+
+    :param render: Renders an event to a line, or to None to skip it
+    :return: Lists of lines to write at once
+    """
+    lines = []
+    last_write = time.time()
+    for event in events:
+        line = render(event)
+        if line:
+            lines.append(line)
+        if lines and time.time() - last_write >= EVENTS_FLUSH_INTERVAL:
+            yield lines
+            lines = []
+            last_write = time.time()
+    if lines:
+        yield lines
+
+
 def set_global_verbosity_level(verbose):
     """Set the global verbosity level.
     """
     global verbosity_level
     verbosity_level = verbose
     logs.EVENT_VERBOSITY_LEVEL = verbosity_level
-    if verbosity_level >= HIGH_VERBOSE:
-        for logger_name in all_loggers():
-            logging.getLogger(logger_name).setLevel(logging.DEBUG)
+    _apply_verbosity()
+
+
+def _apply_verbosity():
+    """Set the level of every configured logger according to the global
+    verbosity level, without reconfiguring the loggers.
+    """
+    for logger_name in all_loggers():
+        if verbosity_level >= HIGH_VERBOSE:
+            level = logging.DEBUG
+        else:
+            level = _logger_levels.get(logger_name, logging.INFO)
+        logging.getLogger(logger_name).setLevel(level)
+
+
+def set_console_quiet(quiet):
+    """Only write warnings and errors to the console if `quiet`, e.g.
+    while data is printed to it in a machine-readable format.
+    """
+    _get_console_handler().setLevel(
+        logging.WARNING if quiet else logging.NOTSET)
 
 
 def get_global_verbosity():
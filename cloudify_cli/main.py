@@ -15,41 +15,138 @@
 ############
 
 
+import importlib
+import functools
+
+from . import startup_trace  # NOQA (must be imported first)
 from . import env
 from . import logger
 from .cli import cfy
-from .commands import dev
-from .commands import ssh
-from .commands import init
-from .commands import logs
-from .commands import ldap
-from .commands import users
-from .commands import nodes
-from .commands import agents
-from .commands import events
-from .commands import groups
-from .commands import status
-from .commands import cluster
-from .commands import install
-from .commands import plugins
-from .commands import tenants
-from .commands import secrets
-from .commands import teardown
-from .commands import profiles
-from .commands import rollback
-from .commands import bootstrap
-from .commands import snapshots
-from .commands import uninstall
-from .commands import workflows
-from .commands import blueprints
-from .commands import executions
-from .commands import user_groups
-from .commands import deployments
-from .commands import node_instances
-from .commands import maintenance_mode
-
-
-@cfy.group(name='cfy')
+
+
+# Top level commands which are the same in manager and local context,
+# mapped to (module, command attribute, short help).
+# Command modules are only imported when their command is dispatched, so
+# `cfy --version` or a shell completion does not pay for importing the
+# whole command tree.
+_COMMANDS = {
+    # Manager agnostic commands
+    'init': ('init', 'init', 'Initialize a working env'),
+    'status': ('status', 'status', 'Show manager status [manager only]'),
+    'profiles': ('profiles', 'profiles',
+                 'Handle Cloudify CLI profiles Each profile can...'),
+    'bootstrap': ('bootstrap', 'bootstrap', 'Bootstrap a manager'),
+
+    # Manager only commands
+    'dev': ('dev', 'dev', 'Run fabric tasks [manager only]'),
+    'ssh': ('ssh', 'ssh', 'Connect using SSH [manager only]'),
+    'logs': ('logs', 'logs', 'Handle manager service logs'),
+    'ldap': ('ldap', 'ldap', 'Set LDAP authenticator.'),
+    'users': ('users', 'users', 'Handle Cloudify users'),
+    'agents': ('agents', 'agents', "Handle a deployment's agents"),
+    'events': ('events', 'events', 'Show events from workflow executions'),
+    'cluster': ('cluster', 'cluster', 'Handle the Cloudify Manager cluster'),
+    'plugins': ('plugins', 'plugins', 'Handle plugins on the manager'),
+    'tenants': ('tenants', 'tenants',
+                'Handle Cloudify tenants (Premium feature)'),
+    'teardown': ('teardown', 'teardown', 'Teardown a manager [manager only]'),
+    'rollback': ('rollback', 'rollback',
+                 'Rollback a manager to a previous version'),
+    'snapshots': ('snapshots', 'snapshots', 'Handle manager snapshots'),
+    'user-groups': ('user_groups', 'user_groups',
+                    'Handle Cloudify user groups (Premium feature)'),
+    'maintenance-mode': ('maintenance_mode', 'maintenance_mode',
+                         "Handle the manager's maintenance-mode"),
+    'secrets': ('secrets', 'secrets',
+                'Handle Cloudify secrets (key-value pairs)'),
+    'nodes': ('nodes', 'nodes', "Handle a deployment's nodes"),
+    'groups': ('groups', 'groups', 'Handle deployment groups'),
+    'workflows': ('workflows', 'workflows', 'Handle deployment workflows'),
+    'blueprints': ('blueprints', 'blueprints',
+                   'Handle blueprints on the manager'),
+    'executions': ('executions', 'executions', 'Handle workflow executions'),
+    'deployments': ('deployments', 'deployments',
+                    'Handle deployments on the Manager'),
+}
+
+# Commands which should be both in manager and local context, but change
+# depending on the context, mapped to
+# (module, manager command attribute, local command attribute,
+#  manager short help, local short help).
+_CONTEXT_COMMANDS = {
+    'install': ('install', 'manager', 'local',
+                'Install an application blueprint [manager only]',
+                'Install an application blueprint [locally]'),
+    'uninstall': ('uninstall', 'manager', 'local',
+                  'Uninstall an application blueprint [manager only]',
+                  'Uninstall an application blueprint'),
+    'node-instances': ('node_instances', 'manager', 'local',
+                       "Handle a deployment's node-instances",
+                       'Show node-instance information [locally]'),
+}
+
+# Subcommands added to a group once its module is imported, mapped to
+# (common commands, manager only commands, local only commands).
+_SUBCOMMANDS = {
+    'deployments': (
+        ['manager_create', 'manager_delete', 'manager_update',
+         'manager_list'],
+        ['manager_inputs', 'manager_outputs'],
+        ['local_inputs', 'local_outputs']),
+    'executions': (
+        ['manager_cancel', 'manager_list', 'manager_get'],
+        ['manager_start', 'manager_profile'],
+        ['local_start']),
+}
+
+
+def _import_command_module(module_name):
+    return importlib.import_module(
+        '.commands.{0}'.format(module_name), __package__)
+
+
+def _load_command(name):
+    """Import the module of the command `name` and return the command.
+
+    The manager/local variant of a command (and of its subcommands)
+    is chosen according to whether a manager is currently active.
+    """
+    with startup_trace.phase('load command {0}'.format(name)):
+        return _import_command(name)
+
+
+def _import_command(name):
+    if name in _CONTEXT_COMMANDS:
+        module_name, manager_attr, local_attr = _CONTEXT_COMMANDS[name][:3]
+        attr = manager_attr if env.is_manager_active() else local_attr
+    else:
+        module_name, attr, _ = _COMMANDS[name]
+    module = _import_command_module(module_name)
+    command = getattr(module, attr)
+
+    if module_name in _SUBCOMMANDS:
+        common, manager_only, local_only = _SUBCOMMANDS[module_name]
+        context_only = manager_only if env.is_manager_active() else local_only
+        for subcommand in common + context_only:
+            command.add_command(getattr(module, subcommand))
+    return command
+
+
+def _get_context_short_help(name):
+    manager_short_help, local_short_help = _CONTEXT_COMMANDS[name][3:]
+    return manager_short_help if env.is_manager_active() \
+        else local_short_help
+
+
+_LAZY_COMMANDS = dict(
+    [(name, short_help) for name, (_, _, short_help) in _COMMANDS.items()] +
+    [(name, functools.partial(_get_context_short_help, name))
+     for name in _CONTEXT_COMMANDS])
+
+
+@cfy.lazy_group(name='cfy',
+                lazy_commands=_LAZY_COMMANDS,
+                command_loader=_load_command)
 @cfy.options.verbose(expose_value=True)
 @cfy.options.version
 def _cfy(verbose):
@@ -69,77 +166,20 @@ def _cfy(verbose):
 
 
 def _register_commands():
-    """Register the CLI's commands.
+    """Register all of the CLI's commands eagerly.
 
-    Here is where we decide which commands register with the cli
-    and which don't. We should decide that according to whether
-    a manager is currently `use`d or not.
+    `cfy` itself loads its commands lazily (see `_load_command`), so this
+    is only needed when the whole command tree should be imported up front
+    (e.g. in tests). The manager or local variant of each command is
+    registered according to whether a manager is currently `use`d or not.
     """
-    # Manager agnostic commands
-    _cfy.add_command(init.init)
-    _cfy.add_command(status.status)
-    _cfy.add_command(profiles.profiles)
-    _cfy.add_command(bootstrap.bootstrap)
-
-    # Manager only commands
-    _cfy.add_command(dev.dev)
-    _cfy.add_command(ssh.ssh)
-    _cfy.add_command(logs.logs)
-    _cfy.add_command(ldap.ldap)
-    _cfy.add_command(users.users)
-    _cfy.add_command(agents.agents)
-    _cfy.add_command(events.events)
-    _cfy.add_command(cluster.cluster)
-    _cfy.add_command(plugins.plugins)
-    _cfy.add_command(tenants.tenants)
-    _cfy.add_command(teardown.teardown)
-    _cfy.add_command(rollback.rollback)
-    _cfy.add_command(snapshots.snapshots)
-    _cfy.add_command(user_groups.user_groups)
-    _cfy.add_command(maintenance_mode.maintenance_mode)
-    _cfy.add_command(secrets.secrets)
-
-    _cfy.add_command(nodes.nodes)
-    _cfy.add_command(groups.groups)
-
-    _cfy.add_command(workflows.workflows)
-    _cfy.add_command(blueprints.blueprints)
-    _cfy.add_command(executions.executions)
-    _cfy.add_command(deployments.deployments)
-
-    deployments.deployments.add_command(deployments.manager_create)
-    deployments.deployments.add_command(deployments.manager_delete)
-    deployments.deployments.add_command(deployments.manager_update)
-    deployments.deployments.add_command(deployments.manager_list)
-
-    executions.executions.add_command(executions.manager_cancel)
-    executions.executions.add_command(executions.manager_list)
-    executions.executions.add_command(executions.manager_get)
-
-    # Commands which should be both in manager and local context
-    # But change depending on the context.
-    if env.is_manager_active():
-        _cfy.add_command(install.manager)
-        _cfy.add_command(uninstall.manager)
-        _cfy.add_command(node_instances.manager)
-
-        deployments.deployments.add_command(deployments.manager_inputs)
-        deployments.deployments.add_command(deployments.manager_outputs)
-
-        executions.executions.add_command(executions.manager_start)
-    else:
-        _cfy.add_command(install.local)
-        _cfy.add_command(uninstall.local)
-        _cfy.add_command(node_instances.local)
-
-        deployments.deployments.add_command(deployments.local_inputs)
-        deployments.deployments.add_command(deployments.local_outputs)
-
-        executions.executions.add_command(executions.local_start)
+    with startup_trace.phase('register commands'):
+        for name in _LAZY_COMMANDS:
+            _cfy.add_command(_load_command(name))
 
 
-_register_commands()
-logger.configure_loggers()
+with startup_trace.phase('configure loggers'):
+    logger.configure_loggers()
 
 
 if __name__ == '__main__':
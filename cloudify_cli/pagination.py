@@ -0,0 +1,156 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""Listing resources on the manager a page at a time.
+
+A list request of the REST client returns a single page of items, of up
+to `_size` items from `_offset` on. `Pagination.list` walks the pages of
+a list request, and returns an iterator over their items, so that only a
+page or two of them are ever kept, however many there are.
+"""
+
+import sys
+import threading
+
+from .constants import DEFAULT_PAGE_SIZE
+
+
+class Pagination(object):
+    """How many items to list, and how many of them to fetch at a time.
+
+    :param page_size: The most items to fetch per request
+    :param limit: The most items to list, or None to list all of them
+    :param prefetch: Whether to fetch the next page in a background
+                     thread while the items of the current one are read
+    """
+
+    def __init__(self, page_size=DEFAULT_PAGE_SIZE, limit=None,
+                 prefetch=True):
+        self.page_size = page_size
+        self.limit = limit
+        self.prefetch = prefetch
+
+    def list(self, list_method, filters=None, **kwargs):
+        """Return an iterator over the items a list method of the REST
+        client lists, e.g. `client.blueprints.list`.
+
+        The first page is fetched before returning, so that errors of
+        the request (e.g. of a resource which doesn't exist) are raised
+        here, rather than while the items are read.
+
+        :param filters: More query parameters (e.g. from `--filter`),
+                        which are passed unless `kwargs` sets them to
+                        anything but None
+        :param kwargs: The arguments of the list method, other than
+                       `_offset` and `_size`
+        """
+        for key, value in (filters or {}).iteritems():
+            if kwargs.get(key) is None:
+                kwargs[key] = value
+        return PagedList(list_method,
+                         kwargs,
+                         page_size=self.page_size,
+                         limit=self.limit,
+                         prefetch=self.prefetch)
+
+
+class PagedList(object):
+    """An iterator over the items of the pages of a list request, see
+    `Pagination`.
+    """
+
+    def __init__(self, list_method, kwargs, page_size=DEFAULT_PAGE_SIZE,
+                 limit=None, prefetch=True):
+        self._list_method = list_method
+        self._kwargs = kwargs
+        self._page_size = page_size
+        self._limit = limit
+        self._prefetch = prefetch
+        self._items = self._iter_items(self._fetch_page(0))
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        return next(self._items)
+
+    def _get_size(self, offset):
+        if self._limit is None:
+            return self._page_size
+        return min(self._page_size, self._limit - offset)
+
+    def _fetch_page(self, offset):
+        return self._list_method(_offset=offset,
+                                 _size=self._get_size(offset),
+                                 **self._kwargs)
+
+    def _iter_items(self, page):
+        offset = 0
+        while True:
+            size = self._get_size(offset)
+            offset += len(page)
+            has_more = self._has_more(page, size, offset)
+            next_page = None
+            if has_more and self._prefetch:
+                next_page = _BackgroundCall(self._fetch_page, offset)
+            for item in page:
+                yield item
+            if not has_more:
+                return
+            page = next_page.get() if next_page \
+                else self._fetch_page(offset)
+
+    def _has_more(self, page, size, offset):
+        if not page or (self._limit is not None and offset >= self._limit):
+            return False
+        total = _get_total(page)
+        if total is not None:
+            return offset < total
+        # The manager didn't say how many items there are, but a page
+        # which isn't full is the last one
+        return len(page) >= size
+
+
+class _BackgroundCall(object):
+    """A call of a function in a background thread, whose result (or
+    exception) `get` waits for.
+    """
+
+    def __init__(self, func, *args):
+        self._result = None
+        self._exc_info = None
+        self._thread = threading.Thread(target=self._run, args=(func, args))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self, func, args):
+        try:
+            self._result = func(*args)
+        except BaseException:
+            self._exc_info = sys.exc_info()
+
+    def get(self):
+        self._thread.join()
+        if self._exc_info is not None:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+        return self._result
+
+
+def _get_total(page):
+    try:
+        return page.metadata.pagination.total
+    except AttributeError:
+        return None
@@ -0,0 +1,81 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+import time
+import random
+
+INITIAL_INTERVAL = 0.25
+MAX_INTERVAL = 10
+BACKOFF_FACTOR = 1.5
+JITTER = 0.1
+
+
+class Poller(object):
+    """Schedules the polls of a loop waiting on the manager.
+
+    The first poll is made right away, and `wait` is called after every
+    poll. It sleeps for the current interval, which starts at
+    `initial_interval` and grows by `backoff_factor` after every poll
+    which saw no activity, up to `max_interval`. A poll which saw activity
+    (e.g. new events, or a status change) resets the interval, so short
+    waits end quickly, and long idle ones don't flood the manager.
+
+    Every interval is randomly stretched or shrunk by up to `jitter` of it,
+    and `wait` never sleeps past the deadline.
+
+    :param timeout: Seconds until the deadline, or None to wait forever
+    """
+
+    def __init__(self,
+                 timeout=None,
+                 initial_interval=INITIAL_INTERVAL,
+                 max_interval=MAX_INTERVAL,
+                 backoff_factor=BACKOFF_FACTOR,
+                 jitter=JITTER):
+        self._deadline = None if timeout is None else time.time() + timeout
+        self._initial_interval = initial_interval
+        self._max_interval = max_interval
+        self._backoff_factor = backoff_factor
+        self._jitter = jitter
+        self._interval = initial_interval
+
+    @property
+    def timed_out(self):
+        return self._deadline is not None and time.time() >= self._deadline
+
+    @property
+    def remaining(self):
+        """Seconds left until the deadline, or None if there is none.
+        """
+        if self._deadline is None:
+            return None
+        return max(self._deadline - time.time(), 0)
+
+    def wait(self, activity=False):
+        """Sleep until the next poll.
+
+        :param activity: Whether the last poll saw any activity
+        """
+        if activity:
+            self._interval = self._initial_interval
+        interval = self._interval * random.uniform(1 - self._jitter,
+                                                   1 + self._jitter)
+        remaining = self.remaining
+        if remaining is not None:
+            interval = min(interval, remaining)
+        time.sleep(interval)
+        self._interval = min(self._interval * self._backoff_factor,
+                             self._max_interval)
@@ -0,0 +1,162 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""Startup instrumentation for the CLI.
+
+Set the `CFY_TRACE_STARTUP` environment variable to record the wall time
+of every module import and of the CLI's own startup phases (logging
+configuration, profile loading, command loading and click dispatch).
+
+When cfy exits, a report of the slowest records is printed to stderr.
+If the variable is set to a path ending with `.json`, the full trace is
+written to that file as JSON instead.
+
+This module only uses the standard library, as it is imported before
+anything else in `cloudify_cli.main` so that it can time those imports.
+"""
+
+import os
+import imp
+import sys
+import json
+import time
+import atexit
+from contextlib import contextmanager
+
+from .constants import CFY_TRACE_STARTUP_ENV
+
+REPORT_SIZE = 40
+
+_start_time = None
+
+# Finished records, as dicts with the record's type (import or phase), its
+# name, its cumulative duration and its duration excluding nested records.
+_records = []
+
+# The durations of the nested records of every record currently in progress
+_nested_durations = []
+
+
+def is_enabled():
+    return _start_time is not None
+
+
+def install():
+    """Start tracing if `CFY_TRACE_STARTUP` is set.
+    """
+    global _start_time
+    destination = os.environ.get(CFY_TRACE_STARTUP_ENV)
+    if not destination or is_enabled():
+        return
+    _start_time = time.time()
+    sys.meta_path.insert(0, _ImportTimer())
+    atexit.register(report, destination)
+
+
+@contextmanager
+def phase(name):
+    """Record the wall time of the wrapped block as a phase named `name`.
+    """
+    if not is_enabled():
+        yield
+        return
+    with _record('phase', name):
+        yield
+
+
+@contextmanager
+def _record(record_type, name):
+    _nested_durations.append(0.0)
+    start = time.time()
+    try:
+        yield
+    finally:
+        duration = time.time() - start
+        nested_duration = _nested_durations.pop()
+        if _nested_durations:
+            _nested_durations[-1] += duration
+        _records.append({
+            'type': record_type,
+            'name': name,
+            'duration_ms': duration * 1000,
+            'self_ms': (duration - nested_duration) * 1000
+        })
+
+
+def report(destination):
+    """Print the slowest records to stderr, or write all of them as JSON
+    if `destination` is a path to a .json file.
+    """
+    total_ms = (time.time() - _start_time) * 1000
+    records = sorted(
+        _records, key=lambda record: record['duration_ms'], reverse=True)
+
+    if destination.endswith('.json'):
+        with open(destination, 'w') as f:
+            json.dump({'total_ms': total_ms, 'records': records}, f, indent=2)
+        return
+
+    lines = [
+        'Startup trace: {0:.1f}ms in total'.format(total_ms),
+        '{0:<8}{1:>12}{2:>12}  {3}'.format(
+            'type', 'total(ms)', 'self(ms)', 'name')
+    ]
+    for record in records[:REPORT_SIZE]:
+        lines.append('{0:<8}{1:>12.1f}{2:>12.1f}  {3}'.format(
+            record['type'],
+            record['duration_ms'],
+            record['self_ms'],
+            record['name']))
+    sys.stderr.write('\n'.join(lines) + '\n')
+
+
+class _ImportTimer(object):
+    """A `sys.meta_path` finder that times the loading of every module
+    found by the standard file system importer.
+
+    Modules it can't find (e.g. ones inside zipped eggs) are left to the
+    regular import machinery, and are not timed.
+    """
+
+    def find_module(self, fullname, path=None):
+        try:
+            module_info = imp.find_module(fullname.rpartition('.')[2], path)
+        except ImportError:
+            return None
+        return _TimedLoader(module_info)
+
+
+class _TimedLoader(object):
+
+    def __init__(self, module_info):
+        self._module_info = module_info
+
+    def load_module(self, fullname):
+        if fullname in sys.modules:
+            return sys.modules[fullname]
+        module_file, pathname, description = self._module_info
+        try:
+            with _record('import', fullname):
+                return imp.load_module(
+                    fullname, module_file, pathname, description)
+        finally:
+            if module_file:
+                module_file.close()
+
+
+# Installed on import, so that it is in place before `cloudify_cli.main`
+# imports anything else
+install()
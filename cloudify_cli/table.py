@@ -15,16 +15,90 @@
 ############
 
 import os
+import sys
+import csv
+import json
 from datetime import datetime
+from itertools import chain, islice
+from collections import OrderedDict
 
-from .logger import get_logger
+from . import yaml_io
+from .logger import get_logger, set_console_quiet
+from .constants import (TABLE_FORMAT, JSON_FORMAT, NDJSON_FORMAT, CSV_FORMAT,
+                        YAML_FORMAT)
 
 from prettytable import PrettyTable
 
 from cloudify_rest_client.responses import ListResponse
 
+# Tables of more rows than this are printed by a StreamingTable
+STREAMING_ROWS_THRESHOLD = 1000
 
-def generate(cols, data, defaults=None):
+# The number of rows a StreamingTable sizes its columns by, and writes at
+# once
+STREAMING_SAMPLE_SIZE = 100
+
+# The widest a column of a StreamingTable gets, unless `max_width` is
+# passed. Longer values are cut short
+STREAMING_MAX_WIDTH = 60
+
+# The format `print_data` and `print_details` print in, one of
+# `constants.OUTPUT_FORMATS`
+output_format = TABLE_FORMAT
+
+
+def format_text(value):
+    # Empty values (None, [], {}) are shown as empty cells, but False
+    # isn't
+    if not value and not isinstance(value, bool):
+        return ''
+    return value
+
+
+def format_timestamp(value):
+    if not isinstance(value, basestring):
+        return format_text(value)
+    return value.replace('T', ' ').replace('Z', ' ')
+
+
+def format_list(value):
+    if not isinstance(value, (list, tuple)):
+        return format_text(value)
+    return ','.join(value)
+
+
+def truncated(limit):
+    """Return a formatter of text which cuts values of `limit` characters
+    or more short.
+    """
+    def format_truncated(value):
+        value = format_text(value)
+        if isinstance(value, basestring) and len(value) >= limit:
+            return '{0}..'.format(value[:limit - 2])
+        return value
+    return format_truncated
+
+
+def _format_any(value):
+    # The format of columns whose types weren't declared. Strings are
+    # checked for being timestamps one by one, which is slow for large
+    # tables
+    if value and isinstance(value, basestring):
+        return get_timestamp(value) or value
+    if value and isinstance(value, list):
+        return format_list(value)
+    return format_text(value)
+
+
+# The types of columns, as the values of the `column_types` passed to
+# `generate` and `print_data`
+TEXT = format_text
+TIMESTAMP = format_timestamp
+LIST = format_list
+BOOL = format_text
+
+
+def generate(cols, data, defaults=None, column_types=None):
     """
     Return a new PrettyTable instance representing the list.
 
@@ -46,54 +120,205 @@ def generate(cols, data, defaults=None):
                    for example: {'deploymentId':'123'} will set the
                    deploymentId value for all rows to '123'.
 
+        column_types - A dictionary specifying the types (TIMESTAMP,
+                       LIST, BOOL, TEXT, or a function formatting the
+                       values) of columns. Columns which aren't in it
+                       are TEXT. If it isn't passed, the type of every
+                       value is guessed.
+
+                       for example: {'created_at': TIMESTAMP}
+
     """
     defaults = defaults or {}
-
-    def get_values_per_column(column, row_data):
-        if column in row_data:
-            if row_data[column] and isinstance(row_data[column], basestring):
-                row_data[column] = get_timestamp(row_data[column]) \
-                                   or row_data[column]
-            elif row_data[column] and isinstance(row_data[column], list):
-                row_data[column] = ','.join(row_data[column])
-            elif isinstance(row_data[column], bool):
-                pass  # Taking care of False (otherwise would be changed to '')
-            elif not row_data[column]:
-                # if it's empty list, don't print []
-                row_data[column] = ''
-            return row_data[column]
-        else:
-            return defaults.get(column)
+    formatters = _get_formatters(cols, column_types)
 
     pt = PrettyTable([col for col in cols])
 
     for d in data:
-        values_row = []
-        for c in cols:
-            values_row.append(get_values_per_column(c, d))
-        pt.add_row(values_row)
+        pt.add_row(_get_values(cols, formatters, d, defaults))
 
     return pt
 
 
+def _get_formatters(cols, column_types):
+    if column_types is None:
+        return [_format_any] * len(cols)
+    return [column_types.get(col, TEXT) for col in cols]
+
+
+def _get_values(cols, formatters, row_data, defaults):
+    # The row's values are formatted as they're read, so the row itself
+    # (often a REST response) isn't modified
+    values = []
+    for col, format_value in zip(cols, formatters):
+        if col in row_data:
+            values.append(format_value(row_data[col]))
+        else:
+            values.append(defaults.get(col))
+    return values
+
+
+class StreamingTable(object):
+    """A table which is written while its rows are read, in the format of
+    a PrettyTable.
+
+    The widths of the columns are set by the first `sample_size` rows
+    (and the headers), up to `max_width`. Values of later rows which don't
+    fit are cut short, rather than widening the columns. Rows are written
+    `sample_size` at a time, so neither all of the rows nor the whole
+    table are ever kept.
+    """
+
+    def __init__(self,
+                 cols,
+                 defaults=None,
+                 max_width=STREAMING_MAX_WIDTH,
+                 sample_size=STREAMING_SAMPLE_SIZE,
+                 column_types=None):
+        self._cols = cols
+        self._defaults = defaults or {}
+        self._formatters = _get_formatters(cols, column_types)
+        self._max_width = max_width
+        self._sample_size = sample_size
+
+    def lines(self, data):
+        """Return the lines of the table, in lists of up to `sample_size`
+        lines, as the rows of `data` are read.
+        """
+        rows = (self._get_row(row_data) for row_data in data)
+        sample = list(islice(rows, self._sample_size))
+        widths = [min(max([len(col)] + [len(row[i]) for row in sample]),
+                      self._max_width)
+                  for i, col in enumerate(self._cols)]
+        border = '+{0}+'.format('+'.join('-' * (width + 2)
+                                         for width in widths))
+        lines = [border, self._format_row(self._cols, widths), border]
+        for row in chain(sample, rows):
+            lines.append(self._format_row(row, widths))
+            if len(lines) >= self._sample_size:
+                yield lines
+                lines = []
+        lines.append(border)
+        yield lines
+
+    def _get_row(self, row_data):
+        return [_to_text(value) for value in _get_values(
+            self._cols, self._formatters, row_data, self._defaults)]
+
+    def _format_row(self, values, widths):
+        return '|{0}|'.format('|'.join(
+            ' {0} '.format(_center(_truncate(value, width), width))
+            for value, width in zip(values, widths)))
+
+
+def _to_text(value):
+    if isinstance(value, unicode):
+        return value
+    if not isinstance(value, str):
+        value = str(value)
+    return value.decode('utf-8', 'replace')
+
+
+def _truncate(value, width):
+    # Multi-line values are shown on a single line
+    value = value.replace('\n', ' ')
+    if len(value) <= width:
+        return value
+    return value[:max(width - 2, 0)] + '..'
+
+
+def _center(value, width):
+    # Centered the way PrettyTable centers values
+    excess = width - len(value)
+    left = right = excess // 2
+    if excess % 2:
+        if len(value) % 2:
+            right += 1
+        else:
+            left += 1
+    return ' ' * left + value + ' ' * right
+
+
 def log(title, tb):
     logger = get_logger()
     logger.info('{0}{1}{0}{2}{0}'.format(os.linesep, title, tb))
 
 
-def print_data(columns, items, header_text, max_width=None, defaults=None):
+def print_data(columns,
+               items,
+               header_text,
+               max_width=None,
+               defaults=None,
+               column_types=None):
+    """Print items as a table, or in the global output format.
+
+    :param items: A list of items, a single item, or an iterator over
+                  items (e.g. a `pagination.PagedList`). Tables of more
+                  than STREAMING_ROWS_THRESHOLD items are printed by a
+                  `StreamingTable` as they are read
+    """
+    single = False
     if items is None:
         items = []
-    elif not isinstance(items, (list, ListResponse)):
+    elif not isinstance(items, (list, ListResponse)) and \
+            not hasattr(items, 'next'):
         items = [items]
+        single = True
+
+    if output_format != TABLE_FORMAT:
+        write_rows(columns, items, defaults, single)
+        return
 
-    pt = generate(columns, data=items, defaults=defaults)
+    if hasattr(items, 'next'):
+        # Only as many items as may be printed by a PrettyTable are read
+        # up front
+        first_items = list(islice(items, STREAMING_ROWS_THRESHOLD + 1))
+        if len(first_items) > STREAMING_ROWS_THRESHOLD:
+            items = chain(first_items, items)
+        else:
+            items = first_items
+
+    if hasattr(items, 'next') or len(items) > STREAMING_ROWS_THRESHOLD:
+        print_streaming(columns, items, header_text, max_width, defaults,
+                        column_types)
+        return
+
+    pt = generate(columns,
+                  data=items,
+                  defaults=defaults,
+                  column_types=column_types)
     if max_width:
         pt.max_width = max_width
     log(header_text, pt)
 
 
+def print_streaming(columns,
+                    items,
+                    header_text,
+                    max_width=None,
+                    defaults=None,
+                    column_types=None):
+    """Print items as a table while they are read, see `StreamingTable`.
+    """
+    logger = get_logger()
+    table = StreamingTable(columns,
+                           defaults=defaults,
+                           max_width=max_width or STREAMING_MAX_WIDTH,
+                           column_types=column_types)
+    first = True
+    for lines in table.lines(items):
+        if first:
+            lines[:0] = ['', header_text]
+            first = False
+        logger.info(os.linesep.join(lines))
+    logger.info('')
+
+
 def print_details(data, title):
+    if output_format != TABLE_FORMAT:
+        write_rows(data.keys(), [data], single=True)
+        return
+
     logger = get_logger()
     logger.info(title)
 
@@ -104,6 +329,88 @@ def print_details(data, title):
         logger.info('{0} {1}'.format(field_name.ljust(15), field_value))
 
 
+def write_rows(columns, items, defaults=None, single=False):
+    """Write the columns of items to stdout in the global output format,
+    which isn't TABLE_FORMAT.
+
+    Values are written as they are, rather than formatted for a table,
+    and every item is written as soon as it's read.
+
+    :param single: Whether `items` is a single item, which is written as
+                   an object rather than as a list (in JSON and YAML)
+    """
+    defaults = defaults or {}
+    rows = (_get_row_dict(columns, row_data, defaults) for row_data in items)
+    write = sys.stdout.write
+
+    if output_format == CSV_FORMAT:
+        writer = csv.writer(sys.stdout, lineterminator='\n')
+        writer.writerow([_to_csv_value(col) for col in columns])
+        for row in rows:
+            writer.writerow([_to_csv_value(value) for value in row.values()])
+    elif output_format == NDJSON_FORMAT:
+        for row in rows:
+            write('{0}\n'.format(json.dumps(row)))
+    elif output_format == JSON_FORMAT:
+        if single:
+            row = next(rows)
+            write('{0}\n'.format(json.dumps(row,
+                                            indent=2,
+                                            separators=(',', ': '))))
+        else:
+            separator = '\n'
+            write('[')
+            for row in rows:
+                write('{0}{1}'.format(separator, json.dumps(row)))
+                separator = ',\n'
+            write('\n]\n')
+    elif output_format == YAML_FORMAT:
+        if single:
+            write(yaml_io.safe_dump(dict(next(rows)),
+                                    default_flow_style=False))
+        else:
+            written = False
+            for row in rows:
+                # A list of one item, so that the items written one after
+                # the other make up a list
+                write(yaml_io.safe_dump([dict(row)],
+                                        default_flow_style=False))
+                written = True
+            if not written:
+                write('[]\n')
+    sys.stdout.flush()
+
+
+def _get_row_dict(columns, row_data, defaults):
+    row = OrderedDict()
+    for col in columns:
+        row[col] = row_data[col] if col in row_data else defaults.get(col)
+    return row
+
+
+def _to_csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)) and \
+            all(isinstance(item, basestring) for item in value):
+        value = ','.join(value)
+    elif isinstance(value, (dict, list, tuple)):
+        value = json.dumps(value)
+    # The csv module writes bytes
+    return _to_text(value).encode('utf-8')
+
+
+def set_global_output_format(new_output_format):
+    """Set the global output format, one of `constants.OUTPUT_FORMATS`.
+
+    Informational messages aren't written to the console while printing
+    in another format than TABLE_FORMAT, so that only the data is.
+    """
+    global output_format
+    output_format = new_output_format or TABLE_FORMAT
+    set_console_quiet(output_format != TABLE_FORMAT)
+
+
 def get_timestamp(data):
     try:
         datetime.strptime(data[:10], '%Y-%m-%d')
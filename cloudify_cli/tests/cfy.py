@@ -26,6 +26,7 @@ from cloudify.utils import setup_logger
 
 from .. import main  # NOQA
 from .. import env
+from .. import table
 from .. import logger
 from .. import commands
 from .. import constants
@@ -57,6 +58,7 @@ def invoke(command, capture, context=None):
 
     logger.configure_loggers()
     logger.set_global_verbosity_level(verbose=logger.NO_VERBOSE)
+    table.set_global_output_format(constants.TABLE_FORMAT)
 
     cfy = clicktest.CliRunner()
 
@@ -160,3 +162,8 @@ def use_manager(**manager_params):
 def register_commands():
     from cloudify_cli.main import _register_commands
     _register_commands()
+
+
+# `cfy` loads its commands lazily, but tests invoke command objects
+# directly from their modules, so the whole tree is registered up front.
+register_commands()
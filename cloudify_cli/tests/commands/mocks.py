@@ -71,6 +71,27 @@ def mock_log_message_prefix(event):
     return event['event_name']
 
 
+def make_api_event(event_type='task_succeeded', seconds=0, **fields):
+    """Return an event as the events API lists it, `seconds` after
+    2017-05-01T10:00:00Z, with `fields` overriding the defaults.
+    """
+    event = {
+        'deployment_id': 'deployment_id',
+        'execution_id': 'execution_id',
+        'node_name': 'node_name',
+        'operation': 'operation',
+        'workflow_id': 'workflow_id',
+        'node_instance_id': 'node_instance_id',
+        'message': event_type,
+        'error_causes': None,
+        'type': 'cloudify_event',
+        'event_type': event_type,
+        'timestamp': '2017-05-01T10:00:{0:06.3f}Z'.format(seconds),
+    }
+    event.update(fields)
+    return event
+
+
 @operation
 def mock_op(param, custom_param=None, **kwargs):
     props = op_ctx.instance.runtime_properties
@@ -1,4 +1,5 @@
 import os
+import json
 import yaml
 import tempfile
 from mock import MagicMock, patch
@@ -28,31 +29,27 @@ class BlueprintsTest(CliCommandTest):
                           self.invoke,
                           'cfy blueprints list -a -t some_tenant')
 
-    @patch('cloudify_cli.table.generate')
-    def test_blueprints_list_with_values(self, table_generate_mock):
+    def test_blueprints_list_with_values(self):
+        blueprints = [
+            {'description': '12345678901234567890123'},
+            {'description': 'abcdefg'}
+        ]
+        self.client.blueprints.list = MagicMock(return_value=blueprints)
+        outcome = self.invoke('blueprints list')
+
+        self.assertIn(' 123456789012345678.. ', outcome.logs)
+        self.assertIn(' abcdefg ', outcome.logs)
+        # The listed blueprints aren't modified
+        self.assertEqual('12345678901234567890123',
+                         blueprints[0]['description'])
+
+    def test_blueprints_list_json(self):
         self.client.blueprints.list = MagicMock(
-            return_value=[
-                {'description': '12345678901234567890123'},
-                {'description': 'abcdefg'}
-            ]
-        )
-        self.invoke('blueprints list')
-
-        table_generate_mock.assert_called_with(
-            [
-                'id',
-                'description',
-                'main_file_name',
-                'created_at',
-                'updated_at',
-                'permission',
-                'tenant_name',
-                'created_by'
-            ],
-            data=[{'description': '123456789012345678..'},
-                  {'description': 'abcdefg'}],
-            defaults=None
-        )
+            return_value=[{'id': 'a', 'description': 'abcdefg'}])
+        outcome = self.invoke('blueprints list --format json')
+        blueprints = json.loads(outcome.output)
+        self.assertEqual(['a'], [b['id'] for b in blueprints])
+        self.assertEqual('abcdefg', blueprints[0]['description'])
 
     def test_blueprints_delete(self):
         self.client.blueprints.delete = MagicMock()
@@ -27,7 +27,6 @@ from .test_base import CliCommandTest
 from ...exceptions import CloudifyCliError
 from ...commands.cluster import (_wait_for_cluster_initialized,
                                  pass_cluster_client)
-from ...execution_events_fetcher import WAIT_FOR_EXECUTION_SLEEP_INTERVAL
 
 
 class WaitForClusterTest(unittest.TestCase):
@@ -42,7 +41,7 @@ class WaitForClusterTest(unittest.TestCase):
             side_effect=[ClusterState({'initialized': False})] * 4 +
                         [ClusterState({'initialized': True})])
 
-        with mock.patch('cloudify_cli.commands.cluster.time') as mock_time:
+        with mock.patch('cloudify_cli.polling.time') as mock_time:
             mock_time.time.return_value = 0
             status = _wait_for_cluster_initialized(client)
         self.assertEqual(5, len(client.cluster.status.mock_calls))
@@ -62,7 +61,7 @@ class WaitForClusterTest(unittest.TestCase):
         def _mock_time():
             return clock['time']
 
-        with mock.patch('cloudify_cli.commands.cluster.time') as mock_time:
+        with mock.patch('cloudify_cli.polling.time') as mock_time:
             mock_time.sleep = mock.Mock(side_effect=_mock_sleep)
             mock_time.time = _mock_time
 
@@ -70,10 +69,9 @@ class WaitForClusterTest(unittest.TestCase):
                 _wait_for_cluster_initialized(client, timeout=timeout)
 
         self.assertIn('timed out', cm.exception.message.lower())
-        # there should be (timeout//interval) time.sleep(interval) calls,
-        # so the total time waited is equal to timeout
-        self.assertEqual(timeout // WAIT_FOR_EXECUTION_SLEEP_INTERVAL,
-                         len(mock_time.sleep.mock_calls))
+        # the polls back off, but the total time waited is equal to timeout
+        self.assertEqual(timeout, clock['time'] - 1000)
+        self.assertLess(len(mock_time.sleep.mock_calls), timeout // 3)
 
     def test_passes_log_cursor(self):
         # prepare mock status responses containing logs. The first status
@@ -100,7 +98,7 @@ class WaitForClusterTest(unittest.TestCase):
         client = mock.Mock()
         client.cluster.status = mock.Mock(side_effect=status_responses)
 
-        with mock.patch('cloudify_cli.commands.cluster.time') as mock_time:
+        with mock.patch('cloudify_cli.polling.time') as mock_time:
             mock_time.time.return_value = 1000
             _wait_for_cluster_initialized(client, logger=mock.Mock())
         self.assertEqual(4, len(client.cluster.status.mock_calls))
@@ -142,7 +140,7 @@ class ClusterStartTest(CliCommandTest):
             ClusterState({'initialized': True}),
         ])
         self.client.cluster.start = mock.Mock()
-        with mock.patch('cloudify_cli.commands.cluster.time') as mock_time:
+        with mock.patch('cloudify_cli.polling.time') as mock_time:
             mock_time.time.return_value = 1000
             outcome = self.invoke(
                 'cfy cluster start --cluster-host-ip 1.2.3.4')
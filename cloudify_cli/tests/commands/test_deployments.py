@@ -268,10 +268,48 @@ class DeploymentsTest(CliCommandTest):
             }
         ]
 
-        self.client.deployments.list = MagicMock(return_value=deps)
+        self.client.deployments.list = MagicMock(return_value=deps[:2])
         outcome = self.invoke('cfy deployments list -b b1_blueprint -v')
-        self.assertNotIn('b2_blueprint', outcome.logs)
         self.assertIn('b1_blueprint', outcome.logs)
+        # The deployments are filtered by the manager
+        self.assertEqual(
+            'b1_blueprint',
+            self.client.deployments.list.call_args[1]['blueprint_id'])
+
+    def test_deployments_list_filters(self):
+        self.client.deployments.list = MagicMock(return_value=[])
+        self.invoke('cfy deployments list --created-by admin '
+                    '--filter id=d1 --filter id=d2 --filter visibility=x')
+        query = self.client.deployments.list.call_args[1]
+        self.assertEqual('admin', query['created_by'])
+        self.assertEqual(['d1', 'd2'], query['id'])
+        self.assertEqual('x', query['visibility'])
+
+    def test_deployments_list_invalid_filter(self):
+        self.client.deployments.list = MagicMock(return_value=[])
+        self.invoke('cfy deployments list --filter id',
+                    err_str_segment='Filters are of the form key=value',
+                    exception=exceptions.CloudifyValidationError)
+        self.invoke('cfy deployments list --filter _size=1',
+                    err_str_segment="can't be filtered by",
+                    exception=exceptions.CloudifyValidationError)
+
+    def test_deployments_list_time_range(self):
+        deps = [{'id': 'd{0}'.format(day),
+                 'created_at': '2017-05-0{0}T10:00:00.000Z'.format(day)}
+                for day in range(1, 4)]
+        self.client.deployments.list = MagicMock(return_value=deps)
+        outcome = self.invoke('cfy deployments list --since 2017-05-02 '
+                              '--until 2017-05-02T23:00:00')
+        self.assertEqual(
+            'created_at,2017-05-02T00:00:00.000000,'
+            '2017-05-02T23:00:00.000000',
+            self.client.deployments.list.call_args[1]['_range'])
+        # Deployments out of the range are dropped, even if the manager
+        # returned them
+        self.assertIn(' d2 ', outcome.logs)
+        self.assertNotIn(' d1 ', outcome.logs)
+        self.assertNotIn(' d3 ', outcome.logs)
 
     def test_deployments_execute_nonexistent_operation(self):
         # Verifying that the CLI allows for arbitrary operation names,
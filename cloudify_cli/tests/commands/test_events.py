@@ -1,13 +1,20 @@
+import os
+import gzip
 import json
 import time
+import shutil
+import tempfile
 from StringIO import StringIO
 
-from mock import patch
+from mock import patch, MagicMock
 
 from .test_base import CliCommandTest
 from .mocks import MockListResponse, mock_log_message_prefix
+from ... import events_export
+from ...events_export import EventsExport
 
 from cloudify_rest_client import executions, deployments
+from cloudify_rest_client.exceptions import CloudifyClientError
 
 
 class EventsTest(CliCommandTest):
@@ -185,6 +192,11 @@ class EventsTest(CliCommandTest):
             return outcome.output
         return outcome.logs
 
+    def test_events_until_with_tail(self):
+        self.invoke('cfy events list -e execution-id --tail --until 1h',
+                    err_str_segment='--until cannot be used along with '
+                                    '--tail')
+
     def _patch_clients_for_deletion(self):
         self.client.deployments.get = self._mock_deployments_get
         self.client.events.delete = self._mock_events_delete
@@ -220,3 +232,109 @@ class EventsTest(CliCommandTest):
         outcome = self.invoke('cfy events delete deployment_id_0 --no-logs')
         self.assertEqual(outcome.logs.split('\n')[-1], 'No events to delete')
         self.assertEqual(len(self.events), 2)
+
+
+class EventsExportTest(CliCommandTest):
+
+    def setUp(self):
+        super(EventsExportTest, self).setUp()
+        self.use_manager()
+        self.events = {
+            'execution_1': self._generate_events('execution_1', 25),
+            'execution_2': self._generate_events('execution_2', 5)
+        }
+        self.fail_from_offset = None
+        self.client.events.list = self._mock_events_list
+        self.client.executions.get = MagicMock(
+            return_value=executions.Execution({'id': 'execution_1'}))
+        self.client.deployments.get = MagicMock()
+        self.client.executions.list = MagicMock(return_value=MockListResponse(
+            [executions.Execution({'id': 'execution_1'}),
+             executions.Execution({'id': 'execution_2'})], 2))
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.output_path = os.path.join(temp_dir, 'events.ndjson.gz')
+
+    def _generate_events(self, execution_id, count):
+        return [
+            {
+                'deployment_id': 'deployment_id',
+                'execution_id': execution_id,
+                'node_instance_id': '<node_instance_id>',
+                'node_name': '<node_name>',
+                'operation': '<operation>',
+                'workflow_id': '<workflow_id>',
+                'type': 'cloudify_event',
+                'message': 'event {0} of {1}'.format(index, execution_id),
+                'error_causes': None,
+            }
+            for index in range(count)
+        ]
+
+    def _mock_events_list(self, execution_id, _offset, _size, **kwargs):
+        if self.fail_from_offset is not None and \
+                _offset >= self.fail_from_offset:
+            raise CloudifyClientError('connection dropped')
+        events = self.events[execution_id]
+        return MockListResponse(
+            [dict(event) for event in events[_offset:_offset + _size]],
+            len(events))
+
+    def _read_messages(self):
+        with gzip.open(self.output_path) as f:
+            return [json.loads(line)['message']['text'] for line in f]
+
+    def _get_messages(self, *execution_ids):
+        return [event['message'] for execution_id in execution_ids
+                for event in self.events[execution_id]]
+
+    def test_export_execution(self):
+        outcome = self.invoke('cfy events export -e execution_1 -o {0}'
+                              .format(self.output_path))
+        self.assertIn('Exported 25 events', outcome.logs)
+        self.assertEqual(self._get_messages('execution_1'),
+                         self._read_messages())
+        self.assertFalse(os.path.exists(
+            self.output_path + events_export.CHECKPOINT_SUFFIX))
+
+    def test_export_deployment(self):
+        self.invoke('cfy events export -d deployment_id -o {0}'
+                    .format(self.output_path))
+        self.assertEqual(self._get_messages('execution_1', 'execution_2'),
+                         self._read_messages())
+
+    def test_export_requires_execution_or_deployment(self):
+        self.invoke('cfy events export -o {0}'.format(self.output_path),
+                    err_str_segment='Either an execution ID or a deployment')
+
+    @patch('cloudify_cli.events_export.EXPORT_BATCH_SIZE', 5)
+    def test_resume_interrupted_export(self):
+        self.fail_from_offset = 20
+        export = EventsExport(self.output_path,
+                              ['execution_1', 'execution_2'],
+                              checkpoint_interval=10)
+        self.assertRaises(CloudifyClientError, export.run, self.client)
+        self.assertTrue(os.path.exists(
+            self.output_path + events_export.CHECKPOINT_SUFFIX))
+        self.assertEqual(self._get_messages('execution_1')[:20],
+                         self._read_messages())
+
+        self.fail_from_offset = None
+        outcome = self.invoke('cfy events export -d deployment_id -o {0}'
+                              .format(self.output_path))
+        self.assertIn('Resuming the export', outcome.logs)
+        self.assertIn('Exported 30 events', outcome.logs)
+        self.assertEqual(self._get_messages('execution_1', 'execution_2'),
+                         self._read_messages())
+
+    def test_restart_export(self):
+        with open(self.output_path + events_export.CHECKPOINT_SUFFIX,
+                  'w') as f:
+            f.write('not a checkpoint')
+        self.invoke('cfy events export -e execution_1 -o {0}'
+                    .format(self.output_path),
+                    err_str_segment='corrupted')
+        self.invoke('cfy events export -e execution_1 -o {0} --restart'
+                    .format(self.output_path))
+        self.assertEqual(self._get_messages('execution_1'),
+                         self._read_messages())
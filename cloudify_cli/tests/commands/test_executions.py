@@ -1,9 +1,11 @@
 import os
+import shutil
+import tempfile
 
 from mock import MagicMock, patch
 
 from .. import cfy
-from .mocks import execution_mock
+from .mocks import execution_mock, MockListResponse
 from .constants import BLUEPRINTS_DIR, DEFAULT_BLUEPRINT_FILE_NAME
 from .test_base import CliCommandTest
 from ...commands import executions
@@ -28,10 +30,36 @@ class ExecutionsTest(CliCommandTest):
         self.invoke('cfy executions list -d deployment-id')
         self.invoke('cfy executions list -t dummy_tenant')
 
+    def test_executions_list_cancelling(self):
+        self.client.executions.list = MagicMock(return_value=[
+            execution_mock('terminated'),
+            execution_mock('cancelling')])
+        outcome = self.invoke('cfy executions list')
+        self.assertIn(executions._STATUS_CANCELING_MESSAGE, outcome.logs)
+        self.client.executions.list = MagicMock(return_value=[
+            execution_mock('terminated')])
+        outcome = self.invoke('cfy executions list')
+        self.assertNotIn(executions._STATUS_CANCELING_MESSAGE, outcome.logs)
+
     def test_executions_cancel(self):
         self.client.executions.cancel = MagicMock()
         self.invoke('cfy executions cancel e_id')
 
+    def test_executions_profile(self):
+        self.client.executions.get = MagicMock(
+            return_value=execution_mock('terminated'))
+        self.client.events.list = MagicMock(
+            return_value=MockListResponse([], 0))
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        trace_path = os.path.join(temp_dir, 'trace.json')
+        outcome = self.invoke('cfy executions profile e_id --trace-output '
+                              '{0}'.format(trace_path))
+        self.assertIn('Operations: 0', outcome.logs)
+        self.assertTrue(os.path.isfile(trace_path))
+        query = self.client.events.list.call_args[1]
+        self.assertIn('task_started', query['event_type'])
+
     @patch('cloudify_cli.commands.executions.get_events_logger')
     def test_executions_start_json(self, get_events_logger_mock):
         execution = execution_mock('started')
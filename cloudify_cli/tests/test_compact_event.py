@@ -0,0 +1,83 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+import json
+
+from mock import MagicMock
+
+from cloudify.event import Event
+from cloudify_rest_client.client import CloudifyClient
+
+from ..compact_event import CompactEvent, to_dict
+from ..execution_events_fetcher import ExecutionEventsFetcher
+from .commands.test_base import CliCommandTest
+from .commands.mocks import MockListResponse, make_api_event
+
+
+# The fields of a failed task's event, besides the defaults
+TASK_FAILED_FIELDS = {
+    'operation': 'cloudify.interfaces.lifecycle.create',
+    'workflow_id': 'install',
+    'node_instance_id': 'node_name_abc123',
+    'message': 'Task failed',
+    'error_causes': [{'message': 'error', 'traceback': 'traceback',
+                      'type': 'RuntimeError'}],
+}
+
+
+def _make_api_event():
+    return make_api_event('task_failed', **TASK_FAILED_FIELDS)
+
+
+class CompactEventTest(CliCommandTest):
+
+    def _map_to_dict(self, api_event):
+        client = CloudifyClient()
+        client.events.list = MagicMock(
+            return_value=MockListResponse([api_event], 1))
+        fetcher = ExecutionEventsFetcher(client,
+                                         'execution_id',
+                                         verify_execution=False,
+                                         compact_events=False)
+        return fetcher._fetch_events_batch()[0]
+
+    def test_same_as_dict(self):
+        api_event = _make_api_event()
+        event = CompactEvent(api_event)
+        expected = self._map_to_dict(_make_api_event())
+        self.assertEqual(expected, to_dict(event))
+        self.assertEqual(expected, event)
+        self.assertEqual('node_name_abc123', event['context']['node_id'])
+        self.assertEqual('Task failed', event['message']['text'])
+        self.assertIsNone(event['context'].get('source_id'))
+        self.assertNotIn('node_instance_id', event)
+        # The API event isn't modified
+        self.assertEqual(_make_api_event(), api_event)
+
+    def test_same_message(self):
+        self.assertEqual(
+            str(Event(self._map_to_dict(_make_api_event()))),
+            str(Event(CompactEvent(_make_api_event()))))
+
+    def test_json(self):
+        self.assertEqual(
+            json.loads(json.dumps(self._map_to_dict(_make_api_event()))),
+            json.loads(json.dumps(to_dict(CompactEvent(_make_api_event())))))
+
+    def test_no_instance_dict(self):
+        event = CompactEvent(_make_api_event())
+        for view in (event, event['context'], event['message']):
+            self.assertFalse(hasattr(view, '__dict__'))
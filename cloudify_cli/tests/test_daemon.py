@@ -0,0 +1,164 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+import os
+import json
+import time
+import Queue
+import socket
+import tempfile
+import threading
+from StringIO import StringIO
+
+from mock import patch
+from testtools import TestCase
+
+from .. import daemon
+
+
+class DaemonProtocolTest(TestCase):
+
+    def setUp(self):
+        super(DaemonProtocolTest, self).setUp()
+        self.client, self.server = socket.socketpair()
+        self.addCleanup(self.client.close)
+        self.addCleanup(self.server.close)
+
+    def _send_request(self, argv, isatty=None):
+        request = {'argv': argv, 'env': {'A': 'B'}, 'cwd': '/'}
+        if isatty is not None:
+            request['isatty'] = isatty
+        self.client.sendall(json.dumps(request) + '\n')
+
+    def _handle_connection(self):
+        busy = threading.Lock()
+        busy.acquire()
+        daemon._handle_connection(self.server, busy)
+        self.assertFalse(busy.locked())
+
+    def _read_response(self):
+        stdout, stderr = StringIO(), StringIO()
+        exit_code = daemon._read_response(self.client, stdout, stderr)
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    def test_streams_output_and_exit_code(self):
+        def run_command(argv, environ, cwd, stdout, stderr):
+            self.assertEqual(['blueprints', 'list'], argv)
+            self.assertEqual({'A': 'B'}, environ)
+            stdout.write('out 1\n')
+            stderr.write('err\n')
+            stdout.write(u'out 2\n')
+            return 3
+
+        self._send_request(['blueprints', 'list'])
+        with patch.object(daemon, '_run_command', run_command):
+            self._handle_connection()
+
+        stdout, stderr = StringIO(), StringIO()
+        exit_code = daemon._read_response(self.client, stdout, stderr)
+        self.assertEqual(3, exit_code)
+        self.assertEqual('out 1\nout 2\n', stdout.getvalue())
+        self.assertEqual('err\n', stderr.getvalue())
+
+    def test_isatty_forwarded(self):
+        def run_command(argv, environ, cwd, stdout, stderr):
+            self.assertTrue(stdout.isatty())
+            self.assertFalse(stderr.isatty())
+            return 0
+
+        self._send_request(['blueprints', 'list'],
+                           isatty={daemon.STDOUT_FRAME: True,
+                                   daemon.STDERR_FRAME: False})
+        with patch.object(daemon, '_run_command', run_command):
+            self._handle_connection()
+        self.assertEqual(0, self._read_response()[0])
+
+    def test_malformed_request(self):
+        self.client.sendall('not json\n')
+        self._handle_connection()
+        exit_code, _, stderr = self._read_response()
+        self.assertEqual(1, exit_code)
+        self.assertIn('The cfy daemon failed', stderr)
+
+    def test_aborted_on_disconnect(self):
+        interrupted = []
+
+        def run_command(argv, environ, cwd, stdout, stderr):
+            deadline = time.time() + 5
+            try:
+                # The client goes away while the command runs
+                self.client.close()
+                while time.time() < deadline:
+                    time.sleep(0.01)
+            except KeyboardInterrupt:
+                interrupted.append(True)
+                raise
+            return 0
+
+        self._send_request(['events', 'list', '--tail'])
+        with patch.object(daemon, '_run_command', run_command):
+            self._handle_connection()
+        self.assertEqual([True], interrupted)
+
+    def test_busy(self):
+        connections = Queue.Queue()
+        busy = threading.Lock()
+        busy.acquire()
+        daemon._accept_connection(self.server, connections, busy)
+        self.assertIsNone(self._read_response()[0])
+        self.assertTrue(connections.empty())
+
+    def test_not_busy(self):
+        connections = Queue.Queue()
+        busy = threading.Lock()
+        daemon._accept_connection(self.server, connections, busy)
+        self.assertIs(self.server, connections.get_nowait())
+        self.assertFalse(busy.acquire(False))
+
+    def test_connection_closed_early(self):
+        daemon._send_frame(self.server, daemon.STDOUT_FRAME, 'partial')
+        self.server.close()
+        stdout, stderr = StringIO(), StringIO()
+        exit_code = daemon._read_response(self.client, stdout, stderr)
+        self.assertEqual(1, exit_code)
+        self.assertEqual('partial', stdout.getvalue())
+        self.assertIn('closed the connection', stderr.getvalue())
+
+    def test_exit_codes(self):
+        stderr = StringIO()
+        self.assertEqual(0, daemon._get_exit_code(None, stderr))
+        self.assertEqual(2, daemon._get_exit_code(2, stderr))
+        self.assertEqual(1, daemon._get_exit_code('error', stderr))
+        self.assertEqual('error\n', stderr.getvalue())
+
+
+class DaemonClientTest(TestCase):
+
+    def test_no_daemon_running(self):
+        socket_path = os.path.join(tempfile.mkdtemp(), 'missing.sock')
+        self.assertIsNone(daemon.run_in_daemon(['--version'], socket_path))
+
+    def test_terminal_size_not_overridden(self):
+        environ = {'COLUMNS': '100', 'LINES': '40'}
+        self.assertEqual({}, daemon._get_terminal_size_environ(environ))
+
+    @patch.dict(os.environ, {'CFY_USE_DAEMON': 'false'})
+    def test_daemon_disabled(self):
+        self.assertFalse(daemon.is_daemon_enabled())
+
+    @patch.dict(os.environ, {'CFY_USE_DAEMON': 'true'})
+    def test_daemon_enabled(self):
+        self.assertTrue(daemon.is_daemon_enabled())
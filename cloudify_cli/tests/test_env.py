@@ -18,14 +18,18 @@ import os
 import sys
 import mock
 import json
+import time
 import yaml
 import shutil
 import logging
+import logging.handlers
 import tarfile
 import zipfile
 import requests
 import tempfile
+import threading
 from contextlib import closing
+from datetime import datetime, timedelta
 from cStringIO import StringIO
 from mock import MagicMock, patch
 from itertools import chain, repeat, count
@@ -37,6 +41,7 @@ from cloudify.workflows import local
 from cloudify_rest_client.nodes import Node
 from cloudify_rest_client.executions import Execution
 from cloudify_rest_client.exceptions import NotClusterMaster
+from cloudify_rest_client.exceptions import CloudifyClientError
 from cloudify_rest_client.client import CloudifyClient
 from cloudify_rest_client.client import DEFAULT_API_VERSION
 from cloudify_rest_client.node_instances import NodeInstance
@@ -50,17 +55,22 @@ from dsl_parser.import_resolver.default_import_resolver import \
 from .. import env
 from .. import utils
 from .. import inputs
+from .. import yaml_io
 from .. import logger
 from .. import constants
 from ..config import config
 from .. import local as cli_local
 from ..bootstrap import bootstrap
 from ..exceptions import CloudifyCliError
+from ..polling import Poller
+from ..event_filters import EventFilters, parse_time
 from ..colorful_event import ColorfulEvent
 from ..exceptions import ExecutionTimeoutError
 from ..exceptions import EventProcessingTimeoutError
 from ..execution_events_fetcher import wait_for_execution
 from ..execution_events_fetcher import ExecutionEventsFetcher
+from ..execution_events_fetcher import BatchSizer
+from ..compact_event import CompactEvent
 
 from . import cfy
 
@@ -272,6 +282,55 @@ class CliEnvTests(CliCommandTest):
         context = env.get_profile_context(manager_ip)
         self.assertEqual(context.manager_ip, manager_ip)
 
+    def test_profile_context_parsed_once(self):
+        self.use_manager()
+        with patch('cloudify_cli.env.yaml_io.load',
+                   side_effect=yaml_io.load) as yaml_load:
+            env.get_profile_context()
+            context = env.get_profile_context()
+        self.assertEqual(context.manager_ip, '10.10.1.10')
+        self.assertLessEqual(yaml_load.call_count, 1)
+
+    def test_profile_context_cache_sidecar(self):
+        self.use_manager()
+        env.get_profile_context()
+        self.assertTrue(os.path.isfile(os.path.join(
+            env.get_profile_dir(),
+            constants.CLOUDIFY_PROFILE_CONTEXT_CACHE_FILE_NAME)))
+        # a new process only has the sidecar to rely on
+        env._profile_contexts.clear()
+        with patch('cloudify_cli.env.yaml_io.load') as yaml_load:
+            context = env.get_profile_context()
+        self.assertFalse(yaml_load.called)
+        self.assertEqual(context.manager_ip, '10.10.1.10')
+
+    def test_profile_context_reloaded_after_save(self):
+        self.use_manager()
+        context = env.get_profile_context()
+        context.manager_username = 'new_username'
+        self.assertEqual('admin', env.get_profile_context().manager_username)
+        context.save()
+        self.assertEqual('new_username',
+                         env.get_profile_context().manager_username)
+
+    def test_profile_context_reloaded_after_same_size_rewrite(self):
+        self.use_manager()
+        path = os.path.join(env.get_profile_dir(),
+                            constants.CLOUDIFY_PROFILE_CONTEXT_FILE_NAME)
+        # The mtime of a filesystem with a coarse one, which a rewrite in
+        # the same second keeps
+        mtime = int(os.stat(path).st_mtime)
+        os.utime(path, (mtime, mtime))
+        context = env.get_profile_context()
+        size = os.stat(path).st_size
+        context.manager_username = 'nimda'
+        context.save()
+        os.utime(path, (mtime, mtime))
+        self.assertEqual(size, os.stat(path).st_size)
+        # a new process only has the sidecar to rely on
+        env._profile_contexts.clear()
+        self.assertEqual('nimda', env.get_profile_context().manager_username)
+
     def test_raise_uninitialized(self):
         ex = self.assertRaises(
             CloudifyCliError,
@@ -372,6 +431,29 @@ class CliInputsTests(CliCommandTest):
             expected_dict
         )
 
+    def test_inputs_files_parsed_once(self):
+        input_files_directory, expected_dict = \
+            self._generate_multiple_input_files()
+
+        with patch('cloudify_cli.yaml_io.load',
+                   side_effect=yaml_io.load) as yaml_load:
+            inputs.inputs_to_dict([input_files_directory])
+            inputs.inputs_to_dict([input_files_directory])
+        self.assertEqual(2, yaml_load.call_count)
+
+        input_file = os.path.join(input_files_directory, 'f2.yaml')
+        with open(input_file, 'w') as f:
+            f.write('input3: changed_input3')
+        self.assertEqual({'input3': 'changed_input3'},
+                         inputs.inputs_to_dict([input_file]))
+
+    def test_cached_yaml_documents_are_copies(self):
+        input_files_directory, _ = self._generate_multiple_input_files()
+        input_file = os.path.join(input_files_directory, 'f2.yaml')
+        yaml_io.load_path(input_file)['input3'] = 'modified'
+        self.assertEqual({'input3': 'new_input3'},
+                         yaml_io.load_path(input_file))
+
     def _test_string_inputs(self, test_inputs_to_dict=False):
         self._test_multiple_inputs(
             ('', ' ', ';', ' ; '),
@@ -518,6 +600,98 @@ class TestLogger(CliCommandTest):
                                              json.dumps(events[1])),
                          output.getvalue())
 
+    def test_text_events_logger_logs_every_event(self):
+        events = [{'key': 'event {0}'.format(i)} for i in range(3)]
+        records = logging.handlers.BufferingHandler(capacity=10)
+        mock_stdout_ = MagicMock()
+        with patch('sys.stdout', mock_stdout_):
+            logger.configure_loggers()
+        self.addCleanup(logger.configure_loggers)
+        logger.get_logger().addHandler(records)
+        self.addCleanup(logger.get_logger().removeHandler, records)
+        events_logger = logger.get_events_logger(json_output=False)
+        with patch('cloudify.logs.create_event_message_prefix',
+                   lambda event: event['key']):
+            events_logger(events)
+        # Every event is a record of its own, but the console gets all
+        # of them at once
+        self.assertEqual(['event 0', 'event 1', 'event 2'],
+                         [record.getMessage() for record in records.buffer])
+        mock_stdout_.write.assert_called_once_with(
+            'event 0\nevent 1\nevent 2\n')
+        self.assertEqual(1, mock_stdout_.flush.call_count)
+
+    def test_text_events_logger_non_ascii(self):
+        # Stdout which isn't a tty (e.g. piped) has no encoding, or ascii
+        for encoding in (None, 'ascii'):
+            stdout = StringIO()
+            mock_stdout_ = MagicMock(encoding=encoding,
+                                     write=stdout.write)
+            with patch('sys.stdout', mock_stdout_):
+                logger.configure_loggers()
+            self.addCleanup(logger.configure_loggers)
+            events_logger = logger.get_events_logger(json_output=False)
+            with patch('cloudify.logs.create_event_message_prefix',
+                       lambda event: event['key']):
+                events_logger([{'key': u'\u2713 event'}])
+            self.assertEqual('\xe2\x9c\x93 event\n', stdout.getvalue())
+
+    def test_json_events_logger_writes_batch_once(self):
+        events_logger = logger.get_events_logger(json_output=True)
+        events = [{'key': 'value{0}'.format(i)} for i in range(3)]
+        with patch('sys.stdout') as mock_stdout_:
+            events_logger(events)
+        self.assertEqual(1, mock_stdout_.write.call_count)
+        self.assertEqual(1, mock_stdout_.flush.call_count)
+
+    def test_events_logger_writes_on_timer(self):
+        events_logger = logger.get_events_logger(json_output=True)
+        events = [{'key': 'value{0}'.format(i)} for i in range(4)]
+        with patch('sys.stdout') as mock_stdout_, \
+                patch('cloudify_cli.logger.time') as mock_time:
+            # Every event takes half of the flush interval to render
+            mock_time.time.side_effect = [
+                i * logger.EVENTS_FLUSH_INTERVAL / 2 for i in range(10)]
+            events_logger(events)
+        self.assertEqual(2, mock_stdout_.write.call_count)
+
+    def test_log_file_opened_on_first_record(self):
+        logfile = os.path.join(tempfile.mkdtemp(), 'logs', 'cli.log')
+        self.addCleanup(shutil.rmtree, os.path.dirname(
+            os.path.dirname(logfile)))
+        handler = logger._get_file_handler(logfile)
+        self.assertIs(handler, logger._get_file_handler(logfile))
+        self.assertFalse(os.path.exists(logfile))
+        handler.handle(logging.makeLogRecord({'msg': 'first record'}))
+        handler.flush()
+        with open(logfile) as f:
+            self.assertIn('first record', f.read())
+
+    def test_console_handler_bound_on_configure(self):
+        self.addCleanup(logger.configure_loggers)
+        with mock_stdout() as output:
+            logger.configure_loggers()
+        logger.get_logger().info('to the configured stdout')
+        self.assertIn('to the configured stdout', output.getvalue())
+
+    def test_existing_loggers_disabled(self):
+        other_logger = logging.getLogger('cloudify_cli_tests.other')
+        child_logger = logging.getLogger('cloudify.cli.main.child')
+        child_logger.setLevel(logging.DEBUG)
+        self.addCleanup(setattr, other_logger, 'disabled', False)
+        logger.configure_loggers()
+        self.assertTrue(other_logger.disabled)
+        self.assertFalse(child_logger.disabled)
+        self.assertEqual(logging.NOTSET, child_logger.level)
+
+    def test_verbosity_level_reverted(self):
+        logger.configure_loggers()
+        main_logger = logging.getLogger('cloudify.cli.main')
+        logger.set_global_verbosity_level(logger.HIGH_VERBOSE)
+        self.assertEqual(logging.DEBUG, main_logger.level)
+        logger.set_global_verbosity_level(logger.NO_VERBOSE)
+        self.assertEqual(logging.INFO, main_logger.level)
+
 
 class ExecutionEventsFetcherTest(CliCommandTest):
 
@@ -640,7 +814,8 @@ class ExecutionEventsFetcherTest(CliCommandTest):
         events_fetcher = ExecutionEventsFetcher(self.client, 'execution_id',
                                                 batch_size=100)
         batch_events = events_fetcher._fetch_events_batch()
-        self.assertListEqual(self.events, batch_events)
+        self.assertListEqual(
+            [CompactEvent(event) for event in self.events], batch_events)
 
     def test_fetch_events_explicit_several_batches(self):
         all_fetched_events = []
@@ -658,7 +833,214 @@ class ExecutionEventsFetcherTest(CliCommandTest):
         remaining_events_batch = events_fetcher._fetch_events_batch()
         self.assertEqual(len(remaining_events_batch), 1)
         all_fetched_events.extend(remaining_events_batch)
-        self.assertEqual(self.events, all_fetched_events)
+        self.assertEqual([CompactEvent(event) for event in self.events],
+                         all_fetched_events)
+
+    def test_fetch_and_process_events_pipelined(self):
+        self.events = self._generate_events(9)
+        for index, event in enumerate(self.events):
+            event['message'] = 'event {0}'.format(index)
+        batches = []
+        events_fetcher = ExecutionEventsFetcher(self.client,
+                                                'execution_id',
+                                                batch_size=2)
+        events_count = events_fetcher.fetch_and_process_events(
+            events_handler=batches.append, pipelined=True)
+        self.assertEqual(9, events_count)
+        self.assertEqual([2, 2, 2, 2, 1], [len(batch) for batch in batches])
+        self.assertEqual(
+            ['event {0}'.format(index) for index in range(9)],
+            [event['message']['text'] for batch in batches
+             for event in batch])
+        # The pipeline picks up where it stopped
+        self.events.extend(self._generate_events(3))
+        self.assertEqual(3, events_fetcher.fetch_and_process_events(
+            events_handler=batches.append, pipelined=True))
+
+    def test_fetch_and_process_events_pipelined_error(self):
+        self.events = self._generate_events(10)
+        self.client.events.list = MagicMock(
+            side_effect=CloudifyClientError('fetching failed'))
+        events_fetcher = ExecutionEventsFetcher(self.client, 'execution_id')
+        self.assertRaisesRegexp(
+            CloudifyClientError, 'fetching failed',
+            events_fetcher.fetch_and_process_events,
+            events_handler=MagicMock(), pipelined=True)
+
+    def test_fetch_and_process_events_pipelined_handler_error(self):
+        self.events = self._generate_events(10)
+        events_fetcher = ExecutionEventsFetcher(self.client,
+                                                'execution_id',
+                                                batch_size=1)
+        handler = MagicMock(side_effect=RuntimeError('handling failed'))
+        self.assertRaisesRegexp(
+            RuntimeError, 'handling failed',
+            events_fetcher.fetch_and_process_events,
+            events_handler=handler, pipelined=True)
+        # Fetching stopped along with the handler, rather than carrying on
+        # in the background
+        self.assertEqual(1, handler.call_count)
+        self.assertLess(events_fetcher._from_event, 10)
+
+    def test_fetch_and_process_events_pipelined_not_waiting(self):
+        self.events = self._generate_events(10)
+        list_events = self.client.events.list
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def list_slowly(**kwargs):
+            # Every request but the first one is still in flight when
+            # handling the first batch fails
+            if self.client.events.list.call_count > 1:
+                released.wait(10)
+            return list_events(**kwargs)
+
+        self.client.events.list = MagicMock(side_effect=list_slowly)
+        events_fetcher = ExecutionEventsFetcher(self.client,
+                                                'execution_id',
+                                                batch_size=1)
+        handler = MagicMock(side_effect=RuntimeError('handling failed'))
+        started = time.time()
+        self.assertRaisesRegexp(
+            RuntimeError, 'handling failed',
+            events_fetcher.fetch_and_process_events,
+            events_handler=handler, pipelined=True)
+        self.assertLess(time.time() - started, 5)
+
+    def _mock_list_from_timestamp(self, from_datetime=None, **kwargs):
+        self.list_calls.append(kwargs)
+        events = [event for event in self.events
+                  if not from_datetime or
+                  event['timestamp'] >= from_datetime.isoformat()]
+        offset = kwargs['_offset']
+        return MockListResponse(events[offset:offset + kwargs['_size']],
+                                len(events))
+
+    def _generate_timestamped_events(self, timestamps):
+        events = self._generate_events(len(timestamps))
+        for index, (event, timestamp) in enumerate(zip(events, timestamps)):
+            event['timestamp'] = '2017-05-01T10:00:{0:02d}.000Z'.format(
+                timestamp)
+            event['message'] = 'event {0}'.format(index)
+        return events
+
+    def test_fetch_events_from_cursor(self):
+        self.list_calls = []
+        self.client.events.list = self._mock_list_from_timestamp
+        # Events with equal timestamps across batches
+        timestamps = [0, 1, 1, 1, 2, 3, 3, 4, 5]
+        self.events = self._generate_timestamped_events(timestamps)
+        expected_messages = [event['message'] for event in self.events]
+        events_fetcher = ExecutionEventsFetcher(self.client,
+                                                'execution_id',
+                                                batch_size=2)
+        events = []
+        events_count = events_fetcher.fetch_and_process_events(
+            events_handler=events.extend)
+        self.assertEqual(len(timestamps), events_count)
+        self.assertEqual(expected_messages,
+                         [event['message']['text'] for event in events])
+        # Events which share the last seen timestamp are fetched again,
+        # rather than skipped by offset
+        self.assertEqual(0, max(call['_offset'] for call in self.list_calls))
+
+    def test_fetch_events_from_cursor_unstable_order(self):
+        self.list_calls = []
+        self.events = self._generate_timestamped_events([0, 1, 1, 1, 2])
+
+        def list_events(**kwargs):
+            # Events with equal timestamps are listed in a different order
+            # every time
+            self.events.reverse()
+            self.events.sort(key=lambda event: event['timestamp'])
+            return self._mock_list_from_timestamp(**kwargs)
+
+        self.client.events.list = list_events
+        events_fetcher = ExecutionEventsFetcher(self.client,
+                                                'execution_id',
+                                                batch_size=2)
+        events = []
+        events_fetcher.fetch_and_process_events(events_handler=events.extend)
+        self.assertEqual(
+            ['event {0}'.format(index) for index in range(5)],
+            sorted(event['message']['text'] for event in events))
+
+    def test_fetch_events_from_cursor_drops_duplicates(self):
+        events = self._generate_timestamped_events([0, 1, 2])
+        # A manager that ignores the cursor returns the same events again
+        self.client.events.list = lambda **kwargs: MockListResponse(
+            [dict(event) for event in events], len(events))
+        events_fetcher = ExecutionEventsFetcher(self.client,
+                                                'execution_id',
+                                                batch_size=10)
+        self.assertEqual(3, len(events_fetcher._fetch_events_batch()))
+        self.assertEqual([], events_fetcher._fetch_events_batch())
+
+    def test_fetch_events_falls_back_to_offsets(self):
+        self.client.events.list = MagicMock(side_effect=[
+            CloudifyClientError('Invalid range', status_code=400),
+            MockListResponse(self._generate_events(3), 3)])
+        events_fetcher = ExecutionEventsFetcher(self.client,
+                                                'execution_id',
+                                                batch_size=10)
+        self.assertEqual(3, len(events_fetcher._fetch_events_batch()))
+        self.assertFalse(events_fetcher._use_cursor)
+        self.assertNotIn('from_datetime',
+                         self.client.events.list.call_args[1])
+
+    def test_fetch_events_filtered(self):
+        self.events = self._generate_timestamped_events(range(6))
+        for index, event in enumerate(self.events):
+            event['node_name'] = 'node_{0}'.format(index % 2)
+            event['operation'] = 'cloudify.interfaces.lifecycle.create'
+        self.events[-1]['event_type'] = 'workflow_succeeded'
+        events_fetcher = ExecutionEventsFetcher(
+            self.client,
+            'execution_id',
+            filters=EventFilters(nodes=['node_0'],
+                                 operations=['create'],
+                                 message_regex=r'event [^2]'))
+        events = events_fetcher._fetch_events_batch()
+        # The workflow's end event is kept regardless of the filters
+        self.assertEqual(['event 0', 'event 4', 'event 5'],
+                         [event['message']['text'] for event in events])
+
+    def test_fetch_events_filters_in_query(self):
+        self.client.events.list = MagicMock(
+            return_value=MockListResponse([], 0))
+        since = datetime(2017, 5, 1, 10)
+        events_fetcher = ExecutionEventsFetcher(
+            self.client,
+            'execution_id',
+            filters=EventFilters(event_types=['task_failed'], since=since),
+            fields=['message', 'timestamp'])
+        events_fetcher._fetch_events_batch()
+        query = self.client.events.list.call_args[1]
+        self.assertEqual(since, query['from_datetime'])
+        self.assertIn('task_failed', query['event_type'])
+        self.assertIn('workflow_failed', query['event_type'])
+        self.assertEqual(['message', 'timestamp'], query['_include'])
+
+    def test_fetch_events_as_dicts(self):
+        self.events = self._generate_events(2)
+        events_fetcher = ExecutionEventsFetcher(self.client,
+                                                'execution_id',
+                                                compact_events=False)
+        events = events_fetcher._fetch_events_batch()
+        self.assertEqual([dict] * 2, [type(event) for event in events])
+        self.assertEqual('<node_instance_id>',
+                         events[0]['context']['node_id'])
+
+    def test_fetch_events_adaptive_batch_size(self):
+        self.events = self._generate_events(2000)
+        self.client.events.list = MagicMock(side_effect=self._mock_list)
+        events_fetcher = ExecutionEventsFetcher(self.client, 'execution_id')
+        self.assertEqual(2000, events_fetcher.fetch_and_process_events())
+        # Fast, full batches double the batch size up to its bound
+        self.assertEqual(
+            [100, 200, 400, 800, 1000],
+            [kwargs['_size']
+             for _, kwargs in self.client.events.list.call_args_list])
 
     def test_fetch_and_process_events_timeout(self):
         self.events = self._generate_events(2000000)
@@ -693,6 +1075,32 @@ class ExecutionEventsFetcherTest(CliCommandTest):
                           timeout=2)
 
 
+class EventFiltersTest(CliCommandTest):
+
+    def test_parse_time(self):
+        self.assertEqual(datetime(2017, 5, 1, 10, 30),
+                         parse_time('2017-05-01T10:30:00Z'))
+        self.assertEqual(datetime(2017, 5, 1), parse_time('2017-05-01'))
+        self.assertAlmostEqual(
+            0,
+            (datetime.utcnow() - timedelta(hours=2) -
+             parse_time('2h')).total_seconds(),
+            delta=5)
+        self.assertRaises(CloudifyCliError, parse_time, 'yesterday')
+
+    def test_time_range(self):
+        passes = EventFilters(since=datetime(2017, 5, 1, 10),
+                              until=datetime(2017, 5, 1, 11)).compile()
+        for timestamp, expected in [('2017-05-01T09:59:59.999Z', False),
+                                    ('2017-05-01T10:00:00.000Z', True),
+                                    ('2017-05-01T11:00:00Z', True),
+                                    ('2017-05-01T11:00:00.001Z', False)]:
+            self.assertEqual(expected, passes({'timestamp': timestamp}))
+
+    def test_no_filters(self):
+        self.assertFalse(EventFilters(nodes=[], since=None))
+
+
 class WaitForExecutionTests(CliCommandTest):
 
     def setUp(self):
@@ -704,6 +1112,9 @@ class WaitForExecutionTests(CliCommandTest):
         self.addCleanup(time_patcher.stop)
         # prepare mock time.time() calls - return 0, 1, 2, 3...
         self.time.time.side_effect = count(0)
+        poller_time_patcher = patch('cloudify_cli.polling.time', self.time)
+        poller_time_patcher.start()
+        self.addCleanup(poller_time_patcher.stop)
 
     def test_wait_for_log_after_execution_finishes(self):
         """wait_for_execution continues polling logs, after execution status
@@ -787,7 +1198,79 @@ class WaitForExecutionTests(CliCommandTest):
             event (expected 101 calls, got %d)""" % calls_count)
 
 
+class BatchSizerTest(CliCommandTest):
+
+    def _events(self, count, message=''):
+        return [{'message': message}] * count
+
+    def test_grows_while_full_and_fast(self):
+        sizer = BatchSizer(min_size=10, max_size=300)
+        for expected in (200, 300, 300):
+            sizer.update(sizer.size, self._events(sizer.size), 0.1)
+            self.assertEqual(expected, sizer.size)
+
+    def test_shrinks_when_slow_or_large(self):
+        sizer = BatchSizer(target_latency=1, target_messages_size=1000)
+        sizer.update(100, self._events(100), 4)
+        self.assertEqual(25, sizer.size)
+        sizer.update(25, self._events(25, 'x' * 80), 0.1)
+        self.assertEqual(12, sizer.size)
+
+    def test_shrinks_while_partial(self):
+        sizer = BatchSizer(min_size=10)
+        for expected in (50, 25, 12, 10, 10):
+            sizer.update(sizer.size, [], 0.1)
+            self.assertEqual(expected, sizer.size)
+
+    def test_fixed_size(self):
+        sizer = BatchSizer(5)
+        sizer.update(5, self._events(5), 0.1)
+        sizer.update(5, [], 10)
+        self.assertEqual(5, sizer.size)
+
+
 @mock.patch('cloudify_cli.env.is_initialized', lambda: True)
+class PollerTest(CliCommandTest):
+
+    def setUp(self):
+        super(PollerTest, self).setUp()
+        self.clock = {'time': 1000}
+
+        def _mock_sleep(n):
+            self.clock['time'] += n
+
+        time_patcher = patch('cloudify_cli.polling.time')
+        self.time = time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+        self.time.time = lambda: self.clock['time']
+        self.time.sleep = MagicMock(side_effect=_mock_sleep)
+
+    def _get_intervals(self):
+        return [args[0] for args, _ in self.time.sleep.call_args_list]
+
+    def test_backs_off_and_resets_on_activity(self):
+        poller = Poller(initial_interval=1, max_interval=4,
+                        backoff_factor=2, jitter=0)
+        for _ in range(4):
+            poller.wait()
+        poller.wait(activity=True)
+        self.assertEqual([1, 2, 4, 4, 1], self._get_intervals())
+
+    def test_does_not_sleep_past_deadline(self):
+        poller = Poller(timeout=5, initial_interval=2, jitter=0)
+        while not poller.timed_out:
+            poller.wait()
+        self.assertEqual([2, 3], self._get_intervals())
+        self.assertEqual(0, poller.remaining)
+
+    def test_jitter(self):
+        poller = Poller(initial_interval=10, backoff_factor=1, jitter=0.1)
+        for _ in range(20):
+            poller.wait()
+        for interval in self._get_intervals():
+            self.assertTrue(9 <= interval <= 11)
+
+
 class TestCLIConfig(CliCommandTest):
 
     def setUp(self):
@@ -825,6 +1308,21 @@ class TestCLIConfig(CliCommandTest):
             yaml.dump({}, f)
         self.assertFalse(config.is_auto_generate_ids())
 
+    def test_config_loaded_once(self):
+        with patch('cloudify_cli.yaml_io.safe_load',
+                   side_effect=yaml_io.safe_load) as safe_load:
+            config.is_use_colors()
+            config.is_auto_generate_ids()
+            config.is_validate_definitions_version()
+        self.assertEqual(1, safe_load.call_count)
+        self.assertIs(config.get_config(), config.get_config())
+
+    def test_config_reloaded_after_change(self):
+        self.assertTrue(config.is_use_colors())
+        with open(self.config_file_path, 'w') as f:
+            yaml.dump({'colors': False}, f)
+        self.assertFalse(config.is_use_colors())
+
 
 @mock.patch('cloudify_cli.env.is_initialized', lambda: True)
 class TestCLIColors(CliCommandTest):
@@ -1084,6 +1582,30 @@ class TestGetRestClient(CliCommandTest):
         self.assertIsNotNone(client._client.headers[
             constants.CLOUDIFY_AUTHENTICATION_HEADER])
 
+    def test_connection_pooling(self):
+        self.addCleanup(setattr, env, '_http_adapters', None)
+        env.enable_connection_pooling()
+        clients = [self.original_utils_get_rest_client(
+            rest_host='localhost', skip_version_check=True)
+            for _ in range(2)]
+        sessions = [client._client._session for client in clients]
+        # Connections are shared, but cookies aren't
+        self.assertIsNot(sessions[0], sessions[1])
+        self.assertIs(sessions[0].get_adapter('http://localhost'),
+                      sessions[1].get_adapter('http://localhost'))
+
+        response = MagicMock(status_code=200)
+        response.json.return_value = {'items': [], 'metadata': {}}
+        with patch.object(sessions[0], 'get',
+                          return_value=response) as session_get:
+            clients[0].blueprints.list()
+        self.assertEqual(1, session_get.call_count)
+
+    def test_no_connection_pooling(self):
+        client = self.original_utils_get_rest_client(
+            rest_host='localhost', skip_version_check=True)
+        self.assertNotIsInstance(client, env.PooledCloudifyClient)
+
     def test_get_secured_rest_client(self):
         rest_protocol = 'https'
         host = 'localhost'
@@ -0,0 +1,121 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+import os
+from itertools import count
+
+from mock import MagicMock, patch
+
+from cloudify_rest_client.executions import Execution
+
+from .. import env
+from .. import event_store
+from ..event_store import EventStore
+from ..execution_events_fetcher import ExecutionEventsFetcher
+from .commands.test_base import CliCommandTest
+from .commands.mocks import MockListResponse, make_api_event
+
+
+class EventStoreTest(CliCommandTest):
+
+    def setUp(self):
+        super(EventStoreTest, self).setUp()
+        self.use_manager()
+        self.store = EventStore(os.path.join(
+            env.get_profile_dir(), 'events.db'))
+        self.addCleanup(self.store.close)
+        self.events = [make_api_event(seconds=index,
+                                      message='event {0}'.format(index))
+                       for index in range(25)]
+        self.events[-1]['event_type'] = 'workflow_succeeded'
+        self.client.events.list = MagicMock(side_effect=self._mock_list)
+        self._set_execution_status(Execution.TERMINATED)
+
+    def _set_execution_status(self, status):
+        self.client.executions.get = MagicMock(
+            return_value=Execution({'id': 'execution_id', 'status': status}))
+
+    def _mock_list(self, from_datetime=None, _offset=0, _size=100, **_):
+        events = [dict(event) for event in self.events
+                  if not from_datetime or
+                  event['timestamp'] >= from_datetime.isoformat()]
+        return MockListResponse(events[_offset:_offset + _size], len(events))
+
+    def _fetch_messages(self, batch_size=10):
+        fetcher = ExecutionEventsFetcher(self.client,
+                                         'execution_id',
+                                         batch_size=batch_size,
+                                         event_store=self.store)
+        messages = []
+
+        def handler(events):
+            messages.extend(event['message']['text'] for event in events)
+
+        fetcher.fetch_and_process_events(events_handler=handler)
+        return messages
+
+    def test_ended_execution_fetched_once(self):
+        expected = ['event {0}'.format(index) for index in range(25)]
+        self.assertEqual(expected, self._fetch_messages())
+        fetches = self.client.events.list.call_count
+        self.assertEqual(expected, self._fetch_messages())
+        self.assertEqual(fetches, self.client.events.list.call_count)
+
+    def test_only_new_events_fetched(self):
+        self._set_execution_status(Execution.STARTED)
+        del self.events[20:]
+        self.assertEqual(20, len(self._fetch_messages()))
+
+        self.events.extend(make_api_event(seconds=index,
+                                          message='event {0}'.format(index))
+                           for index in range(20, 25))
+        self.client.events.list.reset_mock()
+        messages = self._fetch_messages()
+        self.assertEqual(['event {0}'.format(index) for index in range(25)],
+                         messages)
+        # The stored events were replayed, and only the following ones
+        # were fetched
+        for _, kwargs in self.client.events.list.call_args_list:
+            self.assertGreaterEqual(kwargs['from_datetime'].second, 19)
+        self.assertFalse(self.store.get_stream('execution_id',
+                                               False)['complete'])
+
+    def test_streams_per_include_logs(self):
+        self._fetch_messages()
+        self.assertEqual(25, self.store.get_stream('execution_id',
+                                                   False)['events'])
+        self.assertEqual(0, self.store.get_stream('execution_id',
+                                                  True)['events'])
+
+    def test_least_recently_used_evicted(self):
+        with patch.object(event_store, 'MAX_STORED_EXECUTIONS', 2), \
+                patch('cloudify_cli.event_store.time') as mock_time:
+            mock_time.time.side_effect = count(1)
+            for execution_id in ('e1', 'e2', 'e3'):
+                self.store.add_events(execution_id, False, [{}], None)
+        self.assertEqual(0, self.store.get_stream('e1', False)['events'])
+        self.assertEqual(1, self.store.get_stream('e3', False)['events'])
+
+    @patch('cloudify_cli.logger.logs.create_event_message_prefix',
+           new=lambda event: event['message']['text'])
+    def test_events_list_uses_store(self):
+        with patch('cloudify_cli.config.config.is_use_event_store',
+                   return_value=True):
+            self.invoke('cfy events list -e execution_id --no-logs')
+            fetches = self.client.events.list.call_count
+            outcome = self.invoke('cfy events list -e execution_id --no-logs')
+        self.assertIn('Total events: 25', outcome.logs)
+        self.assertEqual(fetches, self.client.events.list.call_count)
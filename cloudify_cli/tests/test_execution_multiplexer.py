@@ -0,0 +1,119 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+from itertools import count
+
+from mock import MagicMock, patch
+
+from cloudify_rest_client.executions import Execution
+from cloudify_rest_client.client import CloudifyClient
+
+from .. import execution_multiplexer
+from ..execution_multiplexer import ExecutionMultiplexer
+from .commands.test_base import CliCommandTest
+from .commands.mocks import MockListResponse, make_api_event
+
+
+class ExecutionMultiplexerTest(CliCommandTest):
+
+    def setUp(self):
+        super(ExecutionMultiplexerTest, self).setUp()
+        self.client = CloudifyClient()
+        time_patcher = patch('cloudify_cli.polling.time')
+        self.time = time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+        self.time.time.side_effect = count(0)
+
+        # Every execution is started on the first status query, and
+        # terminated on the second one
+        self.status_queries = {}
+        self.client.executions.list = MagicMock(
+            side_effect=self._mock_executions_list)
+        self.client.events.list = MagicMock(
+            side_effect=self._mock_events_list)
+        self.client.executions.get = MagicMock()
+
+    def _mock_executions_list(self, id, **_):
+        executions = []
+        for execution_id in id:
+            queries = self.status_queries.get(execution_id, 0) + 1
+            self.status_queries[execution_id] = queries
+            executions.append(Execution({
+                'id': execution_id,
+                'deployment_id': 'dep_' + execution_id,
+                'status': Execution.STARTED if queries < 2
+                else Execution.TERMINATED,
+                'error': ''
+            }))
+        return MockListResponse(executions, len(executions))
+
+    def _mock_events_list(self, execution_id, _offset, **_):
+        events = [make_api_event(event_type,
+                                 execution_id=execution_id,
+                                 deployment_id='dep_' + execution_id)
+                  for event_type in ('task_succeeded', 'workflow_succeeded')]
+        return MockListResponse(events[_offset:], len(events))
+
+    def _make_multiplexer(self, execution_ids, **kwargs):
+        multiplexer = ExecutionMultiplexer(self.client, **kwargs)
+        self.events = {}
+        self.ended = []
+        for execution_id in execution_ids:
+            self.events[execution_id] = []
+            multiplexer.add(
+                Execution({'id': execution_id,
+                           'status': Execution.PENDING}),
+                events_handler=self.events[execution_id].extend,
+                end_handler=self.ended.append)
+        return multiplexer
+
+    def test_waits_for_all_executions(self):
+        execution_ids = ['e{0}'.format(i) for i in range(5)]
+        multiplexer = self._make_multiplexer(execution_ids)
+        self.assertEqual([], multiplexer.run())
+        self.assertItemsEqual(execution_ids, [e.id for e in self.ended])
+        for execution_id in execution_ids:
+            self.assertEqual(
+                ['task_succeeded', 'workflow_succeeded'],
+                [event['event_type']
+                 for event in self.events[execution_id]])
+        # The executions were never fetched one by one
+        self.assertFalse(self.client.executions.get.called)
+
+    def test_one_status_query_per_poll(self):
+        execution_ids = ['e{0}'.format(i) for i in range(250)]
+        with patch.object(execution_multiplexer, 'STATUS_QUERY_SIZE', 100):
+            self._make_multiplexer(
+                execution_ids, max_event_fetches=1000).run()
+        # Two polls for the statuses, in chunks of up to 100 executions
+        self.assertEqual(6, self.client.executions.list.call_count)
+
+    def test_bounded_event_fetches(self):
+        execution_ids = ['e{0}'.format(i) for i in range(10)]
+        multiplexer = self._make_multiplexer(execution_ids,
+                                             max_event_fetches=3)
+        self.assertEqual([], multiplexer.run())
+        self.assertEqual(10, len(self.ended))
+        # Every poll fetched the events of 3 executions at most
+        polls = self.time.sleep.call_count + 1
+        self.assertLessEqual(self.client.events.list.call_count, 3 * polls)
+
+    def test_timeout(self):
+        self.client.executions.list = MagicMock(
+            return_value=MockListResponse([], 0))
+        multiplexer = self._make_multiplexer(['e0', 'e1'], timeout=10)
+        self.assertEqual(['e0', 'e1'], [e.id for e in multiplexer.run()])
+        self.assertEqual([], self.ended)
@@ -0,0 +1,134 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+from ..compact_event import CompactEvent
+from ..execution_profile import ExecutionProfile
+from .commands.test_base import CliCommandTest
+from .commands.mocks import make_api_event
+
+
+def _event(seconds, event_type, node_id=None, operation=None):
+    return CompactEvent(make_api_event(
+        event_type,
+        seconds,
+        node_instance_id=node_id,
+        node_name=node_id and node_id.split('_')[0],
+        operation=operation))
+
+
+# A network and a VM are created at the same time. The VM's creation is
+# retried once, and the application is configured after it
+EVENTS = sorted([
+    _event(0, 'workflow_started'),
+    _event(0, 'sending_task', 'vm_1', 'create'),
+    _event(0.5, 'sending_task', 'network_1', 'create'),
+    _event(0.5, 'task_started', 'network_1', 'create'),
+    _event(1, 'task_started', 'vm_1', 'create'),
+    _event(2, 'task_succeeded', 'network_1', 'create'),
+    _event(4, 'task_rescheduled', 'vm_1', 'create'),
+    _event(5, 'sending_task', 'vm_1', 'create'),
+    _event(5, 'task_started', 'vm_1', 'create'),
+    _event(7, 'task_succeeded', 'vm_1', 'create'),
+    _event(7, 'sending_task', 'app_1', 'configure'),
+    _event(8, 'task_started', 'app_1', 'configure'),
+    _event(10, 'task_succeeded', 'app_1', 'configure'),
+    _event(10.5, 'workflow_succeeded'),
+], key=lambda event: event['timestamp'])
+
+
+class ExecutionProfileTest(CliCommandTest):
+
+    def setUp(self):
+        super(ExecutionProfileTest, self).setUp()
+        self.profile = ExecutionProfile()
+        # Events are passed in batches, as fetched
+        self.profile(EVENTS[:5])
+        self.profile(EVENTS[5:])
+
+    def test_summary(self):
+        summary = self.profile.summary
+        self.assertEqual(10.5, summary['duration'])
+        self.assertEqual('succeeded', summary['outcome'])
+        self.assertEqual(3, summary['tasks'])
+        self.assertEqual(4, summary['attempts'])
+        self.assertEqual(1, summary['retries'])
+        self.assertEqual(2.0, summary['queue_wait'])
+        self.assertEqual(2, summary['peak_concurrency'])
+        self.assertAlmostEqual(8.5 / 10.5, summary['average_concurrency'])
+
+    def test_slowest_tasks(self):
+        slowest = self.profile.slowest_tasks(2)
+        self.assertEqual(['vm_1', 'app_1'],
+                         [task.node_id for task in slowest])
+        self.assertEqual(7.0, slowest[0].duration)
+        self.assertEqual(5.0, slowest[0].run_time)
+        self.assertEqual(1, slowest[0].retries)
+
+    def test_operations_and_nodes(self):
+        operations = self.profile.operations
+        self.assertEqual(['create', 'configure'],
+                         [row['operation'] for row in operations])
+        self.assertEqual(8.5, operations[0]['total'])
+        self.assertEqual(['vm', 'app', 'network'],
+                         [row['node'] for row in self.profile.nodes])
+
+    def test_critical_path(self):
+        self.assertEqual(
+            ['vm_1', 'app_1'],
+            [task.node_id for task in self.profile.critical_path])
+
+    def test_chrome_trace(self):
+        trace_events = self.profile.chrome_trace()['traceEvents']
+        spans = [event for event in trace_events if event['ph'] == 'X']
+        self.assertEqual(4, len(spans))
+        # The network's creation and the first attempt to create the VM
+        # ran at the same time, so they're on different lanes
+        first_attempt = [span for span in spans
+                         if span['args']['node_instance'] == 'vm_1'][0]
+        network = [span for span in spans
+                   if span['args']['node_instance'] == 'network_1'][0]
+        self.assertNotEqual(first_attempt['tid'], network['tid'])
+        self.assertEqual(1000000, first_attempt['ts'])
+        self.assertEqual(3000000, first_attempt['dur'])
+        self.assertEqual(
+            [1, 2, 1, 0, 1, 0, 1, 0],
+            [event['args']['running'] for event in trace_events
+             if event['ph'] == 'C'])
+
+    def test_repeated_operation_not_retried(self):
+        # A relationship operation runs once per relationship
+        operation = 'cloudify.interfaces.relationship_lifecycle.establish'
+        profile = ExecutionProfile()
+        profile([_event(0, 'sending_task', 'app_1', operation),
+                 _event(0, 'task_started', 'app_1', operation),
+                 _event(1, 'task_succeeded', 'app_1', operation),
+                 _event(1, 'sending_task', 'app_1', operation),
+                 _event(1, 'task_started', 'app_1', operation),
+                 _event(3, 'task_failed', 'app_1', operation),
+                 _event(4, 'sending_task', 'app_1', operation),
+                 _event(4, 'task_started', 'app_1', operation),
+                 _event(5, 'task_succeeded', 'app_1', operation)])
+        self.assertEqual(2, profile.summary['tasks'])
+        self.assertEqual(1, profile.summary['retries'])
+        self.assertEqual([1.0, 4.0],
+                         [task.duration for task in profile.tasks])
+
+    def test_unended_tasks_ignored(self):
+        profile = ExecutionProfile()
+        profile([_event(0, 'sending_task', 'vm_1', 'create'),
+                 _event(1, 'task_started', 'vm_1', 'create')])
+        self.assertEqual(0, profile.summary['tasks'])
+        self.assertEqual(1, profile.running)
@@ -0,0 +1,74 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+import os
+import time
+
+from mock import MagicMock, patch
+
+from cloudify_rest_client.deployments import Deployment
+
+from .. import id_index
+from .commands.test_base import CliCommandTest
+from .commands.mocks import MockListResponse
+
+
+class IdIndexTest(CliCommandTest):
+
+    def setUp(self):
+        super(IdIndexTest, self).setUp()
+        self.use_manager()
+        self.client.deployments.list = MagicMock(return_value=MockListResponse(
+            [Deployment({'id': deployment_id})
+             for deployment_id in ('web2', 'db', 'web1', 'app')], 4))
+
+    def test_prefix_lookup(self):
+        index = id_index.get_objects_index('deployments')
+        self.assertEqual(['web1', 'web2'], index.lookup('web'))
+        self.assertEqual(['app', 'db', 'web1', 'web2'], index.lookup(''))
+        self.assertEqual([], index.lookup('x'))
+
+    def test_ids_fetched_once(self):
+        id_index.get_objects_index('deployments').lookup('web')
+        id_index.get_objects_index('deployments').lookup('db')
+        self.assertEqual(1, self.client.deployments.list.call_count)
+
+    def test_index_per_tenant(self):
+        id_index.get_objects_index('deployments').lookup('web')
+        id_index.get_objects_index('deployments', 'other').lookup('web')
+        self.assertEqual(2, self.client.deployments.list.call_count)
+
+    def test_stale_index_refreshed_in_background(self):
+        index = id_index.IdIndex(
+            'deployments',
+            lambda client: [d.id for d in client.deployments.list()],
+            ttl=0)
+        index.refresh()
+        time.sleep(0.01)
+        with patch.object(id_index.IdIndex, 'refresh') as refresh:
+            with patch('os.fork', create=True, return_value=1):
+                self.assertEqual(['web1', 'web2'], index.lookup('web'))
+        self.assertFalse(refresh.called)
+        self.assertTrue(os.path.exists(index.path + '.refreshing'))
+        # Only one refresh at a time
+        self.assertFalse(index._start_refresh())
+
+    def test_invalidated_by_delete(self):
+        index = id_index.get_objects_index('deployments')
+        index.lookup('web')
+        self.client.deployments.delete = MagicMock()
+        self.invoke('cfy deployments delete web1')
+        self.assertFalse(os.path.exists(index.path))
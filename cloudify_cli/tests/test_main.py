@@ -0,0 +1,77 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+import click
+import click.testing as clicktest
+from mock import patch
+
+from .. import main
+from ..commands import install
+from ..commands import deployments
+from ..commands import executions
+
+from .commands.test_base import CliCommandTest
+
+
+class LazyCommandsTest(CliCommandTest):
+
+    def _get_command(self, name):
+        return main._cfy.get_command(click.Context(main._cfy), name)
+
+    def test_all_commands_listed(self):
+        commands = main._cfy.list_commands(click.Context(main._cfy))
+        for name in list(main._COMMANDS) + list(main._CONTEXT_COMMANDS):
+            self.assertIn(name, commands)
+
+    def test_help_lists_commands(self):
+        outcome = clicktest.CliRunner().invoke(main._cfy, ['-h'])
+        self.assertEqual(0, outcome.exit_code)
+        self.assertIn('Show events from workflow executions', outcome.output)
+        self.assertIn('maintenance-mode', outcome.output)
+
+    def test_short_help_of_loaded_commands(self):
+        for manager_active in (True, False):
+            with patch('cloudify_cli.env.is_manager_active',
+                       return_value=manager_active):
+                for name, short_help in main._LAZY_COMMANDS.items():
+                    if callable(short_help):
+                        short_help = short_help()
+                    command = main._load_command(name)
+                    self.assertEqual(command.short_help or '', short_help)
+
+    def test_prefix_matches_lazy_command(self):
+        self.assertEqual(
+            'maintenance-mode', self._get_command('maint').name)
+
+    @patch('cloudify_cli.env.is_manager_active', return_value=True)
+    def test_manager_variant(self, *_):
+        self.assertIs(install.manager, main._load_command('install'))
+        main._load_command('deployments')
+        self.assertIs(deployments.manager_inputs,
+                      deployments.deployments.commands['inputs'])
+        main._load_command('executions')
+        self.assertIs(executions.manager_start,
+                      executions.executions.commands['start'])
+
+    @patch('cloudify_cli.env.is_manager_active', return_value=False)
+    def test_local_variant(self, *_):
+        self.assertIs(install.local, main._load_command('install'))
+        main._load_command('deployments')
+        self.assertIs(deployments.local_inputs,
+                      deployments.deployments.commands['inputs'])
+        main._load_command('executions')
+        self.assertIs(executions.local_start,
+                      executions.executions.commands['start'])
@@ -0,0 +1,134 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+from mock import MagicMock
+
+from cloudify_rest_client.exceptions import CloudifyClientError
+
+from ..pagination import Pagination
+from .commands.test_base import CliCommandTest
+from .commands.mocks import MockListResponse
+
+
+class PaginationTest(CliCommandTest):
+
+    def setUp(self):
+        super(PaginationTest, self).setUp()
+        self.items = range(25)
+        self.with_total = True
+        self.list_method = MagicMock(side_effect=self._mock_list)
+
+    def _mock_list(self, _offset=0, _size=1000, **_):
+        page = MockListResponse(self.items[_offset:_offset + _size], None)
+        if self.with_total:
+            page.metadata = MagicMock()
+            page.metadata.pagination.total = len(self.items)
+        return page
+
+    def _get_pages(self):
+        return [(kwargs['_offset'], kwargs['_size'])
+                for _, kwargs in self.list_method.call_args_list]
+
+    def test_all_pages(self):
+        for prefetch in (True, False):
+            self.list_method.reset_mock()
+            items = Pagination(page_size=10, prefetch=prefetch).list(
+                self.list_method, sort='id')
+            self.assertEqual(self.items, list(items))
+            self.assertEqual([(0, 10), (10, 10), (20, 10)],
+                             self._get_pages())
+            self.list_method.assert_called_with(_offset=20,
+                                                _size=10,
+                                                sort='id')
+
+    def test_all_pages_without_total(self):
+        self.with_total = False
+        self.items = range(20)
+        items = Pagination(page_size=10).list(self.list_method)
+        self.assertEqual(self.items, list(items))
+        # Without a total, only an empty page tells the previous one was
+        # the last
+        self.assertEqual([(0, 10), (10, 10), (20, 10)], self._get_pages())
+
+    def test_no_request_past_total(self):
+        self.items = range(20)
+        self.assertEqual(self.items, list(
+            Pagination(page_size=10).list(self.list_method)))
+        self.assertEqual([(0, 10), (10, 10)], self._get_pages())
+
+    def test_limit(self):
+        items = Pagination(page_size=10, limit=15).list(self.list_method)
+        self.assertEqual(range(15), list(items))
+        self.assertEqual([(0, 10), (10, 5)], self._get_pages())
+
+    def test_filters(self):
+        list(Pagination().list(self.list_method,
+                               filters={'id': 'a', 'deployment_id': 'b'},
+                               id=None,
+                               deployment_id='c'))
+        self.list_method.assert_called_once_with(
+            _offset=0, _size=1000, id='a', deployment_id='c')
+
+    def test_first_page_fetched_up_front(self):
+        self.list_method.side_effect = CloudifyClientError('not found',
+                                                           status_code=404)
+        self.assertRaises(CloudifyClientError,
+                          Pagination().list,
+                          self.list_method)
+
+    def test_next_page_error_raised(self):
+        def fail_after_first_page(_offset=0, _size=1000):
+            if _offset:
+                raise CloudifyClientError('failed')
+            return self._mock_list(_offset, _size)
+
+        self.list_method.side_effect = fail_after_first_page
+        items = Pagination(page_size=10).list(self.list_method)
+        self.assertEqual(range(10), [next(items) for _ in range(10)])
+        self.assertRaises(CloudifyClientError, next, items)
+
+
+class ListPaginationTest(CliCommandTest):
+
+    def setUp(self):
+        super(ListPaginationTest, self).setUp()
+        self.use_manager()
+        self.blueprints = [{'id': 'blueprint_{0}'.format(index)}
+                           for index in range(5)]
+        self.client.blueprints.list = MagicMock(
+            side_effect=lambda _offset, _size, **_: MockListResponse(
+                self.blueprints[_offset:_offset + _size], None))
+
+    def _get_pages(self):
+        return [(kwargs['_offset'], kwargs['_size'])
+                for _, kwargs in self.client.blueprints.list.call_args_list]
+
+    def test_first_page_by_default(self):
+        outcome = self.invoke('blueprints list --page-size 2')
+        self.assertEqual([(0, 2)], self._get_pages())
+        self.assertIn('blueprint_1', outcome.logs)
+        self.assertNotIn('blueprint_2', outcome.logs)
+
+    def test_all(self):
+        outcome = self.invoke('blueprints list --page-size 2 --all')
+        self.assertEqual([(0, 2), (2, 2), (4, 2)], self._get_pages())
+        self.assertIn('blueprint_4', outcome.logs)
+
+    def test_limit(self):
+        outcome = self.invoke('blueprints list --page-size 2 --limit 3')
+        self.assertEqual([(0, 2), (2, 1)], self._get_pages())
+        self.assertIn('blueprint_2', outcome.logs)
+        self.assertNotIn('blueprint_3', outcome.logs)
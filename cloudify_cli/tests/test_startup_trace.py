@@ -0,0 +1,80 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+import os
+import json
+import time
+import tempfile
+
+from mock import patch
+from testtools import TestCase
+
+from .. import startup_trace
+
+
+class StartupTraceTest(TestCase):
+
+    def setUp(self):
+        super(StartupTraceTest, self).setUp()
+        patcher = patch.multiple(startup_trace,
+                                 _start_time=time.time(),
+                                 _records=[],
+                                 _nested_durations=[])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _records_by_name(self):
+        return dict((record['name'], record)
+                    for record in startup_trace._records)
+
+    def test_disabled(self):
+        with patch.object(startup_trace, '_start_time', None):
+            with startup_trace.phase('phase'):
+                pass
+        self.assertEqual([], startup_trace._records)
+
+    def test_nested_phases(self):
+        with startup_trace.phase('outer'):
+            with startup_trace.phase('inner'):
+                time.sleep(0.01)
+        records = self._records_by_name()
+        self.assertEqual(['inner', 'outer'],
+                         [r['name'] for r in startup_trace._records])
+        self.assertGreaterEqual(records['outer']['duration_ms'],
+                                records['inner']['duration_ms'])
+        self.assertLess(records['outer']['self_ms'],
+                        records['inner']['duration_ms'])
+
+    def test_json_report(self):
+        with startup_trace.phase('configure loggers'):
+            pass
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        startup_trace.report(path)
+        with open(path) as f:
+            trace = json.load(f)
+        self.assertIn('total_ms', trace)
+        self.assertEqual('configure loggers', trace['records'][0]['name'])
+
+    def test_text_report(self):
+        with startup_trace.phase('load profile'):
+            pass
+        with patch('sys.stderr') as stderr:
+            startup_trace.report('1')
+        output = stderr.write.call_args[0][0]
+        self.assertIn('Startup trace', output)
+        self.assertIn('load profile', output)
@@ -0,0 +1,182 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+import csv
+import json
+from StringIO import StringIO
+
+from mock import patch
+
+from .. import table
+from .. import constants
+from .. import yaml_io
+from ..table import StreamingTable
+from .commands.test_base import CliCommandTest
+
+COLUMNS = ['id', 'name', 'created_at', 'tags', 'enabled', 'missing']
+COLUMN_TYPES = {'created_at': table.TIMESTAMP,
+                'tags': table.LIST,
+                'enabled': table.BOOL}
+
+
+def _make_rows(count):
+    return [{'id': 'id_{0}'.format(index),
+             'name': 'x' * index,
+             'created_at': '2017-05-01T10:00:00.000Z',
+             'tags': ['a', 'b'],
+             'enabled': index % 2 == 0}
+            for index in range(count)]
+
+
+class StreamingTableTest(CliCommandTest):
+
+    def _render(self, rows, **kwargs):
+        return '\n'.join(line
+                         for lines in StreamingTable(COLUMNS, **kwargs)
+                         .lines(iter(rows))
+                         for line in lines)
+
+    def test_same_as_prettytable(self):
+        self.assertEqual(str(table.generate(COLUMNS, _make_rows(7))),
+                         self._render(_make_rows(7)))
+
+    def test_columns_sized_by_sample(self):
+        lines = self._render(_make_rows(7), sample_size=3).split('\n')
+        self.assertEqual(len(lines[0]), len(lines[-1]))
+        self.assertTrue(all(len(line) == len(lines[0]) for line in lines))
+        # Longer names than the sampled ones are cut short
+        self.assertIn(' xx.. ', lines[-2])
+
+    def test_max_width(self):
+        lines = self._render(_make_rows(20), max_width=5).split('\n')
+        self.assertIn('| xxx.. |', lines[-2])
+
+    def test_written_in_chunks(self):
+        chunks = list(StreamingTable(COLUMNS, sample_size=10)
+                      .lines(iter(_make_rows(25))))
+        # The header, 25 rows and the bottom border
+        self.assertEqual([10, 10, 9], [len(lines) for lines in chunks])
+
+
+class ColumnTypesTest(CliCommandTest):
+
+    def test_same_as_guessed_types(self):
+        self.assertEqual(
+            str(table.generate(COLUMNS, _make_rows(3))),
+            str(table.generate(COLUMNS, _make_rows(3),
+                               column_types=COLUMN_TYPES)))
+
+    def test_rows_not_modified(self):
+        rows = _make_rows(3)
+        table.generate(COLUMNS, rows, column_types=COLUMN_TYPES)
+        table.generate(COLUMNS, rows)
+        self.assertEqual(_make_rows(3), rows)
+
+    def test_undeclared_columns_are_text(self):
+        rendered = str(table.generate(['created_at'],
+                                      _make_rows(1),
+                                      column_types={}))
+        self.assertIn('2017-05-01T10:00:00.000Z', rendered)
+
+    def test_formatters(self):
+        self.assertEqual('2017-05-01 10:00:00.000 ',
+                         table.format_timestamp('2017-05-01T10:00:00.000Z'))
+        self.assertEqual('', table.format_timestamp(None))
+        self.assertEqual('a,b', table.format_list(['a', 'b']))
+        self.assertEqual('', table.format_list([]))
+        self.assertEqual(False, table.format_text(False))
+        self.assertEqual('', table.format_text(None))
+
+    def test_truncated(self):
+        format_description = table.truncated(5)
+        self.assertEqual('abcd', format_description('abcd'))
+        self.assertEqual('abc..', format_description('abcde'))
+        self.assertEqual('', format_description(None))
+
+
+class PrintDataTest(CliCommandTest):
+
+    @patch('cloudify_cli.table.print_streaming')
+    @patch('cloudify_cli.table.log')
+    def test_streams_above_threshold(self, log_mock, print_streaming_mock):
+        with patch.object(table, 'STREAMING_ROWS_THRESHOLD', 5):
+            table.print_data(COLUMNS, _make_rows(5), 'Rows:')
+            self.assertTrue(log_mock.called)
+            self.assertFalse(print_streaming_mock.called)
+            table.print_data(COLUMNS, _make_rows(6), 'Rows:')
+            self.assertTrue(print_streaming_mock.called)
+
+    @patch('cloudify_cli.table.print_streaming')
+    @patch('cloudify_cli.table.log')
+    def test_streams_long_iterators(self, log_mock, print_streaming_mock):
+        with patch.object(table, 'STREAMING_ROWS_THRESHOLD', 5):
+            table.print_data(COLUMNS, iter(_make_rows(5)), 'Rows:')
+            self.assertTrue(log_mock.called)
+            self.assertFalse(print_streaming_mock.called)
+            table.print_data(COLUMNS, iter(_make_rows(6)), 'Rows:')
+            streamed_rows = print_streaming_mock.call_args[0][1]
+            self.assertEqual(_make_rows(6), list(streamed_rows))
+
+
+class OutputFormatTest(CliCommandTest):
+
+    def _write(self, output_format, items, columns=COLUMNS):
+        table.set_global_output_format(output_format)
+        self.addCleanup(table.set_global_output_format,
+                        constants.TABLE_FORMAT)
+        with patch('sys.stdout', new_callable=StringIO) as stdout:
+            table.print_data(columns, items, 'Rows:')
+        return stdout.getvalue()
+
+    def _expected_rows(self, count):
+        return [dict(row, missing=None) for row in _make_rows(count)]
+
+    def test_json(self):
+        output = self._write(constants.JSON_FORMAT, _make_rows(3))
+        self.assertEqual(self._expected_rows(3), json.loads(output))
+        self.assertEqual([], json.loads(
+            self._write(constants.JSON_FORMAT, [])))
+
+    def test_json_single_item(self):
+        output = self._write(constants.JSON_FORMAT, _make_rows(1)[0])
+        self.assertEqual(self._expected_rows(1)[0], json.loads(output))
+
+    def test_ndjson(self):
+        output = self._write(constants.NDJSON_FORMAT, iter(_make_rows(3)))
+        self.assertEqual(self._expected_rows(3),
+                         [json.loads(line) for line in output.splitlines()])
+
+    def test_csv(self):
+        output = self._write(constants.CSV_FORMAT, _make_rows(2))
+        rows = list(csv.reader(StringIO(output)))
+        self.assertEqual(COLUMNS, rows[0])
+        self.assertEqual(
+            ['id_1', 'x', '2017-05-01T10:00:00.000Z', 'a,b', 'False', ''],
+            rows[2])
+
+    def test_yaml(self):
+        output = self._write(constants.YAML_FORMAT, iter(_make_rows(3)))
+        self.assertEqual(self._expected_rows(3), yaml_io.safe_load(output))
+        self.assertEqual([], yaml_io.safe_load(
+            self._write(constants.YAML_FORMAT, [])))
+
+    def test_details(self):
+        table.set_global_output_format(constants.NDJSON_FORMAT)
+        self.addCleanup(table.set_global_output_format,
+                        constants.TABLE_FORMAT)
+        with patch('sys.stdout', new_callable=StringIO) as stdout:
+            table.print_details({'key': 'value'}, 'Details:')
+        self.assertEqual({'key': 'value'}, json.loads(stdout.getvalue()))
@@ -14,6 +14,8 @@
 # limitations under the License.
 ############
 
+from datetime import datetime
+
 from testtools import TestCase
 from testtools.matchers import Equals
 
@@ -24,7 +26,7 @@ from mock import (
 from requests.exceptions import ConnectionError
 
 from ..exceptions import CloudifyCliError
-from ..utils import download_file
+from ..utils import download_file, parse_timestamp
 
 
 class DownloadFileTest(TestCase):
@@ -76,3 +78,17 @@ class DownloadFileTest(TestCase):
         self.get().iter_content.return_value = ['<content>']
         self.open().__enter__().write.side_effect = IOError
         self.assertRaises(CloudifyCliError, download_file, 'some_url')
+
+
+class ParseTimestampTest(TestCase):
+
+    def test_formats(self):
+        self.assertEqual(datetime(2017, 5, 1, 10, 0, 1, 500000),
+                         parse_timestamp('2017-05-01T10:00:01.500Z'))
+        self.assertEqual(datetime(2017, 5, 1, 10, 0, 1),
+                         parse_timestamp('2017-05-01 10:00:01'))
+        self.assertEqual(datetime(2017, 5, 1), parse_timestamp('2017-05-01'))
+
+    def test_not_a_timestamp(self):
+        self.assertIsNone(parse_timestamp('yesterday'))
+        self.assertIsNone(parse_timestamp(None))
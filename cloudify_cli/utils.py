@@ -23,6 +23,7 @@ import shutil
 import tarfile
 import zipfile
 import tempfile
+from datetime import datetime
 from contextlib import closing, contextmanager
 from backports.shutil_get_terminal_size import get_terminal_size
 
@@ -34,6 +35,11 @@ from .constants import SUPPORTED_ARCHIVE_TYPES
 
 from cloudify_rest_client.exceptions import CloudifyClientError
 
+# The formats of UTC timestamps, as the manager returns them (e.g. of
+# events), or as users pass them, without a trailing Z
+TIMESTAMP_FORMATS = ('%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S',
+                     '%Y-%m-%dT%H:%M', '%Y-%m-%d')
+
 
 def dump_to_file(collection, file_path):
     with open(file_path, 'a') as f:
@@ -93,6 +99,21 @@ def remove_if_exists(path):
             raise  # re-raise exception if a different error occurred
 
 
+def parse_timestamp(timestamp):
+    """Return a UTC timestamp string (e.g. `2017-05-01T10:00:00.123Z`) as
+    a datetime, or None if it isn't one.
+    """
+    if not isinstance(timestamp, basestring):
+        return None
+    timestamp = timestamp.strip().rstrip('Z').replace(' ', 'T')
+    for timestamp_format in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(timestamp, timestamp_format)
+        except ValueError:
+            pass
+    return None
+
+
 def generate_random_string(size=6,
                            chars=string.ascii_uppercase + string.digits):
     return ''.join(random.choice(chars) for _ in range(size))
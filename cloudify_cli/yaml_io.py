@@ -0,0 +1,101 @@
+########
+# Copyright (c) 2017 GigaSpaces Technologies Ltd. All rights reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+############
+
+"""YAML loading and dumping for the CLI.
+
+libyaml's C loaders and dumpers are used when PyYAML was built with them,
+as they are several times faster than the pure Python ones. Otherwise,
+the pure Python ones are used.
+
+Files loaded with `load_path` are cached for the life of the process,
+keyed by their path and content, so that a file which is read a few
+times in the same command (e.g. inputs files, which `install` passes on
+to `deployments create`) is only parsed once.
+"""
+
+import os
+import hashlib
+import cPickle
+
+import yaml
+
+try:
+    from yaml import CLoader as Loader
+    from yaml import CDumper as Dumper
+    from yaml import CSafeLoader as SafeLoader
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import Loader, Dumper, SafeLoader, SafeDumper
+
+YAMLError = yaml.YAMLError
+
+# Parsed files, pickled so that every caller gets its own copy,
+# as {(path, safe): (file key, pickled document)}
+_documents = {}
+
+_HASH_CHUNK_SIZE = 64 * 1024
+
+
+def load(stream):
+    return yaml.load(stream, Loader=Loader)
+
+
+def safe_load(stream):
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def dump(data, stream=None, **kwargs):
+    return yaml.dump(data, stream, Dumper=Dumper, **kwargs)
+
+
+def safe_dump(data, stream=None, **kwargs):
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def load_path(path, safe=False):
+    """Return the document in the YAML file `path`.
+
+    The file is only parsed again if it changed since it was last loaded.
+    A new copy of the document is returned on every call, so callers may
+    modify it.
+
+    :param safe: Whether to only construct standard YAML tags
+    """
+    with open(path) as f:
+        key = get_file_key(f)
+        cached_key, data = _documents.get((path, safe), (None, None))
+        if cached_key == key:
+            return cPickle.loads(data)
+        document = safe_load(f) if safe else load(f)
+    _documents[(path, safe)] = \
+        key, cPickle.dumps(document, cPickle.HIGHEST_PROTOCOL)
+    return document
+
+
+def get_file_key(f):
+    """Return a string which changes whenever the content of the open
+    file `f` does, and rewind `f`.
+
+    The content is hashed, as a file which is rewritten with the same
+    size keeps its mtime on filesystems with a coarse one (e.g. of a
+    second). Hashing a file is still much faster than parsing it.
+    """
+    digest = hashlib.sha1()
+    for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), ''):
+        digest.update(chunk)
+    f.seek(0)
+    return '{0} {1}'.format(os.fstat(f.fileno()).st_size,
+                            digest.hexdigest())
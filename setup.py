@@ -38,7 +38,8 @@ setup(
     description="Cloudify's Command Line Interface",
     entry_points={
         'console_scripts': [
-            'cfy = cloudify_cli.main:_cfy'
+            'cfy = cloudify_cli.daemon:cfy',
+            'cfy-daemon = cloudify_cli.daemon:serve'
         ]
     },
     install_requires=[